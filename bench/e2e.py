@@ -0,0 +1,169 @@
+"""
+End-to-end benchmark of a sweep on one machine, with the fake VTR flow (see fake_vtr/) in place of VTR: how much of the slots' time goes to the tool,
+and how much to the orchestration around it (writing inputs, launching, waiting, parsing, cleaning up, and idle slots).
+
+Usage: python bench/e2e.py [--experiments 1000] [--slots N] [--runtime 0.2] [--fail 0.0] [--hang 0.0] [--timeout 30] [--policy longest_first]
+                          [--scratch-dir DIR] [--scratch-budget-mib MIB] [--json FILE]
+Run with --help for all options of the fake flow.
+"""
+
+import os, sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from structure.run import Runner
+from structure.schedule import Scheduler, simulate_makespan
+from impl.exp.vtr import VtrExperiment
+from impl.arch.base import BaseArchFactory
+from impl.design.gemmt.fu import GemmTFuDesign
+from impl.cost.size import ParamSizeCostModel
+import structure.consts.keys as keys
+
+import re, json, math, time, argparse, tempfile, threading, contextlib
+from timeit import default_timer as timer
+from tabulate import tabulate
+
+FAKE_VTR_ROOT = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'fake_vtr')
+VERILOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'verilog')
+
+def sweep_params(num_experiments: int, root_dir: str, scratch_dir: str = None, scratch_budget_mib: float = None) -> dict[str, any]:
+    """
+    @return parameters of a GEMM sweep of at least num_experiments distinct experiments, with designs of different sizes, staged in scratch_dir if given.
+    """
+    return {
+        keys.KEY_EXP: {'root_dir': root_dir, 'verilog_search_dir': VERILOG_DIR, 'scratch_dir': scratch_dir, 'scratch_budget_mib': scratch_budget_mib},
+        keys.KEY_ARCH: {},
+        keys.KEY_DESIGN: {
+            'data_width': 8,
+            'sparsity': 0.5,
+            'constant_weight': True,
+            'row_num': list(range(1, max(math.ceil(num_experiments / 100), 1) + 1)),
+            'col_num': list(range(1, 11)),
+            'length': list(range(1, 11))
+        }
+    }
+
+def get_tool_time(exp: VtrExperiment) -> float:
+    """
+    @return the run time reported by the flow itself, e.g., 'design.v/arch.xml  OK  (took 1.23 seconds, ...)'; None if it did not finish.
+    """
+    try:
+        with open(os.path.join(exp.exp_dir, exp.exp_params['stdout_file']), 'r') as f:
+            match = re.search(r'\(took ([0-9.]+) seconds', f.read())
+    except (OSError, TypeError):
+        return None
+    return float(match.group(1)) if match is not None else None
+
+def watch_hangs(experiments: list[VtrExperiment], timeout: float, stop_event: threading.Event) -> None:
+    """
+    Cancel experiments running for longer than timeout seconds, until stop_event is set.
+    """
+    while not stop_event.wait(0.2):
+        now = time.time()
+        for exp in experiments:
+            if exp.start_time is not None and exp.run_time is None and not exp.cancelled and now - exp.start_time > timeout:
+                exp.cancel()
+
+def run(num_experiments: int = 1000, num_slots: int = None, root_dir: str = None, timeout: float = 30.0, policy: str = None,
+        scratch_dir: str = None, scratch_budget_mib: float = None, **fake_config) -> dict[str, any]:
+    """
+    Run a sweep on the fake flow and measure it.
+
+    Optional arguments:
+    * num_experiments:int, size of the sweep. Default: 1000
+    * num_slots:int, experiments run at the same time; pass None for the number of CPUs. Default: None
+    * root_dir:str, where to run; pass None for a temporary directory, removed afterwards. Default: None
+    * timeout:float, seconds after which a (hung) experiment is cancelled. Default: 30.0
+    * policy:str, submission order, as per structure.schedule.Scheduler, by ParamSizeCostModel; None to keep the order of generation. Default: None
+    * scratch_dir:str, local directory to run the flow in, copying back only what is kept (see impl.exp.vtr.VtrExperiment). Default: None
+    * scratch_budget_mib:float, total size of the runs in scratch_dir at the same time; None for no limit. Default: None
+    * fake_config, settings of the fake flow, by lowercase name without prefix, e.g., runtime=0.2 for FAKE_VTR_RUNTIME (see fake_vtr/vtr_flow/scripts/run_vtr_flow.py).
+
+    @return the measurements.
+    """
+    num_slots = num_slots if num_slots is not None else os.cpu_count()
+    os.environ['VTR_ROOT'] = FAKE_VTR_ROOT
+    for name, value in fake_config.items():
+        if value is not None:
+            os.environ[f'FAKE_VTR_{name.upper()}'] = str(value)
+
+    with contextlib.ExitStack() as stack:
+        if root_dir is None:
+            root_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix='kratos_e2e_'))
+        os.makedirs(root_dir, exist_ok=True)
+        log = stack.enter_context(open(os.path.join(root_dir, 'runner.log'), 'w'))
+
+        start_time = timer()
+        with contextlib.redirect_stdout(log):
+            runner = Runner(BaseArchFactory(), GemmTFuDesign(), VtrExperiment, sweep_params(num_experiments, root_dir, scratch_dir, scratch_budget_mib))
+        runner.experiments = runner.experiments[:num_experiments]
+        generate_time = timer() - start_time
+
+        stop_event = threading.Event()
+        watchdog = threading.Thread(target=watch_hangs, args=(runner.experiments, timeout, stop_event), daemon=True)
+        watchdog.start()
+        scheduler = Scheduler(ParamSizeCostModel(), policy) if policy is not None else None
+        run_start_time = timer()
+        with contextlib.redirect_stdout(log):
+            results = runner.run_all_threaded(num_parallel_tasks=num_slots, scheduler=scheduler, filter_results=['status'])
+        makespan = timer() - run_start_time
+        stop_event.set()
+        watchdog.join()
+        for exp in runner.experiments:
+            if exp.gcthread is not None:
+                exp.gcthread.join()
+
+        started = sorted((exp for exp in runner.experiments if exp.start_time is not None), key=lambda exp: exp.start_time)
+        slot_times = [exp.run_time for exp in started if exp.run_time is not None]
+        tool_times = [(exp.run_time, get_tool_time(exp)) for exp in started]
+        # (slot time, tool time) of runs that went through the flow, i.e., not cancelled
+        pairs = [(slot_time, tool_time) for slot_time, tool_time in tool_times if slot_time is not None and tool_time is not None]
+        completed = [tool_time for _, tool_time in pairs]
+        # the same tool times, without any orchestration in between, in the order they started
+        ideal_makespan = simulate_makespan(completed, num_slots)
+
+    capacity = num_slots * makespan
+    return {
+        'experiments': len(runner.experiments),
+        'slots': num_slots,
+        'succeeded': int(results['status'].sum()) if 'status' in results else 0,
+        'failed': len(results) - int(results['status'].sum()) if 'status' in results else 0,
+        'cancelled': sum(exp.cancelled for exp in runner.experiments),
+        'generate_seconds': generate_time,
+        'makespan_seconds': makespan,
+        'ideal_makespan_seconds': ideal_makespan,
+        'makespan_overhead': makespan / ideal_makespan - 1 if ideal_makespan > 0 else None,
+        'tool_seconds': sum(completed),
+        'slot_seconds': sum(slot_times),
+        'overhead_per_experiment_seconds': sum(slot_time - tool_time for slot_time, tool_time in pairs) / max(len(pairs), 1),
+        'slot_utilization': sum(slot_times) / capacity if capacity > 0 else None,
+        'tool_utilization': sum(completed) / capacity if capacity > 0 else None,
+        'experiments_per_hour': len(runner.experiments) / makespan * 3600 if makespan > 0 else None,
+        'max_scratch_mib': max((exp.scratch_used for exp in runner.experiments if exp.scratch_used is not None), default=None)
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='End-to-end benchmark of a sweep on the fake VTR flow.')
+    parser.add_argument('--experiments', type=int, default=1000, help='size of the sweep')
+    parser.add_argument('--slots', type=int, default=None, help='experiments run at the same time (default: number of CPUs)')
+    parser.add_argument('--root-dir', default=None, help='where to run (default: a temporary directory, removed afterwards)')
+    parser.add_argument('--timeout', type=float, default=30.0, help='seconds after which a (hung) experiment is cancelled')
+    parser.add_argument('--policy', default=None, choices=Scheduler.POLICIES, help='submission order by design size (default: order of generation)')
+    parser.add_argument('--runtime', type=float, default=0.2, help='seconds of a run of the fake flow')
+    parser.add_argument('--runtime-per-kb', type=float, default=None, help='seconds of a run per KB of the design')
+    parser.add_argument('--jitter', type=float, default=None, help='noise on the run time')
+    parser.add_argument('--cpu', type=float, default=None, help='fraction of the run time spent busy')
+    parser.add_argument('--mem-mib', type=float, default=None, help='memory allocated by a run')
+    parser.add_argument('--fail', type=float, default=None, help='probability of a failed run')
+    parser.add_argument('--hang', type=float, default=None, help='probability of a hung run')
+    parser.add_argument('--log-kb', type=float, default=None, help='size of the tables in vpr.out')
+    parser.add_argument('--scratch-dir', default=None, help='local directory to run the flow in (default: in the experiment directories)')
+    parser.add_argument('--scratch-budget-mib', type=float, default=None, help='total size of the runs in the scratch directory at the same time')
+    parser.add_argument('--json', default=None, help='also write the measurements to this file')
+    args = parser.parse_args()
+
+    measurements = run(args.experiments, args.slots, args.root_dir, args.timeout, args.policy, args.scratch_dir, args.scratch_budget_mib, runtime=args.runtime, runtime_per_kb=args.runtime_per_kb,
+                       jitter=args.jitter, cpu=args.cpu, mem_mib=args.mem_mib, fail=args.fail, hang=args.hang, log_kb=args.log_kb)
+    print(tabulate([[k, f'{v:.4g}' if isinstance(v, float) else v] for k, v in measurements.items()], tablefmt='simple'))
+    if args.json is not None:
+        with open(args.json, 'w') as f:
+            json.dump(measurements, f, indent=2)
@@ -0,0 +1,186 @@
+"""
+Stand-in for VTR's run_vtr_flow.py, to run sweeps end to end without VTR (e.g., to benchmark the Runner and Scheduler): point VTR_ROOT to bench/fake_vtr.
+Takes the same arguments as used by impl.exp.vtr.VtrExperiment, goes through synthesis, packing, placement and routing in real time,
+and writes the same files as VTR under temp/: parmys.out, vpr.out (see bench/vpr_out.py), design.net, design.place, design.route and design.net.post_routing.
+
+Configured with environment variables (inherited from the sweep):
+* FAKE_VTR_RUNTIME: seconds of a run, plus FAKE_VTR_RUNTIME_PER_KB per KB of the design. Default: 1.0
+* FAKE_VTR_RUNTIME_PER_KB: seconds of a run per KB of the design, so that larger designs take longer. Default: 0.0
+* FAKE_VTR_JITTER: standard deviation of the (log-normal) noise on the run time. Default: 0.2
+* FAKE_VTR_CPU: fraction of the run time spent busy on a CPU, the rest sleeping. Default: 1.0
+* FAKE_VTR_MEM_MIB: memory allocated (and touched) from packing on. Default: 50
+* FAKE_VTR_FAIL: probability that routing fails; VTR then exits with 1. Default: 0.0
+* FAKE_VTR_HANG: probability that the run hangs in a random stage, until killed. Default: 0.0
+* FAKE_VTR_LOG_KB: KB of annealing and routing tables in vpr.out. Default: 64
+* FAKE_VTR_SEED: seed of the random draws, mixed with the design and --seed, so that a rerun of an experiment behaves the same. Default: 0
+"""
+
+import os, sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))))
+
+from vpr_out import vpr_out_sections
+
+import math, time, random, hashlib, argparse, resource
+
+START_TIME = time.time()
+STAGES = {'Synthesis': 0.2, 'Packing': 0.2, 'Placement': 0.3, 'Routing': 0.3}  # fraction of the run time
+SLICE = 0.05  # seconds between switches from busy to sleeping
+
+def get_config() -> dict[str, float]:
+    def get(name: str, default: float) -> float:
+        return float(os.environ.get(f'FAKE_VTR_{name}', default))
+    return {
+        'runtime': get('RUNTIME', 1.0),
+        'runtime_per_kb': get('RUNTIME_PER_KB', 0.0),
+        'jitter': get('JITTER', 0.2),
+        'cpu': min(max(get('CPU', 1.0), 0.0), 1.0),
+        'mem_mib': get('MEM_MIB', 50),
+        'fail': get('FAIL', 0.0),
+        'hang': get('HANG', 0.0),
+        'log_kb': get('LOG_KB', 64),
+        'seed': get('SEED', 0)
+    }
+
+def work(seconds: float, cpu: float) -> None:
+    """
+    Spend seconds, a fraction cpu of them busy.
+    """
+    end = time.time() + seconds
+    while True:
+        now = time.time()
+        if now >= end:
+            return
+        busy_until = now + min(SLICE, end - now) * cpu
+        x = 0
+        while time.time() < busy_until:
+            for i in range(1000):
+                x += i * i
+        time.sleep(max(min(SLICE, end - now) * (1 - cpu), 0.0))
+
+def hang() -> None:
+    while True:
+        time.sleep(3600)
+
+def allocate(mib: float) -> bytearray:
+    """
+    @return a buffer of mib MiB, with every page touched so that it counts towards the resident memory.
+    """
+    buffer = bytearray(int(mib * (1 << 20)))
+    for i in range(0, len(buffer), 4096):
+        buffer[i] = 1
+    return buffer
+
+def get_max_rss_mib() -> float:
+    # kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def write_rows(path: str, header: str, row, num_rows: int) -> None:
+    with open(path, 'w') as f:
+        f.write(header)
+        for i in range(num_rows):
+            f.write(row(i))
+
+def write_stage_output(temp_dir: str, stage: str, fle: int, grid: int) -> None:
+    """
+    Write the file VPR produces after a stage: design.net after packing, design.place after placement, design.route and design.net.post_routing after routing.
+    """
+    digest = hashlib.sha256(str(fle).encode()).hexdigest()
+    if stage == 'Packing':
+        write_rows(os.path.join(temp_dir, 'design.net'),
+                   f'<block name="design.net" instance="FPGA_packed_netlist[0]" architecture_id="SHA256:{digest}" atom_netlist_id="SHA256:{digest}">\n',
+                   lambda i: f'\t<block name="n{i}" instance="clb[{i}]" mode="default">\n\t\t<inputs>\n\t\t\t<port name="I">n{i * 7 % fle} open open</port>\n\t\t</inputs>\n\t</block>\n', fle)
+    elif stage == 'Placement':
+        write_rows(os.path.join(temp_dir, 'design.place'),
+                   f'Netlist_File: design.net Netlist_ID: SHA256:{digest}\nArray size: {grid} x {grid} logic blocks\n\n#block name\tx\ty\tsubblk\tlayer\tblock number\n',
+                   lambda i: f'n{i}\t{1 + i % grid}\t{1 + i // grid % grid}\t{i % 10}\t0\t#{i}\n', fle)
+    elif stage == 'Routing':
+        write_rows(os.path.join(temp_dir, 'design.route'),
+                   f'Placement_File: design.place Placement_ID: SHA256:{digest}\nArray size: {grid} x {grid} logic blocks.\n\nRouting:\n',
+                   lambda i: f'\nNet {i} (n{i})\n\nNode:\t{i * 31}\tSOURCE ({1 + i % grid},{1 + i // grid % grid},0)  Class: 1  Switch: 0\n', fle)
+        with open(os.path.join(temp_dir, 'design.net'), 'r') as f_in, open(os.path.join(temp_dir, 'design.net.post_routing'), 'w') as f_out:
+            f_out.write(f_in.read())
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Fake VTR flow.')
+    parser.add_argument('design')
+    parser.add_argument('arch')
+    parser.add_argument('-parser', default='system-verilog')
+    parser.add_argument('-top', default=None)
+    parser.add_argument('-search', default=None)
+    parser.add_argument('--seed', default='1')
+    parser.add_argument('-ending_stage', default=None)
+    args, vpr_args = parser.parse_known_args()
+
+    config = get_config()
+    temp_dir = 'temp'
+    os.makedirs(temp_dir, exist_ok=True)
+    with open(args.design, 'r') as f:
+        design_text = f.read()
+    for path in [args.design, args.arch]:
+        with open(path, 'r') as f_in, open(os.path.join(temp_dir, os.path.basename(path)), 'w') as f_out:
+            f_out.write(f_in.read())
+
+    rng = random.Random(f"{config['seed']}:{hashlib.sha256(design_text.encode()).hexdigest()}:{args.seed}")
+    design_kb = len(design_text) / 1024
+    runtime = (config['runtime'] + config['runtime_per_kb'] * design_kb) * math.exp(rng.gauss(0, config['jitter']))
+    hang_stage = rng.choice(list(STAGES)) if rng.random() < config['hang'] else None
+    succeeded = rng.random() >= config['fail']
+
+    last_stage = 'Routing'
+    if '--pack' in vpr_args:
+        last_stage = 'Packing'
+    elif '--place' in vpr_args:
+        last_stage = 'Placement'
+
+    # synthesis results grow with the design
+    fle = max(int(len(design_text) / 8), 1)
+    grid = max(int(math.ceil(math.sqrt(fle / 10 * 1.2))), 3)
+    stats = {
+        'fle': fle,
+        'clb': int(math.ceil(fle / 10)),
+        'ff': fle * 3 // 4,
+        'grid': grid,
+        'rcw': 2 * rng.randint(40, 80),
+        'twl': fle * rng.randint(8, 16),
+        'place_cpd': round(rng.uniform(2.0, 6.0), 3),
+        'run_time': round(runtime, 2),
+        'max_rss': round(get_max_rss_mib() + config['mem_mib'], 1)
+    }
+    stats['cpd'] = round(stats['place_cpd'] * rng.uniform(1.0, 1.1), 3)
+
+    # synthesis
+    with open(os.path.join(temp_dir, 'parmys.out'), 'w') as f:
+        f.write(f"Odin II/Parmys synthesis of {args.design} (top: {args.top}, parser: {args.parser})\n")
+        f.flush()
+        if hang_stage == 'Synthesis':
+            hang()
+        work(runtime * STAGES['Synthesis'], config['cpu'])
+        f.write(f"Number of LUTs: {fle}\nNumber of latches: {stats['ff']}\nSynthesis succeeded.\n")
+
+    if args.ending_stage == 'parmys':
+        print(f"{args.design}/{args.arch}\tOK\t(took {time.time() - START_TIME:.2f} seconds)")
+        sys.exit(0)
+
+    memory = None  # held until the end, as VPR holds its netlists
+    stage = None
+    with open(os.path.join(temp_dir, 'vpr.out'), 'w') as f:
+        for section_stage, text in vpr_out_sections(int(config['log_kb'] * 1024), succeeded, last_stage, **stats):
+            f.write(text)
+            f.flush()
+            if section_stage == stage:
+                continue
+            # the previous stage is complete, unless routing failed
+            if stage is not None and (succeeded or stage != 'Routing'):
+                write_stage_output(temp_dir, stage, fle, grid)
+            stage = section_stage
+            if stage is None:
+                continue
+            if stage == 'Packing':
+                memory = allocate(config['mem_mib'])
+            if hang_stage == stage:
+                hang()
+            work(runtime * STAGES[stage], config['cpu'])
+
+    status = 'OK' if succeeded else 'failed: vpr'
+    print(f"{args.design}/{args.arch}\t{status}\t(took {time.time() - START_TIME:.2f} seconds, overall memory peak {get_max_rss_mib():.2f} MiB consumed by vpr run)")
+    sys.exit(0 if succeeded else 1)
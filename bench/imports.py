@@ -0,0 +1,73 @@
+"""
+Import time of the modules every sweep (and every worker of a distributed one) loads before it can run anything, against a budget.
+Each module is imported in a fresh interpreter, and the startup of a bare interpreter is subtracted.
+Heavy optional dependencies (plotting, data frames, notifications) must not be imported on this path at all; see util.py.
+
+Usage: python bench/imports.py [--budget 0.5] [--repeat 5]
+Exits with 1 if any module takes longer than the budget, or imports a heavy dependency.
+"""
+
+import os, sys, json, argparse, subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+CORE_MODULES = ['structure.run', 'worker', 'impl.exp.vtr', 'impl.exp.quartus', 'impl.executor.queue', 'util']
+HEAVY_MODULES = ['matplotlib', 'mpl_toolkits', 'pandas', 'requests', 'tabulate']
+DEFAULT_BUDGET = 0.5  # seconds
+
+PROBE = """
+import sys, json, time
+start = time.perf_counter()
+{statement}
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds, 'modules': sorted(sys.modules)}}))
+"""
+
+def measure_import(module: str, repeat: int = 5) -> tuple[float, list[str]]:
+    """
+    @return the best import time of a module (in seconds) over repeat fresh interpreters, with the startup of a bare one subtracted, and the
+    heavy modules it imported.
+    """
+    def probe(statement: str) -> tuple[float, list[str]]:
+        output = subprocess.run([sys.executable, '-c', PROBE.format(statement=statement)], cwd=ROOT_DIR, capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        return result['seconds'], result['modules']
+
+    # the baseline is what the interpreter imports anyway (site, encodings, ...), measured the same way
+    base_seconds = min(probe('pass')[0] for _ in range(repeat))
+    seconds, modules = min(probe(f'import {module}') for _ in range(repeat))
+    heavy = [name for name in HEAVY_MODULES if name in modules]
+    return max(seconds - base_seconds, 0.0), heavy
+
+def run(budget: float = DEFAULT_BUDGET, repeat: int = 5, modules: list[str] = CORE_MODULES) -> bool:
+    """
+    Measure the import time of modules, and print a table.
+
+    Optional arguments:
+    * budget:float, seconds any module may take to import. Default: DEFAULT_BUDGET
+    * repeat:int, fresh interpreters per module, of which the best is kept. Default: 5
+    * modules:list[str], modules to import. Default: CORE_MODULES
+
+    @return whether all modules are within the budget and import no heavy dependency.
+    """
+    from tabulate import tabulate
+    rows, ok = [], True
+    for module in modules:
+        seconds, heavy = measure_import(module, repeat)
+        status = 'ok'
+        if len(heavy) > 0:
+            status = f"HEAVY: {', '.join(heavy)}"
+        elif seconds > budget:
+            status = 'OVER BUDGET'
+        ok = ok and status == 'ok'
+        rows.append([module, f'{seconds * 1000:.1f}', f'{budget * 1000:.0f}', status])
+    print(tabulate(rows, headers=['module', 'ms', 'budget ms', 'status'], tablefmt='simple'))
+    return ok
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Import time of the core modules of a sweep, against a budget.')
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET, help='seconds any module may take to import')
+    parser.add_argument('--repeat', type=int, default=5, help='fresh interpreters per module, of which the best is kept')
+    parser.add_argument('modules', nargs='*', default=CORE_MODULES, help='modules to import (default: the core ones)')
+    args = parser.parse_args()
+
+    sys.exit(0 if run(args.budget, args.repeat, args.modules) else 1)
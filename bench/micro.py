@@ -0,0 +1,270 @@
+"""
+Microbenchmarks of the hot paths of a sweep, i.e., everything the Runner does around the CAD tools: generating experiments, writing wrappers and
+architectures, and parsing tool outputs. Each benchmark is compared against its baseline in baselines.json, and fails if it got slower than its threshold.
+
+Times are normalized by a pure-Python reference loop timed in the same run, so that baselines recorded on one machine can be checked on another.
+
+Usage: python bench/micro.py [--quick] [-k FILTER] [--update] [--threshold T] [--baselines FILE]
+* --quick: skip the large benchmarks (100k experiments, 100 MB vpr.out).
+* -k FILTER: only run benchmarks whose name contains FILTER.
+* --update: record the times of this run as the new baselines (of the benchmarks that were run).
+Exits with 1 if any benchmark regressed.
+"""
+
+import os, sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from structure.exp import ExperimentFactory
+from impl.exp.vtr import VtrExperiment
+from impl.arch.base import BaseArchFactory, distribute_pins
+from impl.design.gemms import GemmSDesign
+from impl.design.gemmt.fu import GemmTFuDesign
+from impl.design.gemmt.rp import GemmTRpDesign
+from impl.design.conv_1d.fu import Conv1dFuDesign
+from impl.design.conv_1d.pw import Conv1dPwDesign
+from impl.design.conv_2d.fu import Conv2dFuDesign
+from impl.design.conv_2d.pw import Conv2dPwDesign
+from impl.design.conv_2d.rp import Conv2dRpDesign
+from util_gen import (reset_seed, generate_random_array, generate_random_matrix, generate_random_matrix_3d, generate_random_matrix_4d,
+                      generate_flattened_bit, gen_long_constant_bits)
+from util_parse import extract_info_vtr
+import structure.consts.keys as keys
+from vpr_out import write_vpr_out
+
+import json, time, timeit, argparse, platform, tempfile
+from tabulate import tabulate
+
+BASELINES_FILE = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'baselines.json')
+DEFAULT_THRESHOLD = 2.0  # slowdown (normalized) beyond which a benchmark regressed; shared CI hosts are noisy
+REPEAT = 5
+
+BENCHMARKS = []  # (name, setup, large, threshold)
+
+def benchmark(name: str, large: bool = False, threshold: float = DEFAULT_THRESHOLD):
+    """
+    Register a benchmark: a setup function, called with a scratch directory, that returns the function to time (without arguments).
+    Large benchmarks are skipped with --quick, and timed once.
+    """
+    def register(setup):
+        BENCHMARKS.append((name, setup, large, threshold))
+        return setup
+    return register
+
+def measure(fn, repeat: int = REPEAT) -> float:
+    """
+    @return the best time of a call to fn in seconds, out of repeat runs of enough calls to last 0.2 seconds.
+    """
+    timer = timeit.Timer(fn)
+    number, total = timer.autorange()
+    times = [total] + (timer.repeat(repeat - 1, number) if repeat > 1 else [])
+    return min(times) / number
+
+def reference() -> None:
+    """
+    Pure-Python loop to normalize times across machines and interpreters.
+    """
+    d = {}
+    for i in range(100000):
+        d[i % 1000] = d.get(i % 1000, 0) + i * i
+
+# --- ExperimentFactory
+
+SWEEP_AXES = [
+    (keys.KEY_DESIGN, 'row_num', list(range(1, 11))),
+    (keys.KEY_DESIGN, 'col_num', list(range(1, 11))),
+    (keys.KEY_DESIGN, 'length', list(range(1, 11))),
+    (keys.KEY_DESIGN, 'sparsity', [i / 10 for i in range(10)]),
+    (keys.KEY_DESIGN, 'data_width', list(range(4, 14)))
+]
+
+def sweep_params(num_points: int, root_dir: str) -> dict[str, any]:
+    """
+    @return parameters of a GEMM sweep over num_points (a power of 10, up to 1e5) combinations, all valid.
+    """
+    params = {keys.KEY_EXP: {'root_dir': root_dir, 'verilog_search_dir': root_dir}, keys.KEY_ARCH: {}, keys.KEY_DESIGN: {'data_width': 8, 'sparsity': 0.0}}
+    for key, name, values in SWEEP_AXES[:len(str(num_points)) - 1]:
+        params[key][name] = values
+    return params
+
+def bench_gen_experiments(num_points: int):
+    def setup(scratch_dir: str):
+        factory = ExperimentFactory(BaseArchFactory(), GemmTFuDesign(), VtrExperiment)
+        params = sweep_params(num_points, scratch_dir)
+        assert len(factory.gen_experiments(params)) == num_points
+        return lambda: factory.gen_experiments(params)
+    return setup
+
+benchmark('gen_experiments 1k')(bench_gen_experiments(1000))
+benchmark('gen_experiments 10k')(bench_gen_experiments(10000))
+benchmark('gen_experiments 100k', large=True)(bench_gen_experiments(100000))
+
+# --- Design.gen_wrapper
+
+GEMM_SMALL = {'data_width': 8, 'row_num': 4, 'col_num': 4, 'length': 4}
+GEMM_LARGE = {'data_width': 8, 'row_num': 64, 'col_num': 64, 'length': 64}
+# all wrapper keys given, as not every convolution fills in those it does not use
+CONV_DEFAULTS = {'data_width': 8, 'img_h': 1, 'fil_h': 1, 'stride_w': 1, 'stride_h': 1, 'buffer_stages': 0, 'separate_filters': False, 'kernel_only': False}
+CONV_1D_SMALL = {**CONV_DEFAULTS, 'img_w': 16, 'img_d': 2, 'fil_w': 3, 'res_d': 2}
+CONV_1D_LARGE = {**CONV_DEFAULTS, 'img_w': 128, 'img_d': 16, 'fil_w': 5, 'res_d': 16}
+CONV_2D_SMALL = {**CONV_DEFAULTS, 'img_w': 8, 'img_h': 8, 'img_d': 2, 'fil_w': 3, 'fil_h': 3, 'res_d': 2}
+CONV_2D_LARGE = {**CONV_DEFAULTS, 'img_w': 32, 'img_h': 32, 'img_d': 16, 'fil_w': 3, 'fil_h': 3, 'res_d': 16}
+
+DESIGNS = [
+    ('gemms', GemmSDesign, GEMM_SMALL, GEMM_LARGE),
+    ('gemmt_fu', GemmTFuDesign, GEMM_SMALL, GEMM_LARGE),
+    ('gemmt_rp', GemmTRpDesign, GEMM_SMALL, GEMM_LARGE),
+    ('conv_1d_fu', Conv1dFuDesign, CONV_1D_SMALL, CONV_1D_LARGE),
+    ('conv_1d_pw', Conv1dPwDesign, CONV_1D_SMALL, CONV_1D_LARGE),
+    ('conv_2d_fu', Conv2dFuDesign, CONV_2D_SMALL, CONV_2D_LARGE),
+    ('conv_2d_pw', Conv2dPwDesign, CONV_2D_SMALL, CONV_2D_LARGE),
+    ('conv_2d_rp', Conv2dRpDesign, CONV_2D_SMALL, CONV_2D_LARGE)
+]
+
+def bench_gen_wrapper(design_class, params: dict[str, any]):
+    def setup(scratch_dir: str):
+        design = design_class()
+        design_params = design.verify_params({**params, 'constant_weight': True, 'sparsity': 0.5})
+        def run():
+            # as every wrapper with constant weights does, so that runs are identical
+            reset_seed()
+            design.gen_wrapper(**design_params)
+        return run
+    return setup
+
+for name, design_class, small, large in DESIGNS:
+    benchmark(f'gen_wrapper {name} small')(bench_gen_wrapper(design_class, small))
+    benchmark(f'gen_wrapper {name} large')(bench_gen_wrapper(design_class, large))
+
+# --- ArchFactory
+
+def bench_get_arch(params: dict[str, any]):
+    def setup(scratch_dir: str):
+        arch = BaseArchFactory()
+        arch_params = arch.verify_params(params)
+        return lambda: arch.get_arch(**arch_params)
+    return setup
+
+benchmark('get_arch lut 6')(bench_get_arch({}))
+benchmark('get_arch lut 4')(bench_get_arch({'lut_size': 4, 'CLB_pins_per_group': 8}))
+
+@benchmark('distribute_pins')
+def bench_distribute_pins(scratch_dir: str):
+    # as generate_arch() does, for every number of feedback BLEs it supports
+    return lambda: [distribute_pins(10, num_feedback_ble, 8) for num_feedback_ble in range(2, 11)]
+
+# --- Parsing
+
+def bench_extract_info_vtr(size: int):
+    def setup(scratch_dir: str):
+        path = os.path.join(scratch_dir, f'vpr_{size}')
+        os.makedirs(path, exist_ok=True)
+        write_vpr_out(os.path.join(path, 'vpr.out'), size)
+        assert extract_info_vtr(path)['status']
+        return lambda: extract_info_vtr(path, ['clb', 'fle', 'ff'])
+    return setup
+
+benchmark('extract_info_vtr 1 MB')(bench_extract_info_vtr(1 << 20))
+benchmark('extract_info_vtr 100 MB', large=True, threshold=3.0)(bench_extract_info_vtr(100 << 20))
+
+# --- util.generate_*
+
+def bench_generate(fn, *args):
+    def setup(scratch_dir: str):
+        def run():
+            reset_seed()
+            fn(*args)
+        return run
+    return setup
+
+benchmark('generate_random_array 4096')(bench_generate(generate_random_array, 4096, 8, 0.5))
+benchmark('generate_random_matrix 64x64')(bench_generate(generate_random_matrix, 64, 64, 8, 0.5))
+benchmark('generate_random_matrix_3d 16x16x16')(bench_generate(generate_random_matrix_3d, 16, 16, 16, 8, 0.5))
+benchmark('generate_random_matrix_4d 8x8x8x8')(bench_generate(generate_random_matrix_4d, 8, 8, 8, 8, 8, 0.5))
+benchmark('generate_flattened_bit 16384')(bench_generate(generate_flattened_bit, 8, 16384, 0.5))
+benchmark('gen_long_constant_bits 65536')(bench_generate(gen_long_constant_bits, 65536, 0.5, 'LENGTH'))
+
+# ---
+
+def load_baselines(path: str) -> dict[str, any]:
+    if not os.path.exists(path):
+        return {'reference': None, 'benchmarks': {}}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def run(name_filter: str = None, quick: bool = False, update: bool = False, threshold: float = None, baselines_file: str = BASELINES_FILE) -> bool:
+    """
+    Run the benchmarks and print a comparison against their baselines.
+
+    Optional arguments:
+    * name_filter:str, only run benchmarks whose name contains this. Default: None
+    * quick:bool, skip the large benchmarks. Default: False
+    * update:bool, save the times of this run as the baselines. Default: False
+    * threshold:float, slowdown beyond which any benchmark regressed, instead of their own. Default: None
+
+    @return True if no benchmark regressed.
+    """
+    baselines = load_baselines(baselines_file)
+    ref = measure(reference)
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='kratos_bench_') as scratch_dir:
+        for name, setup, large, default_threshold in BENCHMARKS:
+            if name_filter is not None and name_filter not in name:
+                continue
+            if quick and large:
+                continue
+            results[name] = {'seconds': measure(setup(scratch_dir), 1 if large else REPEAT), 'threshold': default_threshold}
+
+    # timed again, as a busy host only ever slows it down
+    ref = min(ref, measure(reference))
+    # baselines are compared in units of the reference loop
+    base_ref = baselines.get('reference') or ref
+
+    rows, regressed = [], []
+    for name, result in results.items():
+        seconds = result['seconds']
+        base = baselines['benchmarks'].get(name)
+        if base is None:
+            rows.append([name, f"{seconds * 1e3:.3f}", '-', '-', 'new'])
+            continue
+        ratio = (seconds / ref) / (base['seconds'] / base_ref)
+        limit = threshold if threshold is not None else base.get('threshold', result['threshold'])
+        status = 'ok'
+        if ratio > limit:
+            status = 'REGRESSED'
+            regressed.append(name)
+        elif ratio < 1 / limit:
+            status = 'faster'
+        rows.append([name, f"{seconds * 1e3:.3f}", f"{base['seconds'] * ref / base_ref * 1e3:.3f}", f"{ratio:.2f}x", status])
+
+    print(tabulate(rows, headers=['benchmark', 'ms', 'baseline ms', 'ratio', 'status'], tablefmt='simple'))
+    print(f"Reference loop: {ref * 1e3:.3f} ms (baseline {base_ref * 1e3:.3f} ms); baseline times are scaled to this machine.")
+
+    if update:
+        if baselines.get('reference') is not None:
+            # keep baselines of benchmarks not run, in units of the new reference
+            for base in baselines['benchmarks'].values():
+                base['seconds'] *= ref / baselines['reference']
+        baselines['reference'] = ref
+        baselines['machine'] = {'python': platform.python_version(), 'platform': platform.platform(), 'processor': platform.processor(), 'cpus': os.cpu_count()}
+        baselines['updated'] = time.strftime('%Y-%m-%d %H:%M:%S')
+        baselines['benchmarks'].update(results)
+        with open(baselines_file, 'w') as f:
+            json.dump(baselines, f, indent=2)
+            f.write('\n')
+        print(f"Updated {len(results)} baseline(s) in {baselines_file}.")
+    elif len(regressed) > 0:
+        print(f"{len(regressed)} benchmark(s) regressed: {', '.join(regressed)}")
+
+    return update or len(regressed) == 0
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Microbenchmarks of the hot paths of a sweep, against their baselines.')
+    parser.add_argument('--quick', action='store_true', help='skip the large benchmarks')
+    parser.add_argument('-k', dest='name_filter', default=None, help='only run benchmarks whose name contains this')
+    parser.add_argument('--update', action='store_true', help='record the times of this run as the new baselines')
+    parser.add_argument('--threshold', type=float, default=None, help='slowdown beyond which any benchmark regressed (default: per benchmark)')
+    parser.add_argument('--baselines', default=BASELINES_FILE, help='baselines file')
+    args = parser.parse_args()
+
+    sys.exit(0 if run(args.name_filter, args.quick, args.update, args.threshold, args.baselines) else 1)
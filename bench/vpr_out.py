@@ -0,0 +1,152 @@
+"""
+Synthetic vpr.out files, laid out like those of VPR 8 (stage markers, circuit statistics, packing table, annealing and routing tables, final timing),
+and parsed by util.extract_info_vtr() like real ones. Used by the benchmarks, and by the fake VTR flow (see fake_vtr/).
+"""
+
+import random
+
+CHUNK_SIZE = 1 << 20  # bytes of filler rows per yielded chunk
+
+DEFAULT_STATS = {
+    'clb': 45,
+    'fle': 400,
+    'ff': 300,
+    'io': 98,
+    'grid': 12,
+    'rcw': 120,
+    'twl': 12345,
+    'place_cpd': 3.2,
+    'cpd': 3.123,
+    'max_rss': 120.5,
+    'run_time': 12.3
+}
+
+def _placement_row(i: int, rng: random.Random) -> str:
+    # T Cost Av BB Cost Av TD Cost Av Tot Del P to P Del CPD sTNS sWNS Ac Rate Std Dev R lim Crit Exp Tot Moves Alpha
+    return (f"{i:>4} {0.01 * 0.95 ** (i % 400):>9.2e} {rng.uniform(0.8, 1.0):>7.4f} {rng.uniform(1000, 9000):>11.1f} {rng.uniform(1e-8, 9e-8):>11.5e} "
+            f"{rng.uniform(1e-7, 9e-7):>10.3e} {rng.uniform(1e-10, 9e-10):>10.3e} {rng.uniform(2.0, 5.0):>7.3f} {-rng.uniform(100, 900):>10.1f} "
+            f"{-rng.uniform(2.0, 5.0):>7.3f} {rng.uniform(0.1, 0.9):>6.4f} {rng.uniform(0.001, 0.01):>7.4f} {rng.uniform(1, 12):>6.2f} "
+            f"{rng.uniform(1, 8):>6.3f} {rng.randint(10000, 99999):>9} {0.9:>5.3f}\n")
+
+def _routing_row(i: int, rng: random.Random) -> str:
+    # Iter Time pres BBs Heap Re-Rtd Re-Rtd Overused RR Nodes Wirelength CPD sTNS sWNS hTNS hWNS Est Succ
+    return (f"{i:>4} {rng.uniform(0.01, 0.5):>6.3f} {1.3 ** (i % 50):>9.1f} {rng.randint(0, 500):>5} {rng.randint(1000, 99999):>8} "
+            f"{rng.randint(0, 999):>6} {rng.randint(0, 9999):>6} {rng.randint(0, 999):>5} ({rng.uniform(0, 1):.3f}%) {rng.randint(1000, 99999):>7} "
+            f"({rng.uniform(1, 30):.1f}%) {rng.uniform(2.0, 5.0):>7.3f} {-rng.uniform(100, 900):>10.1f} {-rng.uniform(2.0, 5.0):>7.3f} N/A N/A N/A\n")
+
+def _filler(size: int, row) -> iter:
+    """
+    @return an iterator of chunks of table rows, of about size bytes in total; rows repeat every CHUNK_SIZE bytes, as when VPR retries a channel width.
+    """
+    rng = random.Random(size)
+    rows, chunk_size = [], 0
+    while chunk_size < min(size, CHUNK_SIZE):
+        line = row(len(rows), rng)
+        rows.append(line)
+        chunk_size += len(line)
+    chunk = ''.join(rows)
+    for _ in range(0, size, max(chunk_size, 1)):
+        yield chunk
+
+def vpr_out_sections(size: int = 0, succeeded: bool = True, last_stage: str = 'Routing', **stats) -> iter:
+    """
+    Generate the text of a vpr.out file, stage by stage.
+
+    Optional arguments:
+    * size:int, approximate size of the file in bytes, made up by annealing and routing table rows; 0 for the smallest file. Default: 0
+    * succeeded:bool, end with 'VPR succeeded' rather than a routing failure; VPR only fails in routing. Default: True
+    * last_stage:str, 'Packing', 'Placement' or 'Routing', the stage VPR stops after, e.g., 'Packing' as with --pack. Default: 'Routing'
+    * stats, values reported in the file, by key of DEFAULT_STATS (clb, fle, ff, io, grid, rcw, twl, place_cpd, cpd, max_rss, run_time).
+
+    @return an iterator of (stage, text) tuples, where stage is the VPR stage the text belongs to, or None outside of stages; a stage may span several tuples.
+    """
+    s = {**DEFAULT_STATS, **stats}
+    fle, ff, clb = s['fle'], s['ff'], s['clb']
+    blocks = fle + ff + s['io']
+
+    yield None, (
+        "VPR FPGA Placement and Routing.\n"
+        "Version: 8.1.0-dev+synthetic\n"
+        "\n"
+        "# Loading Architecture Description\n"
+        "# Loading Architecture Description took 0.01 seconds (max_rss 15.2 MiB, delta_rss +0.0 MiB)\n"
+        "# Building complex block graph\n"
+        "# Building complex block graph took 0.00 seconds (max_rss 15.4 MiB, delta_rss +0.2 MiB)\n"
+        "\n"
+        "Circuit Statistics:\n"
+        f"  Blocks: {blocks}\n"
+        f"    .input :  {s['io'] // 2}\n"
+        f"    .output:  {s['io'] - s['io'] // 2}\n"
+        f"    6-LUT  : {fle}\n"
+        f"    dffre  : {ff}\n"
+        f"  Nets  : {blocks}\n"
+        "    Avg Fanout:     3.2\n"
+        f"    Max Fanout:   {float(ff):.1f}\n"
+        "\n"
+    )
+
+    yield 'Packing', "# Packing\n"
+    yield 'Packing', (
+        "Pb types usage...\n"
+        f"  clb               : {clb}\n"
+        f"   fle              : {fle}\n"
+        f"    ble6            : {fle}\n"
+        f"     lut6           : {fle}\n"
+        f"      lut           : {fle}\n"
+        f"     ff             : {ff}\n"
+        f"  io                : {s['io']}\n"
+        f"   inpad            : {s['io'] // 2}\n"
+        f"   outpad           : {s['io'] - s['io'] // 2}\n"
+        "\n"
+        f"Total number of Logic Elements used : {fle}\n"
+        f"LEs used for logic and registers    : {min(fle, ff)}\n"
+        f"LEs used for logic only             : {max(fle - ff, 0)}\n"
+        f"LEs used for registers only         : {max(ff - fle, 0)}\n"
+        "\n"
+        "# Packing took 0.12 seconds (max_rss 40.1 MiB, delta_rss +24.7 MiB)\n"
+        f"FPGA sized to {s['grid']} x {s['grid']}: {s['grid'] * s['grid']} grid tiles (auto)\n"
+    )
+
+    if last_stage == 'Packing':
+        yield None, _succeeded(s)
+        return
+
+    yield 'Placement', "# Placement\n"
+    yield 'Placement', "------- ---------- ------- ----------- ----------- ---------- ---------- ------- ---------- ------- ------ ------- ------ ------ --------- ------\n"
+    for chunk in _filler(size // 2, _placement_row):
+        yield 'Placement', chunk
+    yield 'Placement', (
+        "# Placement took 1.20 seconds (max_rss 60.3 MiB, delta_rss +20.2 MiB)\n"
+        f"Placement estimated critical path delay (least slack): {s['place_cpd']} ns, Fmax: {1000 / s['place_cpd']:.3f} MHz\n"
+    )
+
+    if last_stage == 'Placement':
+        yield None, _succeeded(s)
+        return
+
+    yield 'Routing', "# Routing\n"
+    yield 'Routing', "---- ------ --------- ----- -------- ------ ------ ----- ------------------- ------------- ------- ---------- ------- --- --- ---\n"
+    for chunk in _filler(size - size // 2, _routing_row):
+        yield 'Routing', chunk
+    if not succeeded:
+        yield 'Routing', f"Routing failed.\n# Routing took 3.40 seconds (max_rss {s['max_rss']} MiB, delta_rss +40.0 MiB)\n"
+        yield None, f"VPR failed to implement circuit\nThe entire flow of VPR took {s['run_time']} seconds (max_rss {s['max_rss']} MiB)\n"
+        return
+    yield 'Routing', (
+        f"Circuit successfully routed with a channel width factor of {s['rcw']}.\n"
+        f"# Routing took 3.40 seconds (max_rss {s['max_rss']} MiB, delta_rss +40.0 MiB)\n"
+        f"Total wirelength: {s['twl']}, average net length: {s['twl'] / blocks:.4f}\n"
+        f"Final critical path delay (least slack): {s['cpd']} ns, Fmax: {1000 / s['cpd']:.4f} MHz\n"
+    )
+    yield None, _succeeded(s)
+
+def _succeeded(s: dict[str, any]) -> str:
+    return f"VPR succeeded\nThe entire flow of VPR took {s['run_time']} seconds (max_rss {s['max_rss']} MiB)\n"
+
+def write_vpr_out(path: str, size: int = 0, succeeded: bool = True, **stats) -> None:
+    """
+    Write a synthetic vpr.out file at once; see vpr_out_sections() for arguments.
+    """
+    with open(path, 'w') as f:
+        for _, text in vpr_out_sections(size, succeeded, **stats):
+            f.write(text)
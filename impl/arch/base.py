@@ -1,5 +1,7 @@
 from structure.arch import ArchFactory
 from structure.util import ParamsChecker
+from structure.params import Derived, Constraint
+import structure.consts.keys as keys
 from itertools import combinations
 from collections import Counter
 
@@ -1437,6 +1439,13 @@ def generate_arch(CLB_pins_per_group: int, num_feedback_ble: int, lut_size: int)
     return out
 
 
+# CLB input pins per group that match each LUT size (as used by the original LUT-size explorations)
+CLB_PIN_DICT = {3: 6, 4: 8, 5: 10, 6: 13}
+# use as a parameter to link CLB_pins_per_group to lut_size, e.g., {'lut_size': [3, 4, 5, 6], 'CLB_pins_per_group': DERIVED_CLB_PINS}
+DERIVED_CLB_PINS = Derived(lambda params: CLB_PIN_DICT[params[keys.KEY_ARCH].get('lut_size', DEFAULTS['lut_size'])])
+# or pass to ExperimentFactory/Runner to drop mismatched combinations of swept values
+CONSTRAINT_CLB_PINS = Constraint('CLB_pins_per_group matches lut_size', lambda CLB_pins_per_group, lut_size, **kwargs: CLB_PIN_DICT.get(lut_size) == CLB_pins_per_group, keys.KEY_ARCH)
+
 # Specify the parameters and their default values for this architecture here.
 DEFAULTS = {
     'CLB_pins_per_group': 13,
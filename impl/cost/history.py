@@ -0,0 +1,49 @@
+from structure.schedule import CostModel
+from structure.exp import Experiment
+from structure.store import ResultStore, get_record_value
+from structure.surrogate import Surrogate, get_numeric_features
+from impl.cost.size import is_positive
+
+import numpy as np
+
+class HistoryCostModel(CostModel):
+    """
+    Predicts run time (in seconds) with a Surrogate trained on the run times of past runs of the same design.
+    Falls back to another CostModel while there are too few past runs.
+    """
+
+    def __init__(self, store: ResultStore, surrogate: Surrogate, fallback: CostModel = None, min_records: int = 10, target: str = 'run_time'):
+        """
+        * store:ResultStore, past results to train on.
+        * surrogate:Surrogate, model to train, e.g., impl.surrogate.knn.KnnSurrogate.
+
+        Optional arguments:
+        * fallback:CostModel, used with too few past runs; pass None to predict the same cost for all. Default: None
+        * min_records:int, minimum number of past runs needed to train the surrogate. Default: 10
+        * target:str, record field or result key to predict, e.g., 'max_rss' for peak memory (MiB) instead of run time. Default: 'run_time'
+        """
+        self.store = store
+        self.surrogate = surrogate
+        self.fallback = fallback
+        self.min_records = min_records
+        self.target = target
+
+    def predict(self, experiments: list[Experiment]) -> np.ndarray:
+        records = [] if len(experiments) == 0 else [r for r in self.store.successful_records(experiments[0].design) if is_positive(get_record_value(r, self.target))]
+        if len(records) < self.min_records:
+            if self.fallback is None:
+                self.calibrated = False
+                return np.ones(len(experiments))
+            costs = self.fallback.predict(experiments)
+            self.calibrated = self.fallback.calibrated
+            return costs
+
+        candidate_features = [get_numeric_features(exp.get_full_params()) for exp in experiments]
+        feature_keys = sorted(set().union(*[f.keys() for f in candidate_features]))
+        def to_matrix(features_list: list[dict[str, float]]) -> np.ndarray:
+            return np.array([[f.get(k, 0.0) for k in feature_keys] for f in features_list], dtype=float)
+
+        self.surrogate.fit(to_matrix([get_numeric_features(r['params']) for r in records]), np.array([[get_record_value(r, self.target)] for r in records], dtype=float))
+        mean, _ = self.surrogate.predict(to_matrix(candidate_features))
+        self.calibrated = True
+        return np.maximum(mean[:, 0], 0.0)
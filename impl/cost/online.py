@@ -0,0 +1,98 @@
+from structure.schedule import CostModel
+from structure.exp import Experiment
+from structure.store import ResultStore, get_design_id
+from impl.cost.size import ParamSizeCostModel
+import structure.consts.keys as keys
+
+import math
+import threading
+import numpy as np
+
+class OnlineCostModel(CostModel):
+    """
+    Learns run times per design family (implementation, as per get_design_id()) incrementally, as experiments finish:
+    a power law run_time = a * size^b in the size of the design (as per ParamSizeCostModel.get_size()), fitted by least squares on logarithms.
+    Each observation only updates running sums, so it is cheap enough to be called for every finished experiment.
+    Families without observations use the fit over all families; without any observation at all, sizes are returned as relative costs.
+    """
+
+    MAX_EXPONENT = 3.0  # bounds extrapolation from few, similarly-sized observations
+
+    def __init__(self, store: ResultStore = None, size_model: ParamSizeCostModel = None):
+        """
+        Optional arguments:
+        * store:ResultStore, past results to start from; read once per design family, when it is first seen. Default: None
+        * size_model:ParamSizeCostModel, defines the size of a design, e.g., impl.cost.size.EstimateCostModel for estimated LUTs. Default: ParamSizeCostModel()
+        """
+        self.store = store
+        self.size_model = size_model if size_model is not None else ParamSizeCostModel()
+        self.lock = threading.Lock()
+        self.sums = {}  # family (or None for all families) -> [n, sum x, sum y, sum x^2, sum xy], with x = log(size), y = log(run_time)
+        self.seeded = set()
+
+    def _add(self, family: str, size: float, run_time: float) -> None:
+        x, y = math.log(max(size, 1.0)), math.log(run_time)
+        for key in [family, None]:
+            s = self.sums.setdefault(key, [0, 0.0, 0.0, 0.0, 0.0])
+            s[0] += 1
+            s[1] += x
+            s[2] += y
+            s[3] += x * x
+            s[4] += x * y
+
+    def _seed(self, exp: Experiment) -> str:
+        """
+        @return the family of the Experiment, after adding past results of the family from the store the first time it is seen.
+        """
+        family = get_design_id(exp.design)
+        if family in self.seeded:
+            return family
+        self.seeded.add(family)
+        if self.store is not None:
+            for r in self.store.successful_records(exp.design):
+                if r.get('run_time') is not None and r['run_time'] > 0:
+                    self._add(family, self.size_model.get_size(exp.design, r['params'][keys.KEY_DESIGN]), r['run_time'])
+        return family
+
+    def observe(self, exp: Experiment) -> None:
+        """
+        Learn from a finished Experiment; ignored if it has no run time.
+        """
+        if exp.run_time is None or exp.run_time <= 0:
+            return
+        size = self.size_model.get_size(exp.design, exp.design_params)
+        with self.lock:
+            self._add(self._seed(exp), size, exp.run_time)
+
+    def _fit(self, family: str) -> tuple[float, float]:
+        """
+        @return (log a, b) of the power law of the family, falling back to all families; or None without observations.
+        """
+        s = self.sums.get(family)
+        if s is None:
+            s = self.sums.get(None)
+        if s is None:
+            return None
+        n, sx, sy, sxx, sxy = s
+        denominator = n * sxx - sx * sx
+        # a single size (or observation) cannot give the exponent; assume run time proportional to size
+        b = (n * sxy - sx * sy) / denominator if n >= 2 and denominator > 1e-9 else 1.0
+        b = min(max(b, 0.0), self.MAX_EXPONENT)
+        return (sy - b * sx) / n, b
+
+    def predict(self, experiments: list[Experiment]) -> np.ndarray:
+        sizes = [self.size_model.get_size(exp.design, exp.design_params) for exp in experiments]
+        costs = np.empty(len(experiments), dtype=float)
+        with self.lock:
+            fits = {}
+            for i, exp in enumerate(experiments):
+                family = self._seed(exp)
+                if family not in fits:
+                    fits[family] = self._fit(family)
+                fit = fits[family]
+                if fit is None:
+                    costs[i] = sizes[i]
+                else:
+                    costs[i] = math.exp(fit[0] + fit[1] * math.log(max(sizes[i], 1.0)))
+            self.calibrated = None in self.sums
+        return costs
@@ -0,0 +1,58 @@
+from structure.schedule import CostModel
+from structure.exp import Experiment
+from structure.design import Design
+from structure.store import ResultStore, get_record_value
+import structure.consts.keys as keys
+
+import numpy as np
+
+def is_positive(v: any) -> bool:
+    return isinstance(v, (int, float)) and not isinstance(v, bool) and v > 0
+
+class ParamSizeCostModel(CostModel):
+    """
+    Predicts cost from the size of the design: the product of all positive integer Design parameters (e.g., row_num * col_num * length * data_width for GEMMs).
+    With a ResultStore, the size is scaled to seconds by the median run time per unit of size of past runs of the same design.
+    """
+
+    def __init__(self, store: ResultStore = None, min_records: int = 3, target: str = 'run_time'):
+        """
+        Optional arguments:
+        * store:ResultStore, past results to calibrate against. Default: None
+        * min_records:int, minimum number of past results needed for calibration. Default: 3
+        * target:str, record field or result key to calibrate against, e.g., 'max_rss' to predict peak memory (MiB) instead of run time. Default: 'run_time'
+        """
+        self.store = store
+        self.min_records = min_records
+        self.target = target
+
+    def get_size(self, design: Design, design_params: dict[str, any]) -> float:
+        size = 1.0
+        for v in design_params.values():
+            if isinstance(v, int) and not isinstance(v, bool) and v > 0:
+                size *= v
+        return size
+
+    def predict(self, experiments: list[Experiment]) -> np.ndarray:
+        sizes = np.array([self.get_size(exp.design, exp.design_params) for exp in experiments], dtype=float)
+        self.calibrated = False
+        if self.store is None or len(experiments) == 0:
+            return sizes
+
+        records = [r for r in self.store.successful_records(experiments[0].design) if is_positive(get_record_value(r, self.target))]
+        if len(records) < self.min_records:
+            return sizes
+
+        target_per_unit = np.median([get_record_value(r, self.target) / self.get_size(experiments[0].design, r['params'][keys.KEY_DESIGN]) for r in records])
+        self.calibrated = True
+        return sizes * target_per_unit
+
+class EstimateCostModel(ParamSizeCostModel):
+    """
+    Predicts cost from the LUTs of the design as analytically estimated by Design.estimate(), which tracks the run time of synthesis and place-and-route
+    more closely than the raw parameter product (e.g., it accounts for sparsity of constant weights and for the MACs each design instantiates).
+    Calibrated to seconds like ParamSizeCostModel.
+    """
+
+    def get_size(self, design: Design, design_params: dict[str, any]) -> float:
+        return max(float(design.estimate(**design_params)['luts']), 1.0)
@@ -1,7 +1,9 @@
-from structure.design import StandardizedSdcDesign
-from util import reset_seed, gen_long_constant_bits
+from structure.design import StandardizedSdcDesign, dot_product_registers
+from structure.params import Constraint
+from util_gen import reset_seed, gen_long_constant_bits
 from structure.consts.shared_defaults import DEFAULTS_TCL, DEFAULTS_WRAPPER_CONV
 from structure.consts.shared_requirements import REQUIRED_KEYS_CONV1D_STRIDE
+from structure.consts.shared_constraints import CONSTRAINTS_CONV1D
 
 class Conv1dFuDesign(StandardizedSdcDesign):
     """
@@ -28,6 +30,24 @@ class Conv1dFuDesign(StandardizedSdcDesign):
 
         return self.verify_required_keys(defaults, REQUIRED_KEYS_CONV1D_STRIDE, params)
 
+    def get_constraints(self) -> list[Constraint]:
+        """
+        Constraints on parameters for Conv-1D Fully Unrolled.
+        """
+        return CONSTRAINTS_CONV1D
+
+    def count_resources(self, data_width, img_w, img_d, fil_w, res_d, stride_w, **kwargs) -> dict[str, int]:
+        """
+        Resource counts for Conv-1D Fully Unrolled: one dot product of IMG_D*FILTER_L per output element.
+        """
+        result_w = (img_w - fil_w) // stride_w + 1
+        kernel = img_d * fil_w
+        return {
+            'macs': res_d * result_w * kernel,
+            'registers': res_d * result_w * dot_product_registers(data_width, kernel),
+            'weights': res_d * kernel
+        }
+
     def gen_tcl(self, wrapper_file_name: str, search_path: str, **kwargs) -> str:
         """
         Generate TCL file.
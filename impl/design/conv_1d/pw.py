@@ -1,7 +1,9 @@
-from structure.design import StandardizedSdcDesign
-from util import reset_seed, gen_long_constant_bits
+from structure.design import StandardizedSdcDesign, dot_product_registers
+from structure.params import Constraint
+from util_gen import reset_seed, gen_long_constant_bits
 from structure.consts.shared_defaults import DEFAULTS_TCL, DEFAULTS_WRAPPER_CONV
 from structure.consts.shared_requirements import REQUIRED_KEYS_CONV2D_STRIDE
+from structure.consts.shared_constraints import CONSTRAINTS_CONV1D
 
 class Conv1dPwDesign(StandardizedSdcDesign):
     """
@@ -29,6 +31,23 @@ class Conv1dPwDesign(StandardizedSdcDesign):
 
         return self.verify_required_keys(defaults, REQUIRED_KEYS_CONV2D_STRIDE, params)
     
+    def get_constraints(self) -> list[Constraint]:
+        """
+        Constraints on parameters for Conv-1D Pixel-Wise.
+        """
+        return CONSTRAINTS_CONV1D
+
+    def count_resources(self, data_width, img_w, img_d, fil_w, res_d, stride_w, **kwargs) -> dict[str, int]:
+        """
+        Resource counts for Conv-1D Pixel-Wise: a single dot product of IMG_D*FILTER_L with its window shift registers.
+        """
+        kernel = img_d * fil_w
+        return {
+            'macs': kernel,
+            'registers': dot_product_registers(data_width, kernel) + kernel * data_width,
+            'weights': res_d * kernel
+        }
+
     def gen_tcl(self, wrapper_file_name: str, search_path: str, **kwargs) -> str:
         """
         Generate TCL file.
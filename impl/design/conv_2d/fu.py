@@ -1,7 +1,9 @@
-from structure.design import StandardizedSdcDesign
-from util import reset_seed, gen_long_constant_bits
+from structure.design import StandardizedSdcDesign, dot_product_registers
+from structure.params import Constraint
+from util_gen import reset_seed, gen_long_constant_bits
 from structure.consts.shared_defaults import DEFAULTS_TCL, DEFAULTS_WRAPPER_CONV
 from structure.consts.shared_requirements import REQUIRED_KEYS_CONV2D_STRIDE
+from structure.consts.shared_constraints import CONSTRAINTS_CONV2D
 
 class Conv2dFuDesign(StandardizedSdcDesign):
     """
@@ -28,6 +30,26 @@ class Conv2dFuDesign(StandardizedSdcDesign):
         
         return self.verify_required_keys(defaults, REQUIRED_KEYS_CONV2D_STRIDE, params)
 
+    def get_constraints(self) -> list[Constraint]:
+        """
+        Constraints on parameters for Conv-2D Fully Unrolled.
+        """
+        return CONSTRAINTS_CONV2D
+
+    def count_resources(self, data_width, img_w, img_h, img_d, fil_w, fil_h, res_d, stride_w, stride_h, separate_filters, **kwargs) -> dict[str, int]:
+        """
+        Resource counts for Conv-2D Fully Unrolled: one dot product of IMG_D*FILTER_H*FILTER_W per output element.
+        """
+        result_w = (img_w - fil_w) // stride_w + 1
+        result_h = (img_h - fil_h) // stride_h + 1
+        fil_k = res_d // img_d if separate_filters else res_d
+        kernel = img_d * fil_h * fil_w
+        return {
+            'macs': res_d * result_h * result_w * kernel,
+            'registers': res_d * result_h * result_w * dot_product_registers(data_width, kernel),
+            'weights': fil_k * kernel
+        }
+
     def gen_tcl(self, wrapper_file_name: str, search_path: str, **kwargs) -> str:
         """
         Generate TCL file.
@@ -1,7 +1,9 @@
-from structure.design import StandardizedSdcDesign
-from util import reset_seed, gen_long_constant_bits
+from structure.design import StandardizedSdcDesign, dot_product_registers
+from structure.params import Constraint
+from util_gen import reset_seed, gen_long_constant_bits
 from structure.consts.shared_defaults import DEFAULTS_TCL, DEFAULTS_WRAPPER_CONV
 from structure.consts.shared_requirements import REQUIRED_KEYS_CONV2D_STRIDE
+from structure.consts.shared_constraints import CONSTRAINTS_CONV2D
 
 class Conv2dRpDesign(StandardizedSdcDesign):
     """
@@ -24,6 +26,28 @@ class Conv2dRpDesign(StandardizedSdcDesign):
         """
         return self.verify_required_keys(DEFAULTS_WRAPPER_CONV, REQUIRED_KEYS_CONV2D_STRIDE, params)
 
+    def get_constraints(self) -> list[Constraint]:
+        """
+        Constraints on parameters for Conv-2D Row-Parallel.
+        """
+        return CONSTRAINTS_CONV2D
+
+    def count_resources(self, data_width, img_w, img_h, img_d, fil_w, fil_h, res_d, stride_w, stride_h, separate_filters, **kwargs) -> dict[str, int]:
+        """
+        Resource counts for Conv-2D Row-Parallel: one dot product of IMG_D*FILTER_H*FILTER_W per output column, plus the image and result buffers of the wrapper.
+        """
+        # the wrapper fixes strides to 1
+        result_w = img_w - fil_w + 1
+        result_h = img_h - fil_h + 1
+        fil_k = res_d // img_d if separate_filters else res_d
+        kernel = img_d * fil_h * fil_w
+        buffers = (img_d * img_h * img_w + res_d * result_h * result_w) * data_width
+        return {
+            'macs': res_d * result_w * kernel,
+            'registers': res_d * result_w * dot_product_registers(data_width, kernel) + buffers,
+            'weights': fil_k * kernel
+        }
+
     def gen_tcl(self, wrapper_file_name: str, search_path: str, **kwargs) -> str:
         """
         Generate TCL file.
@@ -1,5 +1,5 @@
 from structure.design import StandardizedSdcDesign
-from util import reset_seed, generate_random_matrix
+from util_gen import reset_seed, generate_random_matrix
 from structure.consts.shared_defaults import DEFAULTS_TCL, DEFAULTS_WRAPPER
 from structure.consts.shared_requirements import REQUIRED_KEYS_GEMM
 
@@ -23,6 +23,16 @@ class GemmSDesign(StandardizedSdcDesign):
         """
         return self.verify_required_keys(DEFAULTS_WRAPPER, REQUIRED_KEYS_GEMM, params)
 
+    def count_resources(self, data_width, row_num, col_num, length, **kwargs) -> dict[str, int]:
+        """
+        Resource counts for GEMMS: a LENGTH x COL_NUM array of processing elements, each with one MAC and its forwarding registers.
+        """
+        return {
+            'macs': length * col_num,
+            'registers': length * col_num * 2 * data_width,
+            'weights': row_num * length
+        }
+
     def gen_tcl(self, wrapper_file_name: str, search_path: str, **kwargs) -> str:
         """
         Generate TCL file.
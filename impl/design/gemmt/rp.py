@@ -1,5 +1,5 @@
-from structure.design import StandardizedSdcDesign
-from util import reset_seed, generate_flattened_bit
+from structure.design import StandardizedSdcDesign, dot_product_registers
+from util_gen import reset_seed, generate_flattened_bit
 from structure.consts.shared_defaults import DEFAULTS_TCL, DEFAULTS_WRAPPER
 from structure.consts.shared_requirements import REQUIRED_KEYS_GEMM
 
@@ -23,6 +23,16 @@ class GemmTRpDesign(StandardizedSdcDesign):
         """
         return self.verify_required_keys(DEFAULTS_WRAPPER, REQUIRED_KEYS_GEMM, params)
 
+    def count_resources(self, data_width, row_num, col_num, length, **kwargs) -> dict[str, int]:
+        """
+        Resource counts for GEMMT Row-Parallel: one dot product of LENGTH per output column, reused across rows.
+        """
+        return {
+            'macs': col_num * length,
+            'registers': col_num * dot_product_registers(data_width, length),
+            'weights': length * col_num
+        }
+
     def gen_tcl(self, wrapper_file_name: str, search_path: str, **kwargs) -> str:
         """
         Generate TCL file.
@@ -0,0 +1,21 @@
+from structure.executor import Executor, run_experiment
+from structure.exp import Experiment
+
+from concurrent.futures import Future, ThreadPoolExecutor
+
+class LocalExecutor(Executor):
+    """
+    Runs Experiments on a thread pool on the local host.
+    """
+
+    def __init__(self, num_parallel_tasks: int = 1):
+        """
+        * num_parallel_tasks:int, maximum number of simultaneous threads allowed in the thread pool.
+        """
+        self.pool = ThreadPoolExecutor(max_workers=num_parallel_tasks)
+
+    def submit(self, exp: Experiment, **kwargs) -> Future:
+        return self.pool.submit(run_experiment, exp, **kwargs)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.pool.shutdown(wait=wait)
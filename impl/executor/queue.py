@@ -0,0 +1,194 @@
+from structure.executor import Executor, WorkQueue, run_experiment
+from structure.exp import Experiment
+
+import os, socket, threading, time
+from concurrent.futures import Future, wait as futures_wait
+
+class RemoteExperimentError(RuntimeError):
+    """
+    Raised for an Experiment that failed on a worker.
+    """
+    pass
+
+class QueueExecutor(Executor):
+    """
+    Runs Experiments by publishing their specs onto a WorkQueue, to be picked up by workers (see run_worker()).
+    Futures are resolved by a polling thread as workers push payloads back. Errors collecting payloads (e.g., a locked database) are retried on the
+    next poll; once max_poll_errors polls in a row fail, all pending futures fail with the last error.
+    On shutdown, futures still pending (e.g., no worker is alive) fail once shutdown_timeout has passed.
+    """
+
+    def __init__(self, queue: WorkQueue, poll_interval: float = 5.0, max_poll_errors: int = 5, shutdown_timeout: float = 60.0):
+        """
+        * queue:WorkQueue, queue shared with the workers.
+        * poll_interval:float, seconds between polls for finished jobs.
+
+        Optional arguments:
+        * max_poll_errors:int, polls in a row that may fail before all pending futures fail. Default: 5
+        * shutdown_timeout:float, seconds that shutdown(wait=True) waits for pending futures; pass None to wait indefinitely. Default: 60.0
+        """
+        self.queue = queue
+        self.poll_interval = poll_interval
+        self.max_poll_errors = max_poll_errors
+        self.shutdown_timeout = shutdown_timeout
+        self.pending: dict[str, tuple[Future, Experiment]] = {}
+        self.lock = threading.Lock()
+        self.poller = None
+        self.stop_event = threading.Event()
+
+    def submit(self, exp: Experiment, **kwargs) -> Future:
+        future = Future()
+        future.set_running_or_notify_cancel()
+        with self.lock:
+            job_id = self.queue.put(exp.get_spec(**kwargs))
+            self.pending[job_id] = (future, exp)
+            if self.poller is None or not self.poller.is_alive():
+                self.stop_event.clear()
+                self.poller = threading.Thread(target=self._poll, daemon=True)
+                self.poller.start()
+        return future
+
+    def _poll(self) -> None:
+        """
+        Resolve futures of finished jobs until none are pending.
+        """
+        poll_errors = 0
+        while not self.stop_event.is_set():
+            try:
+                collected = self.queue.collect()
+                poll_errors = 0
+            except Exception as e:
+                poll_errors += 1
+                print(f"[QueueExecutor] Unable to collect results ({poll_errors}/{self.max_poll_errors}): {repr(e)}")
+                if poll_errors >= self.max_poll_errors:
+                    self._fail_pending(e)
+                    return
+                collected = []
+
+            for job_id, payload in collected:
+                with self.lock:
+                    entry = self.pending.pop(job_id, None)
+                if entry is None:
+                    continue
+
+                future, exp = entry
+                try:
+                    exp.exp_dir = payload.get('exp_dir')
+                    exp.run_time = payload.get('run_time')
+                    if 'error' in payload:
+                        future.set_exception(RemoteExperimentError(f"[{payload.get('worker')}] {payload['error']}"))
+                    else:
+                        exp.result = payload['result']
+                        future.set_result((payload['params'], payload['result']))
+                except Exception as e:
+                    # malformed payload
+                    future.set_exception(e)
+
+            with self.lock:
+                if len(self.pending) == 0:
+                    self.poller = None
+                    return
+            self.stop_event.wait(self.poll_interval)
+
+    def _fail_pending(self, error: Exception) -> None:
+        """
+        Fail the futures of all pending jobs with error, and stop polling.
+        """
+        with self.lock:
+            entries = list(self.pending.values())
+            self.pending.clear()
+            self.poller = None
+        for future, _ in entries:
+            future.set_exception(error)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop polling, after waiting up to shutdown_timeout for pending futures if wait; futures still pending then fail, as nothing would resolve them.
+        Their jobs stay on the queue.
+        """
+        if wait:
+            with self.lock:
+                futures = [future for future, _ in self.pending.values()]
+            futures_wait(futures, timeout=self.shutdown_timeout)
+        self.stop_event.set()
+        with self.lock:
+            num_pending = len(self.pending)
+        if num_pending > 0:
+            print(f"[QueueExecutor] Shutting down with {num_pending} job(s) still pending; failing them.")
+            self._fail_pending(RemoteExperimentError('Executor was shut down before the job finished.'))
+
+def run_spec(spec: dict[str, any], worker_id: str = None) -> dict[str, any]:
+    """
+    Build and run an Experiment from its spec.
+
+    @return a JSON-compatible payload containing either the parameters and result, or the error.
+    """
+    payload = {'worker': worker_id}
+    try:
+        exp = Experiment.from_spec(spec)
+    except Exception as e:
+        payload['error'] = repr(e)
+        return payload
+
+    try:
+        params, result = run_experiment(exp, **spec.get('run_kwargs', {}))
+        payload['params'] = params
+        payload['result'] = result
+    except Exception as e:
+        payload['error'] = repr(e)
+
+    payload['exp_dir'] = exp.exp_dir
+    payload['run_time'] = exp.run_time
+    return payload
+
+def run_worker(queue: WorkQueue, worker_id: str = None, poll_interval: float = 5.0, max_jobs: int = None, idle_timeout: float = None) -> int:
+    """
+    Main loop of a worker: claim jobs from a WorkQueue, run them and push the payloads back.
+
+    Optional arguments:
+    * worker_id:str, identifier of this worker, default: <hostname>:<pid>
+    * poll_interval:float, seconds to wait when the queue is empty. Default: 5.0
+    * max_jobs:int, exit after running this many jobs. Pass None to run indefinitely. Default: None
+    * idle_timeout:float, exit after the queue has been empty for this many seconds. Pass None to wait indefinitely. Default: None
+
+    @return number of jobs run.
+    """
+    if worker_id is None:
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+    jobs_run = 0
+    idle_since = time.monotonic()
+    while max_jobs is None or jobs_run < max_jobs:
+        job = queue.claim(worker_id)
+        if job is None:
+            if idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        job_id, spec = job
+        print(f"[{worker_id}] Running job {job_id}...")
+
+        # keep the lease on the job alive while it runs
+        job_done = threading.Event()
+        heartbeat_thread = None
+        if queue.heartbeat_interval is not None:
+            def heartbeat():
+                while not job_done.wait(queue.heartbeat_interval):
+                    if not queue.heartbeat(job_id, worker_id):
+                        print(f"[{worker_id}] Lost the lease of job {job_id}; it was requeued.")
+                        return
+            heartbeat_thread = threading.Thread(target=heartbeat, daemon=True)
+            heartbeat_thread.start()
+
+        payload = run_spec(spec, worker_id)
+        job_done.set()
+        if heartbeat_thread is not None:
+            heartbeat_thread.join()
+        queue.complete(job_id, payload)
+        print(f"[{worker_id}] Job {job_id} {'failed: ' + payload['error'] if 'error' in payload else 'done'}.")
+
+        jobs_run += 1
+        idle_since = time.monotonic()
+
+    return jobs_run
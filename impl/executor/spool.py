@@ -0,0 +1,176 @@
+from structure.executor import WorkQueue
+
+import os, json, time, uuid
+
+class SpoolWorkQueue(WorkQueue):
+    """
+    WorkQueue on a plain (shared) directory, requiring no broker service.
+
+    Each job is a JSON spec file that moves between sub-directories:
+    * queued/<job ID>.json: waiting to be claimed.
+    * running/<job ID>.json: claimed by a worker via an atomic rename (its modification time set to the claim time); the worker holds a lease by
+      periodically rewriting running/<job ID>.lease, which holds its worker ID and a token unique to the claim.
+    * done/<job ID>.json: finished, with the payload written next to it as done/<job ID>.result.json.
+
+    Jobs whose lease has not been renewed within lease_timeout (e.g., the worker died), or that have no lease lease_timeout after being claimed
+    (the worker died before writing it), are moved back to queued/. A worker that finds its token gone from the lease (the job was requeued,
+    and possibly claimed again) stops renewing it, and its result is dropped.
+    """
+
+    SUBDIRS = ['queued', 'running', 'done']
+    heartbeat_interval = 60.0
+
+    def __init__(self, spool_dir: str, lease_timeout: float = 300.0):
+        """
+        * spool_dir:str, spool directory; created if it does not exist.
+        * lease_timeout:float, seconds without a heartbeat after which a running job is requeued. Should be well above heartbeat_interval.
+        """
+        self.spool_dir = spool_dir
+        self.lease_timeout = lease_timeout
+        self.collected = set()
+        self.leases = {}  # job ID -> lease content, for the jobs claimed through this instance
+        self.last_expiry_check = 0.0
+        for subdir in self.SUBDIRS:
+            os.makedirs(os.path.join(spool_dir, subdir), exist_ok=True)
+
+    def _path(self, subdir: str, file_name: str) -> str:
+        return os.path.join(self.spool_dir, subdir, file_name)
+
+    def _write_atomic(self, path: str, content: str) -> None:
+        """
+        Write a file such that readers never see a partial file.
+        """
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(content)
+        os.rename(tmp_path, path)
+
+    def _holds_lease(self, job_id: str) -> bool:
+        """
+        @return whether the lease of a job is still the one written when this instance claimed it.
+        """
+        try:
+            with open(self._path('running', f"{job_id}.lease"), 'r') as f:
+                return f.read() == self.leases.get(job_id)
+        except FileNotFoundError:
+            return False
+
+    def _now(self) -> float:
+        """
+        Current time as seen by the filesystem, so lease ages are not affected by clock skew between nodes.
+        """
+        clock_path = os.path.join(self.spool_dir, '.clock')
+        with open(clock_path, 'w'):
+            pass
+        return os.stat(clock_path).st_mtime
+
+    def put(self, spec: dict[str, any]) -> str:
+        # job IDs sort in submission order
+        job_id = f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+        self._write_atomic(self._path('queued', f"{job_id}.json"), json.dumps(spec))
+        return job_id
+
+    def claim(self, worker_id: str) -> tuple[str, dict[str, any]]:
+        if time.monotonic() - self.last_expiry_check >= self.lease_timeout / 2:
+            self.requeue_expired()
+
+        for file_name in sorted(f.name for f in os.scandir(os.path.join(self.spool_dir, 'queued')) if f.name.endswith('.json')):
+            job_id = file_name[:-len('.json')]
+            running_path = self._path('running', file_name)
+            try:
+                # only one worker can succeed in renaming the file
+                os.rename(self._path('queued', file_name), running_path)
+                # the claim time, until the lease is written (see requeue_expired())
+                os.utime(running_path)
+            except FileNotFoundError:
+                # claimed by another worker, or requeued before its claim time was set
+                continue
+
+            self.leases[job_id] = f"{worker_id}\n{uuid.uuid4().hex}"
+            self._write_atomic(self._path('running', f"{job_id}.lease"), self.leases[job_id])
+            with open(running_path, 'r') as f:
+                return job_id, json.load(f)
+
+        return None
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        # never restore a lease removed by a requeue: the job may have been claimed by another worker since
+        if not self._holds_lease(job_id):
+            return False
+        self._write_atomic(self._path('running', f"{job_id}.lease"), self.leases[job_id])
+        return True
+
+    def complete(self, job_id: str, payload: dict[str, any]) -> None:
+        lease_path = self._path('running', f"{job_id}.lease")
+        try:
+            if not self._holds_lease(job_id):
+                raise FileNotFoundError(lease_path)
+            # the rename decides between this worker and a concurrent requeue: only one of them finds the spec in running/
+            os.rename(self._path('running', f"{job_id}.json"), self._path('done', f"{job_id}.json"))
+        except FileNotFoundError:
+            print(f"Lease of job {job_id} expired and the job was requeued; dropping its result.")
+            return
+        finally:
+            self.leases.pop(job_id, None)
+
+        self._write_atomic(self._path('done', f"{job_id}.result.json"), json.dumps(payload))
+        try:
+            os.remove(lease_path)
+        except FileNotFoundError:
+            pass
+
+    def collect(self) -> list[tuple[str, dict[str, any]]]:
+        ret = []
+        suffix = '.result.json'
+        for entry in os.scandir(os.path.join(self.spool_dir, 'done')):
+            if not entry.name.endswith(suffix):
+                continue
+            job_id = entry.name[:-len(suffix)]
+            if job_id in self.collected:
+                continue
+            with open(entry.path, 'r') as f:
+                ret.append((job_id, json.load(f)))
+            self.collected.add(job_id)
+
+        if time.monotonic() - self.last_expiry_check >= self.lease_timeout / 2:
+            self.requeue_expired()
+        return ret
+
+    def requeue_expired(self) -> list[str]:
+        """
+        Move running jobs with expired leases back to the queue.
+
+        @return a list of requeued job IDs.
+        """
+        self.last_expiry_check = time.monotonic()
+        now = self._now()
+        requeued = []
+        for entry in os.scandir(os.path.join(self.spool_dir, 'running')):
+            if not entry.name.endswith('.json'):
+                continue
+            job_id = entry.name[:-len('.json')]
+            lease_path = self._path('running', f"{job_id}.lease")
+            try:
+                lease_time = os.stat(lease_path).st_mtime
+            except FileNotFoundError:
+                # claimed, but the lease is not written yet (or never will be, if the worker died): age from the claim time
+                try:
+                    lease_time = os.stat(entry.path).st_mtime
+                except FileNotFoundError:
+                    continue
+            if now - lease_time < self.lease_timeout:
+                continue
+
+            # remove the lease first, so that it is never the lease of a new claim of the job; its owner then knows it lost the job
+            try:
+                os.remove(lease_path)
+            except FileNotFoundError:
+                pass
+            try:
+                os.rename(entry.path, self._path('queued', entry.name))
+                requeued.append(job_id)
+            except FileNotFoundError:
+                # completed meanwhile
+                continue
+
+        return requeued
@@ -0,0 +1,68 @@
+from structure.executor import WorkQueue
+
+import os, json, sqlite3, time
+from contextlib import closing
+
+class SqliteWorkQueue(WorkQueue):
+    """
+    WorkQueue brokered by a single SQLite database file, e.g., on a filesystem shared by all workers.
+    """
+
+    def __init__(self, db_path: str, timeout: float = 60.0):
+        """
+        * db_path:str, path to the SQLite database; created if it does not exist.
+        * timeout:float, seconds to wait for a lock held by another process.
+        """
+        self.db_path = db_path
+        self.timeout = timeout
+        db_dir = os.path.dirname(db_path)
+        if db_dir != '':
+            os.makedirs(db_dir, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute('''CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                state TEXT NOT NULL DEFAULT 'queued',
+                spec TEXT NOT NULL,
+                payload TEXT,
+                worker TEXT,
+                submitted_at REAL,
+                claimed_at REAL,
+                finished_at REAL
+            )''')
+            conn.execute('CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, id)')
+
+    def _connect(self) -> closing:
+        """
+        Open a new connection that is closed on exiting the context; connections are not shared across threads or processes.
+        Transactions are managed explicitly.
+        """
+        return closing(sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None))
+
+    def put(self, spec: dict[str, any]) -> str:
+        with self._connect() as conn:
+            cur = conn.execute('INSERT INTO jobs (spec, submitted_at) VALUES (?, ?)', (json.dumps(spec), time.time()))
+            return str(cur.lastrowid)
+
+    def claim(self, worker_id: str) -> tuple[str, dict[str, any]]:
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute("SELECT id, spec FROM jobs WHERE state = 'queued' ORDER BY id LIMIT 1").fetchone()
+            if row is None:
+                conn.execute('COMMIT')
+                return None
+            conn.execute("UPDATE jobs SET state = 'running', worker = ?, claimed_at = ? WHERE id = ?", (worker_id, time.time(), row[0]))
+            conn.execute('COMMIT')
+            return str(row[0]), json.loads(row[1])
+
+    def complete(self, job_id: str, payload: dict[str, any]) -> None:
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET state = 'done', payload = ?, finished_at = ? WHERE id = ?", (json.dumps(payload), time.time(), int(job_id)))
+
+    def collect(self) -> list[tuple[str, dict[str, any]]]:
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            rows = conn.execute("SELECT id, payload FROM jobs WHERE state = 'done' ORDER BY id").fetchall()
+            conn.executemany("UPDATE jobs SET state = 'collected' WHERE id = ?", [(row[0],) for row in rows])
+            conn.execute('COMMIT')
+        return [(str(row[0]), json.loads(row[1])) for row in rows]
@@ -1,8 +1,181 @@
 from structure.exp import Experiment
+from structure.budget import get_core_budget
+from structure.retention import RESULT_FILE, read_result_file
+from structure.consts.shared_requirements import REQUIRED_KEYS_EXP
+from structure.consts.shared_defaults import DEFAULTS_EXP_QUARTUS
+from util_parse import extract_info_quartus
+
+import os
+import re
+import shutil
+
+WRAPPER_FILE_NAME = 'design.v'
+TCL_FILE_NAME = 'flow.tcl'
+SDC_FILE_NAME = 'flow.sdc'  # as referenced by Design.gen_tcl()
+FIT_SUMMARY_FILE_NAME = 'v1.fit.summary'
+STA_REPORT_FILE_NAME = 'v1.sta.rpt'
+STAGE_PATTERN = re.compile(r'Running Quartus Prime (.+?)\s*$', re.MULTILINE)
+
+def find_quartus_sh() -> str:
+    """
+    @return the path of quartus_sh: under $QUARTUS_ROOTDIR/bin if set, otherwise on the PATH.
+    """
+    quartus_root = os.environ.get('QUARTUS_ROOTDIR')
+    if quartus_root is not None:
+        return os.path.join(quartus_root, 'bin', 'quartus_sh')
+    path = shutil.which('quartus_sh')
+    if path is None:
+        raise RuntimeError('quartus_sh not found on the PATH, and QUARTUS_ROOTDIR not found in environment variables; unable to execute Quartus.')
+    return path
 
 class QuartusExperiment(Experiment):
-    def run(self) -> None:
+    """
+    Quartus implementation of an Experiment: compiles the wrapper with 'quartus_sh -t' on the device of Design.gen_tcl() (the ArchFactory is not used),
+    and parses the fitter summary and timing report in the 'output_dir' Experiment parameter.
+    Each compile uses 'parallel_processors_num' cores (NUM_PARALLEL_PROCESSORS), reserved from the core budget of the process with 'core_budget' cores
+    (see structure.budget.get_core_budget()), so that parallel compiles do not oversubscribe the host; with fewer cores in the budget, the compile gets all of them.
+    """
+
+    # Quartus databases are only needed to resume or inspect a compile
+    DEFAULT_RETENTION = {
+        'db/*': 'delete',
+        'qdb/*': 'delete',
+        'incremental_db/*': 'delete'
+    }
+
+    def run(self, clean=True, dry_run=False, **kwargs) -> None:
         """
         Run on Quartus.
+
+        dry_run: if True, only generate files, do not run Quartus
+        clean: if True, apply the retention policy after Quartus finishes to save space (by default, delete its databases; see Experiment.get_retention_policy())
         """
-        pass
\ No newline at end of file
+        self._prerun_check()
+        self.clean = clean
+
+        # generic experiment setup
+        self._setup_exp(REQUIRED_KEYS_EXP, DEFAULTS_EXP_QUARTUS)
+        output_dir = self.exp_params['output_dir']
+        self.PARSED_FILES = [os.path.join(output_dir, FIT_SUMMARY_FILE_NAME), os.path.join(output_dir, STA_REPORT_FILE_NAME)]
+        self.run_dir = self.exp_dir
+
+        # generate wrapper and SDC files
+        wrapper_file_name = WRAPPER_FILE_NAME
+        with self._trace('write wrapper'):
+            self._write_design_file(wrapper_file_name, lambda: self.design.gen_wrapper(**self.design_params))
+        sdc_file_name = SDC_FILE_NAME
+        with open(os.path.join(self.exp_dir, sdc_file_name), 'w') as f:
+            f.write(self.design.gen_sdc(**self.design_params))
+
+        # reserve cores
+        self.core_budget = get_core_budget(self.exp_params.get('core_budget'))
+        requested_cores = self.exp_params['parallel_processors_num']
+        with self._trace('reserve cores', cores=requested_cores):
+            self.cores_reserved = self.core_budget.reserve(requested_cores, lambda: self.cancelled)
+        cores = self.cores_reserved if self.cores_reserved > 0 else requested_cores
+
+        try:
+            # generate TCL file
+            tcl_file_name = TCL_FILE_NAME
+            with open(os.path.join(self.exp_dir, tcl_file_name), 'w') as f:
+                f.write(self.design.gen_tcl(wrapper_file_name, self.verilog_search_dir, output_dir=output_dir, parallel_processors_num=cores))
+
+            if dry_run:
+                print(f"""(!) Created under {self.exp_dir}:
+- README file: {self.readme_file_name}
+- Wrapper file: {wrapper_file_name}
+- SDC file: {sdc_file_name}
+- TCL file: {tcl_file_name}
+>>> Dry run completed.""")
+                self._release_cores()
+                return
+
+            cmd = [find_quartus_sh(), '-t', tcl_file_name]
+
+            # Make out and error files
+            self.stdout_file = open(os.path.join(self.exp_dir, self.exp_params['stdout_file']), 'w')
+            self.stderr_file = open(os.path.join(self.exp_dir, self.exp_params['stderr_file']), 'w')
+
+            # start Quartus on subprocess
+            try:
+                self._launch(cmd, stdout=self.stdout_file, stderr=self.stderr_file, cwd=self.exp_dir)
+            except Exception:
+                self.stdout_file.close()
+                self.stderr_file.close()
+                raise
+        except Exception:
+            self._release_cores()
+            raise
+
+        # start GC thread
+        self._start_gc_thread(self._clean, ())
+
+    def _release_cores(self) -> None:
+        if self.cores_reserved > 0:
+            self.core_budget.release(self.cores_reserved)
+            self.cores_reserved = 0
+
+    def _clean(self) -> None:
+        """
+        Quartus cleanup: release the cores once the compile has exited, then apply the retention policy (if clean).
+        The experiment directory is only accounted against the disk budget once parsed (see Experiment._account_disk()).
+        """
+        try:
+            super()._clean()
+        finally:
+            self._release_cores()
+        self._retain(self.exp_dir)
+
+    def get_stage(self) -> str:
+        """
+        Current Quartus module, e.g., 'Fitter', from the last 'Running Quartus Prime <module>' line of its output; None before it starts.
+        """
+        if self.exp_dir is None or self.stdout_file is None:
+            return None
+        try:
+            with open(os.path.join(self.exp_dir, self.exp_params['stdout_file']), 'r') as f:
+                stages = STAGE_PATTERN.findall(f.read())
+        except OSError:
+            return None
+        return stages[-1] if len(stages) > 0 else None
+
+    def is_finished(self) -> bool:
+        """
+        The timing report is written last; the fitter summary is written, successful or not, once fitting ends.
+        """
+        exp_dir = self.get_exp_dir()
+        if os.path.exists(os.path.join(exp_dir, RESULT_FILE)):
+            return True
+        output_dir = os.path.join(exp_dir, {**DEFAULTS_EXP_QUARTUS, **self.exp_params}['output_dir'])
+        if os.path.exists(os.path.join(output_dir, STA_REPORT_FILE_NAME)):
+            return True
+        return not extract_info_quartus(output_dir)['status'] and os.path.exists(os.path.join(output_dir, FIT_SUMMARY_FILE_NAME))
+
+    def get_inputs(self, **kwargs) -> dict[str, any]:
+        """
+        Generated wrapper (by digest, see Experiment._get_design_file_digest()), SDC and TCL files that run() uses; NUM_PARALLEL_PROCESSORS does not change results.
+        """
+        exp_params = {**DEFAULTS_EXP_QUARTUS, **self.exp_params}
+        return {
+            WRAPPER_FILE_NAME: self._get_design_file_digest(WRAPPER_FILE_NAME, lambda: self.design.gen_wrapper(**self.design_params)),
+            SDC_FILE_NAME: self.design.gen_sdc(**self.design_params),
+            TCL_FILE_NAME: self.design.gen_tcl(WRAPPER_FILE_NAME, exp_params.get('verilog_search_dir'), output_dir=exp_params['output_dir'], parallel_processors_num=1)
+        }
+
+    def get_result(self) -> dict:
+        """
+        Get result of Quartus run.
+        """
+        self._preresult_check()
+
+        output_dir = os.path.join(self.exp_dir, self.exp_params['output_dir'])
+        saved_result = read_result_file(self.exp_dir)
+        if saved_result is not None and not os.path.exists(os.path.join(output_dir, FIT_SUMMARY_FILE_NAME)):
+            # parsed before its reports were deleted or evicted
+            self.result = saved_result
+            self._account_disk()
+            return self.result
+
+        self.result = extract_info_quartus(output_dir)
+        self._retain_parsed()
+        return self.result
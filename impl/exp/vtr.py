@@ -1,37 +1,59 @@
 from structure.exp import Experiment
 from structure.consts.shared_requirements import REQUIRED_KEYS_EXP
-from util import extract_info_vtr, start_dependent_process
+from structure.scratch import get_scratch_budget, bundle_includes, copy_back, get_dir_size_mib
+from structure.retention import RESULT_FILE, read_result_file
+from util_parse import extract_info_vtr, VprLogFollower
 
 import os
-import subprocess
+import shutil
+
+WRAPPER_FILE_NAME = 'design.v'
+ARCH_FILE_NAME = 'arch.xml'
+BUNDLE_DIR_NAME = 'src'  # included Verilog files, under the run directory when staged
 
 class VtrExperiment(Experiment):
     """
     VTR implementation of an Experiment.
+
+    With the 'scratch_dir' Experiment parameter, VTR runs in <scratch_dir>/<hash> (see Experiment.get_params_hash()) instead of the experiment directory,
+    with copies of the wrapper, the architecture and the Verilog files the wrapper includes; temp/ is copied back once VTR is done (after zipping large
+    files if cleaning), and the scratch copy removed. With 'scratch_budget_mib', experiments wait for their expected size to fit in the scratch directory
+    (see structure.scratch.ScratchBudget), and the result includes the size used ('scratch_mib').
     """
 
-    def run(self, clean=True, dry_run=False, ending=None, seed=1127, **kwargs) -> None:
+    # as zipped by earlier versions
+    DEFAULT_RETENTION = {
+        'temp/parmys.out': 'compress',
+        'temp/design.net.post_routing': 'compress',
+        'temp/design.net': 'compress',
+        'temp/design.route': 'compress'
+    }
+    PARSED_FILES = ['temp/vpr.out']
+
+    def run(self, clean=True, dry_run=False, ending=None, seed=1127, vpr_args=None, **kwargs) -> None:
         """
         Run on VTR.
 
         dry_run: if True, only generate files, do not run VTR
-        clean: if True, zip the temp files after VTR finishes to save space
+        clean: if True, apply the retention policy after VTR finishes to save space (by default, zip large temp files; see Experiment.get_retention_policy())
         ending: ending stage of VTR, if None, run the whole flow, options: 'parmys', 'vpr'
         seed: random seed for VTR
+        vpr_args: list of extra arguments passed through to VPR, e.g., ['--pack'] to stop after packing
         """
         self._prerun_check()
+        self.clean = clean
 
         # generic experiment setup
         self._setup_exp(REQUIRED_KEYS_EXP)
 
         # generate wrapper file
-        wrapper_file_name = 'design.v'
-        with open(os.path.join(self.exp_dir, wrapper_file_name), 'w') as f:
-            f.write(self.design.gen_wrapper(**self.design_params))
+        wrapper_file_name = WRAPPER_FILE_NAME
+        with self._trace('write wrapper'):
+            self._write_design_file(wrapper_file_name, lambda: self.design.gen_wrapper(**self.design_params))
 
         # generate architecture file
-        arch_file_name = 'arch.xml'
-        with open(os.path.join(self.exp_dir, arch_file_name), 'w') as f:
+        arch_file_name = ARCH_FILE_NAME
+        with self._trace('write architecture'), open(os.path.join(self.exp_dir, arch_file_name), 'w') as f:
             f.write(self.arch.get_arch(**self.arch_params))
 
         if dry_run:
@@ -47,57 +69,159 @@ class VtrExperiment(Experiment):
         if vtr_root is None:
             raise RuntimeError('VTR_ROOT not found in environment variables; unable to execute VTR.')
         vtr_script_path = os.path.join(vtr_root, 'vtr_flow/scripts/run_vtr_flow.py')
+
+        # stage in the scratch directory, if any
+        search_dir = self.verilog_search_dir
+        if self.exp_params.get('scratch_dir') is not None:
+            search_dir = self._stage(wrapper_file_name, [wrapper_file_name, arch_file_name])
+        else:
+            self.run_dir = self.exp_dir
+
         cmd = ['python', vtr_script_path, wrapper_file_name, arch_file_name,
-               '-parser', 'system-verilog', '-top', self.design.wrapper_module_name, '-search', self.verilog_search_dir, '--seed', str(seed)]
+               '-parser', 'system-verilog', '-top', self.design.wrapper_module_name, '-search', search_dir, '--seed', str(seed)]
         if ending is not None:
             cmd += ['-ending_stage', ending]
+        if vpr_args is not None:
+            cmd += vpr_args
         
         # Make out and error files
         self.stdout_file = open(os.path.join(self.exp_dir, self.exp_params['stdout_file']), 'w')
         self.stderr_file = open(os.path.join(self.exp_dir, self.exp_params['stderr_file']), 'w')
 
         # start VTR on subprocess        
-        self.process = start_dependent_process(cmd, stdout=self.stdout_file, stderr=self.stderr_file, cwd=self.exp_dir)
+        try:
+            self._launch(cmd, stdout=self.stdout_file, stderr=self.stderr_file, cwd=self.run_dir)
+        except Exception:
+            self.stdout_file.close()
+            self.stderr_file.close()
+            self._unstage()
+            raise
 
         # start GC thread
         self._start_gc_thread(self._clean, (clean,))
 
-    def _clean(self, clean=True) -> None:
+    def _stage(self, wrapper_file_name: str, file_names: list[str]) -> str:
         """
-        VTR cleanup with zipping of large files.
+        Reserve room in the scratch directory, and copy the given files of the experiment directory, and the Verilog files included by the wrapper
+        (wrapper_file_name in the experiment directory), to the run directory under it.
+
+        @return the directory to search for included files.
         """
-        super()._clean()
-        if not clean:
+        scratch_dir = self.exp_params['scratch_dir']
+        self.scratch_budget = get_scratch_budget(scratch_dir, self.exp_params.get('scratch_budget_mib'))
+        estimate = self.scratch_estimate if self.scratch_estimate is not None else self.scratch_budget.get_estimate()
+        with self._trace('reserve scratch', size_mib=estimate):
+            self.scratch_reserved = self.scratch_budget.reserve(estimate, lambda: self.cancelled)
+
+        self.run_dir = os.path.join(scratch_dir, self.get_params_hash())
+        try:
+            with self._trace('stage'):
+                # leftovers of an interrupted run must not be copied back
+                shutil.rmtree(self.run_dir, ignore_errors=True)
+                os.makedirs(self.run_dir)
+                for file_name in file_names:
+                    shutil.copyfile(os.path.join(self.exp_dir, file_name), os.path.join(self.run_dir, file_name))
+                search_dir = os.path.join(self.run_dir, BUNDLE_DIR_NAME)
+                os.makedirs(search_dir)
+                with open(os.path.join(self.exp_dir, wrapper_file_name), 'r') as f:
+                    bundle_includes(f.read(), self.verilog_search_dir, search_dir)
+        except Exception:
+            self._unstage()
+            raise
+        return search_dir
+
+    def _unstage(self, used_mib: float = None) -> None:
+        """
+        Remove the run directory from the scratch directory, if staged, and release its reservation.
+        """
+        if self.run_dir is None or self.run_dir == self.exp_dir:
             return
-        
-        output_temp_dir = os.path.join(self.exp_dir, 'temp')
+        shutil.rmtree(self.run_dir, ignore_errors=True)
+        self.scratch_budget.release(self.scratch_reserved, used_mib)
+        self.run_dir = self.exp_dir
 
-        # zip parmys.out and delete the original file
-        # using subprocess to zip the file
-        possible_list = ['parmys.out', 'design.net.post_routing', 'design.net', 'design.route']
-        remove_list = []
+    def get_stage(self) -> str:
+        """
+        Current VPR stage, e.g., 'Placement', followed incrementally from vpr.out; 'Synthesis' before VPR starts.
+        """
+        if self.run_dir is None:
+            return None
+        # the run directory changes once staged in (and back from) the scratch directory
+        temp_dir = os.path.join(self.run_dir, 'temp')
+        if getattr(self, 'vpr_log', None) is None or os.path.dirname(self.vpr_log.vpr_out_path) != temp_dir:
+            self.vpr_log = VprLogFollower(temp_dir)
+        stage = self.vpr_log.poll().stage
+        return 'Synthesis' if stage is None else stage
+
+    def is_finished(self) -> bool:
+        """
+        VPR writes its log once the flow gets to VPR, and its final line at the end, successful or not; the parsed result is saved once read.
+        """
+        exp_dir = self.get_exp_dir()
+        if os.path.exists(os.path.join(exp_dir, RESULT_FILE)):
+            return True
+        vpr_out_path = os.path.join(exp_dir, 'temp', 'vpr.out')
+        if not os.path.exists(vpr_out_path):
+            return False
+        with open(vpr_out_path, 'r') as f:
+            return any(line.startswith(('VPR succeeded', 'VPR failed')) for line in f)
+
+    def get_inputs(self, ending=None, seed=1127, vpr_args=None, **kwargs) -> dict[str, any]:
+        """
+        Generated wrapper (by digest, see Experiment._get_design_file_digest()) and architecture, and the VTR options that run() uses with the same arguments.
+        """
+        return {
+            WRAPPER_FILE_NAME: self._get_design_file_digest(WRAPPER_FILE_NAME, lambda: self.design.gen_wrapper(**self.design_params)),
+            ARCH_FILE_NAME: self.arch.get_arch(**self.arch_params),
+            'top': self.design.wrapper_module_name,
+            'search': self.exp_params.get('verilog_search_dir'),
+            'seed': seed,
+            'ending': ending,
+            'vpr_args': vpr_args
+        }
 
-        for possible in possible_list:
-            if os.path.exists(os.path.join(output_temp_dir, possible)):
-                remove_list.append(possible)
+    def _clean(self, clean=True) -> None:
+        """
+        VTR cleanup with the retention policy (if clean), and copy back from the scratch directory if staged.
+        The experiment directory is only accounted against the disk budget once parsed (see Experiment._account_disk()).
+        """
+        super()._clean()
+        if self.run_dir is None or self.run_dir == self.exp_dir:
+            self._retain(self.exp_dir)
+            return
 
-        cmd = ['zip', '-r', 'largefile.zip'] + remove_list
-        zip_result = subprocess.run(cmd, cwd=output_temp_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        used_mib = get_dir_size_mib(self.run_dir)
+        self.scratch_used = used_mib
+        try:
+            # only what is retained is copied back
+            self._retain(self.run_dir)
+            temp_dir = os.path.join(self.run_dir, 'temp')
+            if os.path.isdir(temp_dir):
+                with self._trace('copy back', background=True):
+                    copy_back(temp_dir, os.path.join(self.exp_dir, 'temp'))
+        finally:
+            self._unstage(used_mib)
 
-        if zip_result.returncode == 0:
-            for remove_file in remove_list:
-                remove_path = os.path.join(output_temp_dir, remove_file)
-                if os.path.exists(remove_path):
-                    os.remove(remove_path)
-        else:
-            print(f"Unable to perform zipping for: {output_temp_dir}")
-        
     def get_result(self) -> dict:
         """
         Get result of VTR run.
         """
         self._preresult_check()
-
-        self.result = extract_info_vtr(os.path.join(self.exp_dir, 'temp'), ['clb', 'fle'])
+        if self.scratch_budget is not None and self.gcthread is not None:
+            # outputs are only in the experiment directory once copied back
+            self.gcthread.join()
+
+        temp_dir = os.path.join(self.exp_dir, 'temp')
+        saved_result = read_result_file(self.exp_dir)
+        if saved_result is not None and not os.path.exists(os.path.join(temp_dir, 'vpr.out')):
+            # parsed before its log was deleted or evicted
+            self.result = saved_result
+            self._account_disk()
+            return self.result
+
+        self.result = extract_info_vtr(temp_dir, ['clb', 'fle', 'ff'])
+        if self.scratch_used is not None:
+            self.result['scratch_mib'] = self.scratch_used
+        self._retain_parsed()
         return self.result
 
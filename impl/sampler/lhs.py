@@ -0,0 +1,15 @@
+from structure.sampling import Sampler
+
+import numpy as np
+
+class LatinHypercubeSampler(Sampler):
+    """
+    Latin hypercube: every axis is split into n equally-sized strata and each stratum is sampled exactly once,
+    so every value of a discrete axis appears about equally often, even with few points.
+    """
+
+    def sample_unit(self, dims: int) -> np.ndarray:
+        rng = np.random.default_rng(self.seed)
+        # one random permutation of the strata per axis, jittered within each stratum
+        strata = np.argsort(rng.random((self.n, dims)), axis=0)
+        return (strata + rng.random((self.n, dims))) / self.n
@@ -0,0 +1,11 @@
+from structure.sampling import Sampler
+
+import numpy as np
+
+class RandomSampler(Sampler):
+    """
+    Independent, uniformly random points.
+    """
+
+    def sample_unit(self, dims: int) -> np.ndarray:
+        return np.random.default_rng(self.seed).random((self.n, dims))
@@ -0,0 +1,20 @@
+from structure.sampling import Sampler
+
+import math
+import numpy as np
+
+class SobolSampler(Sampler):
+    """
+    Scrambled Sobol' low-discrepancy sequence, which covers the space more evenly than random points.
+    Requires SciPy (scipy.stats.qmc), which is only imported when sampling.
+    """
+
+    def sample_unit(self, dims: int) -> np.ndarray:
+        try:
+            from scipy.stats import qmc
+        except ImportError as e:
+            raise ImportError('SobolSampler requires SciPy; install it, or use LatinHypercubeSampler instead.') from e
+
+        # draw the next power of 2, which keeps the balance properties of the sequence, and keep the first n points
+        sobol = qmc.Sobol(d=dims, scramble=True, seed=self.seed)
+        return sobol.random_base2(math.ceil(math.log2(self.n)))[:self.n]
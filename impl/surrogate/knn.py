@@ -0,0 +1,47 @@
+from structure.surrogate import Surrogate
+
+import numpy as np
+
+class KnnSurrogate(Surrogate):
+    """
+    Distance-weighted k-nearest-neighbours regression on standardized features, in NumPy only.
+    The standard deviation combines the spread of the neighbours with a term that grows with the distance to the nearest training point,
+    so that predictions far from any past result are less confident.
+    """
+
+    def __init__(self, k: int = 5, distance_scale: float = 1.0):
+        """
+        * k:int, number of neighbours.
+        * distance_scale:float, weight of the distance term in the standard deviation, relative to the spread of each target over all training points.
+        """
+        self.k = k
+        self.distance_scale = distance_scale
+
+    def fit(self, X: np.ndarray, Y: np.ndarray) -> None:
+        self.x_mean = X.mean(axis=0)
+        self.x_std = X.std(axis=0)
+        self.x_std[self.x_std == 0] = 1.0
+        self.X = (X - self.x_mean) / self.x_std
+        self.Y = Y
+        self.y_std = Y.std(axis=0)
+
+    def predict(self, X: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        X = (X - self.x_mean) / self.x_std
+        # (samples, training points), without materializing pairwise differences
+        sq_dist = (X ** 2).sum(axis=1)[:, None] + (self.X ** 2).sum(axis=1)[None, :] - 2 * X @ self.X.T
+        dist = np.sqrt(np.maximum(sq_dist, 0.0))
+
+        k = min(self.k, len(self.X))
+        nearest = np.argsort(dist, axis=1)[:, :k]
+        nearest_dist = np.take_along_axis(dist, nearest, axis=1)
+        weights = 1.0 / (nearest_dist + 1e-9)
+        weights /= weights.sum(axis=1, keepdims=True)
+
+        neighbours = self.Y[nearest]  # (samples, k, targets)
+        mean = (weights[:, :, None] * neighbours).sum(axis=1)
+        spread = (weights[:, :, None] * (neighbours - mean[:, None, :]) ** 2).sum(axis=1)
+
+        # normalize the distance by the number of features, so the term is comparable across feature sets
+        remoteness = nearest_dist[:, :1] / np.sqrt(X.shape[1]) if X.shape[1] > 0 else np.zeros((len(X), 1))
+        std = np.sqrt(spread + (self.distance_scale * remoteness * self.y_std[None, :]) ** 2)
+        return mean, std
@@ -1,7 +1,7 @@
 import os
 os.chdir(os.path.dirname(os.path.realpath(__file__))) # change working directory to this file's directory (for background scripts)
 
-from structure.run import Runner
+from structure.run import Runner, get_shard_arg
 from impl.exp.vtr import VtrExperiment
 from impl.arch.base import BaseArchFactory
 from impl.design.gemmt.fu import GemmTFuDesign
@@ -29,7 +29,8 @@ runner = Runner(
     BaseArchFactory(), # concrete ArchFactory
     GemmTFuDesign(),   # concrete Design
     VtrExperiment,     # concrete Experiment
-    params             # parameters
+    params,            # parameters
+    shard=get_shard_arg()  # '--shard i/N' to only run a slice of the sweep
 )
 results = runner.run_all_threaded(
     track_run_time=True,                                    # logs execution time of ALL experiments
@@ -0,0 +1,112 @@
+"""
+Adaptive exploration of the grid of variable parameters: evaluate a coarse subset first, then refine only where metrics change fast or are near the Pareto front.
+"""
+
+from itertools import product
+
+def is_numeric_axis(values: list) -> bool:
+    """
+    Check if all values of an axis are numbers (booleans excluded), i.e., the axis is ordered and may be refined.
+    """
+    return all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values)
+
+def dominates(a: dict[str, float], b: dict[str, float], objectives: dict[str, str]) -> bool:
+    """
+    Check if metrics a Pareto-dominate metrics b.
+
+    * objectives:dict[str, str], metric key to 'max' or 'min'.
+    """
+    strictly_better = False
+    for k, direction in objectives.items():
+        x, y = (a[k], b[k]) if direction == 'max' else (b[k], a[k])
+        if x < y:
+            return False
+        if x > y:
+            strictly_better = True
+    return strictly_better
+
+def pareto_front(points: dict[any, dict[str, float]], objectives: dict[str, str]) -> set:
+    """
+    @return the set of keys of points that are not dominated by any other point.
+    """
+    return set(k for k, m in points.items() if not any(dominates(o, m, objectives) for o in points.values() if o is not m))
+
+class AdaptiveSampler():
+    """
+    Chooses which points (index tuples into the lists of values of each axis) to evaluate.
+
+    The coarse set takes the corners and midpoint of every numeric axis, and all values of non-numeric axes.
+    Each refinement then bisects the gap between two evaluated neighbours along a numeric axis if:
+    * any metric changes by more than the relative threshold between them,
+    * either neighbour failed while the other did not, or
+    * either neighbour is on the Pareto front.
+    """
+
+    def __init__(self, axes: list[list], objectives: dict[str, str], threshold: float = 0.1):
+        """
+        * axes:list[list], list of values for each variable parameter.
+        * objectives:dict[str, str], metric key to 'max' or 'min'; used for the relative change and the Pareto front.
+        * threshold:float, relative change in any metric between neighbours that triggers refinement.
+        """
+        self.axes = axes
+        self.objectives = objectives
+        self.threshold = threshold
+        self.numeric = [is_numeric_axis(values) for values in axes]
+
+    def initial(self) -> list[tuple]:
+        """
+        @return the coarse set of points.
+        """
+        per_axis = []
+        for values, numeric in zip(self.axes, self.numeric):
+            last = len(values) - 1
+            per_axis.append(sorted(set([0, last // 2, last])) if numeric else list(range(len(values))))
+        return list(product(*per_axis))
+
+    def _relative_change(self, a: dict[str, float], b: dict[str, float]) -> float:
+        change = 0.0
+        for k in self.objectives:
+            scale = max(abs(a[k]), abs(b[k]))
+            if scale > 0:
+                change = max(change, abs(a[k] - b[k]) / scale)
+        return change
+
+    def refine(self, evaluated: dict[tuple, dict[str, float]]) -> list[tuple]:
+        """
+        * evaluated:dict[tuple, dict[str, float]], all points evaluated so far, mapped to their metrics (None if the point failed).
+
+        @return new points to evaluate, most promising first; empty if the exploration has converged.
+        """
+        front = pareto_front({k: m for k, m in evaluated.items() if m is not None}, self.objectives)
+        candidates = {}
+        for point, metrics in evaluated.items():
+            for axis, numeric in enumerate(self.numeric):
+                if not numeric:
+                    continue
+
+                # nearest evaluated neighbour along this axis, in the increasing direction
+                neighbour = None
+                for i in range(point[axis] + 1, len(self.axes[axis])):
+                    other = (*point[:axis], i, *point[axis + 1:])
+                    if other in evaluated:
+                        neighbour = other
+                        break
+                if neighbour is None or neighbour[axis] - point[axis] <= 1:
+                    continue
+
+                neighbour_metrics = evaluated[neighbour]
+                if (metrics is None) != (neighbour_metrics is None):
+                    priority = float('inf')
+                elif metrics is None:
+                    continue
+                else:
+                    priority = self._relative_change(metrics, neighbour_metrics)
+                    if priority <= self.threshold:
+                        if point not in front and neighbour not in front:
+                            continue
+                        priority = self.threshold
+
+                midpoint = (*point[:axis], (point[axis] + neighbour[axis]) // 2, *point[axis + 1:])
+                candidates[midpoint] = max(priority, candidates.get(midpoint, 0.0))
+
+        return sorted(candidates, key=lambda p: candidates[p], reverse=True)
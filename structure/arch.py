@@ -1,4 +1,5 @@
 from structure.util import DynamicallyNamed
+from structure.params import Constraint
 
 class ArchFactory(DynamicallyNamed):
     """
@@ -13,4 +14,10 @@ class ArchFactory(DynamicallyNamed):
 
         @return "arch.xml" file, in a single string.
         """
-        self.raise_unimplemented("get_arch")
\ No newline at end of file
+        self.raise_unimplemented("get_arch")
+
+    def get_constraints(self) -> list[Constraint]:
+        """
+        Get the constraints that valid parameters of this ArchFactory must satisfy; combinations that fail any are never generated.
+        """
+        return []
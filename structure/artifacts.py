@@ -0,0 +1,104 @@
+"""
+Content-addressed store of generated design files (e.g., wrappers with constant weights), shared by all experiments of the same design point:
+a sweep over architecture parameters generates and writes each file once, and hardlinks it into every experiment directory.
+"""
+
+from structure.util import get_class_path
+from structure.design import Design
+
+import os, json, shutil, hashlib, threading
+from typing import Callable
+
+class ArtifactCache():
+    """
+    Files generated from a Design, under a cache directory:
+    * objects/<ab>/<digest>: each distinct content once, named after its SHA-256.
+    * keys/<ab>/<key>: the digest of the file generated for a key, i.e., a hash of the Design class, its init parameters, its verified parameters and the file name.
+    Both are written with an atomic rename, so concurrent experiments (or hosts sharing the directory) never see partial files; at worst they generate the
+    same file twice.
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        * cache_dir:str, directory of the cache; hardlinks need it on the same file system as the experiment directories, otherwise files are copied.
+        """
+        self.cache_dir = cache_dir
+
+    def get_key(self, design: Design, design_params: dict[str, any], file_name: str) -> str:
+        """
+        @return the key of the file file_name generated by a Design with verified parameters design_params.
+        """
+        identity = {
+            'design': get_class_path(design.__class__),
+            'init': design.get_init_params(),
+            'params': design_params,
+            'file': file_name
+        }
+        return hashlib.sha256(json.dumps(identity, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _get_path(self, kind: str, name: str) -> str:
+        return os.path.join(self.cache_dir, kind, name[:2], name)
+
+    def _write_atomic(self, path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def get_digest(self, key: str) -> str:
+        """
+        @return the digest of the content cached for key, or None if there is none.
+        """
+        try:
+            with open(self._get_path('keys', key), 'r') as f:
+                digest = f.read().strip()
+        except FileNotFoundError:
+            return None
+        # the object may have been evicted, e.g., by hand
+        return digest if os.path.exists(self._get_path('objects', digest)) else None
+
+    def put(self, key: str, text: str) -> str:
+        """
+        Cache the content of a generated file under key.
+
+        @return its digest.
+        """
+        data = text.encode()
+        digest = hashlib.sha256(data).hexdigest()
+        object_path = self._get_path('objects', digest)
+        if not os.path.exists(object_path):
+            self._write_atomic(object_path, data)
+        self._write_atomic(self._get_path('keys', key), digest.encode())
+        return digest
+
+    def get_or_generate(self, key: str, generate: Callable[[], str]) -> str:
+        """
+        @return the digest of the content cached for key, generating and caching it first if there is none.
+        """
+        digest = self.get_digest(key)
+        if digest is None:
+            digest = self.put(key, generate())
+        return digest
+
+    def read(self, digest: str) -> str:
+        """
+        @return the cached content of a digest.
+        """
+        with open(self._get_path('objects', digest), 'r') as f:
+            return f.read()
+
+    def link(self, digest: str, path: str) -> None:
+        """
+        Place the cached content of a digest at path, as a hardlink if possible and as a copy otherwise (e.g., across file systems).
+        Cached files are shared, so they must never be modified in place.
+        """
+        object_path = self._get_path('objects', digest)
+        if os.path.lexists(path):
+            if os.path.exists(path) and os.path.samefile(object_path, path):
+                return
+            os.remove(path)
+        try:
+            os.link(object_path, path)
+        except OSError:
+            shutil.copyfile(object_path, path)
@@ -0,0 +1,64 @@
+"""
+Budgets of resources shared by the experiments running at the same time in a process (e.g., CPU cores, scratch space): each experiment reserves what
+it needs before it starts, and waits while that would exceed the budget.
+"""
+
+import os, threading
+
+class ResourceBudget():
+    """
+    Total amount of a resource, reserved and released by running experiments.
+    A reservation beyond the budget is reduced to the budget, so that the experiment can still run on its own.
+    """
+
+    def __init__(self, total: float):
+        """
+        * total:float, amount available to all running experiments; None for no limit.
+        """
+        self.total = total
+        self.reserved = 0
+        self.condition = threading.Condition()
+
+    def reserve(self, amount: float, is_cancelled=None) -> float:
+        """
+        Wait until amount fits in the budget next to the reservations of running experiments, and reserve it.
+
+        Optional arguments:
+        * is_cancelled:Callable[[], bool], stop waiting (and reserve nothing) once it returns True. Default: None
+
+        @return the reserved amount, to pass to release(); 0 without a limit.
+        """
+        if self.total is None:
+            return 0
+        amount = min(max(amount, 0), self.total)
+        with self.condition:
+            while self.reserved > 0 and self.reserved + amount > self.total:
+                if is_cancelled is not None and is_cancelled():
+                    return 0
+                self.condition.wait(0.5)
+            self.reserved += amount
+        return amount
+
+    def release(self, amount: float) -> None:
+        """
+        Release a reservation made with reserve().
+        """
+        with self.condition:
+            self.reserved = max(self.reserved - amount, 0)
+            self.condition.notify_all()
+
+core_budgets = {}  # total cores -> ResourceBudget
+core_budgets_lock = threading.Lock()
+
+def get_core_budget(total: int = None) -> ResourceBudget:
+    """
+    @return the budget of CPU cores shared by all experiments of this process with the same total cores (the number of CPUs if None).
+    Budgets are keyed by their total, so that experiments with another total never resize the reservations of running ones.
+    """
+    if total is None:
+        total = os.cpu_count()
+    with core_budgets_lock:
+        budget = core_budgets.get(total)
+        if budget is None:
+            budget = core_budgets[total] = ResourceBudget(total)
+        return budget
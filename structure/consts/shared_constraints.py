@@ -0,0 +1,20 @@
+"""
+Constraints that are shared across multiple implementations.
+"""
+
+from structure.params import Constraint
+import structure.consts.keys as keys
+
+# --- Start: Design
+
+# Convolution
+CONSTRAINTS_CONV1D = [
+    Constraint('fil_w <= img_w', lambda fil_w, img_w, **kwargs: fil_w <= img_w, keys.KEY_DESIGN),
+    Constraint('res_d divisible by img_d with separate_filters', lambda res_d, img_d, separate_filters=False, **kwargs: not separate_filters or res_d % img_d == 0, keys.KEY_DESIGN),
+]
+CONSTRAINTS_CONV2D = [
+    *CONSTRAINTS_CONV1D,
+    Constraint('fil_h <= img_h', lambda fil_h, img_h, **kwargs: fil_h <= img_h, keys.KEY_DESIGN),
+]
+
+# --- End: Design
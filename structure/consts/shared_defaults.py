@@ -5,11 +5,21 @@ Defaults that are shared across multiple implementations.
 DEFAULTS_EXP = {
     'stdout_file': 'std.out',
     'stderr_file': 'std.err',
+    'variant': None,  # distinguishes runs of identical parameters, e.g., fidelity or seed; part of the experiment directory name
+    'dir_naming': 'hash',  # 'hash' for short hashed directories (names in the index file of root_dir), or 'name' for human-readable ones
+    'scratch_dir': None,  # local directory (e.g., tmpfs or a local SSD) to run the tool in, copying back only what is kept; None to run in the experiment directory
+    'scratch_budget_mib': None,  # total size of all experiments running in scratch_dir at the same time; None for no limit
+    'artifact_dir': None,  # directory of a structure.artifacts.ArtifactCache, to generate design files once per design point and hardlink them; None to always generate
+    'retention': None,  # glob pattern to 'keep', 'compress' or 'delete', applied when cleaning (see structure.retention.RetentionPolicy); None for the Experiment's default
+    'disk_budget_mib': None,  # total size of root_dir, beyond which the least recently used files are evicted (never results and sidecars); None for no limit
+    'min_free_disk_mib': None,  # free disk space below which launches pause; None to never pause
+    'core_budget': None,  # CPU cores shared by all multi-threaded tool runs of a process with the same value (see structure.budget); None for the number of CPUs
 }
 
 DEFAULTS_EXP_QUARTUS = {
     **DEFAULTS_EXP,
     'output_dir': 'outputs',
+    'parallel_processors_num': 4,  # NUM_PARALLEL_PROCESSORS of a compile, reserved from the core budget
 }
 
 DEFAULTS_TCL = {
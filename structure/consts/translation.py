@@ -4,7 +4,18 @@ Provides key translations, i.e., parameter names to human-readable labels.
 
 TRANSLATIONS_EXP = {
     'root_dir': 'Experiment root directory',
-    'verilog_search_dir': 'SystemVerilog search directory'
+    'verilog_search_dir': 'SystemVerilog search directory',
+    'variant': 'Variant',
+    'dir_naming': 'Directory naming',
+    'scratch_dir': 'Scratch directory',
+    'scratch_budget_mib': 'Scratch size budget (MiB)',
+    'artifact_dir': 'Design artifact cache directory',
+    'retention': 'Retention policy',
+    'disk_budget_mib': 'Disk budget (MiB)',
+    'min_free_disk_mib': 'Minimum free disk space (MiB)',
+    'core_budget': 'Core budget',
+    'output_dir': 'Output directory',
+    'parallel_processors_num': 'No. of parallel processors'
 }
 
 TRANSLATIONS_ARCH = {
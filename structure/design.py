@@ -1,4 +1,15 @@
 from structure.util import ParamsChecker, DynamicallyNamed
+from structure.params import Constraint
+import structure.consts.keys as keys
+
+import statistics
+
+def dot_product_registers(data_width: int, length: int) -> int:
+    """
+    Register bits of one tree_mac/multiply_core_evo of the given length: buffered inputs and product per element, and one register per adder of the (power-of-2) tree.
+    """
+    tree_size = 1 << max(length - 1, 0).bit_length()
+    return data_width * (3 * length + tree_size - 1)
 
 class Design(DynamicallyNamed, ParamsChecker):
     """
@@ -15,7 +26,94 @@ class Design(DynamicallyNamed, ParamsChecker):
         if wrapper_module_name is None and impl is not None:
             wrapper_module_name = f"{impl}_wrapper"
         self.wrapper_module_name = wrapper_module_name
+        # scales of the analytic LUT and FF counts of estimate(), fitted by calibrate()
+        self.lut_scale = 1.0
+        self.ff_scale = 1.0
+        self.calibrated = False
+
+    def get_init_params(self) -> dict[str, any]:
+        """
+        Get the constructor arguments of this Design, so that an identical Design can be created elsewhere (e.g., on a worker).
+        """
+        return {
+            'impl': self.impl,
+            'module_dir': self.module_dir,
+            'wrapper_module_name': self.wrapper_module_name
+        }
     
+    def get_constraints(self) -> list[Constraint]:
+        """
+        Get the constraints that valid parameters of this Design must satisfy; combinations that fail any are never generated.
+        """
+        return []
+
+    def count_resources(self, **kwargs) -> dict[str, int]:
+        """
+        {abstract}
+        Count the resources of this Design with the given (verified) parameters, from its structure:
+        * macs:int, multiply-accumulate units instantiated.
+        * registers:int, datapath register bits.
+        * weights:int, number of weights (filter or matrix values).
+        """
+        self.raise_unimplemented("count_resources")
+
+    def estimate(self, **kwargs) -> dict[str, any]:
+        """
+        Estimate the size of this Design with the given parameters, without running any tool.
+
+        @return a dictionary of:
+        * macs:int, multiply-accumulate units instantiated.
+        * registers:int, datapath register bits.
+        * constant_weight_bits:int, bits of constant weights in the wrapper (0 without constant weights).
+        * nonzero_weights:int, weights that are not zero (all, without constant weights).
+        * luts:float, predicted LUTs (VTR fle); a rough analytic count, unless calibrated.
+        * ffs:float, predicted flip-flops (VTR ff); the register bits, unless calibrated.
+        * calibrated:bool, whether luts and ffs were calibrated against past results (see calibrate()).
+        """
+        params = self.verify_params(kwargs)
+        counts = self.count_resources(**params)
+        data_width = params['data_width']
+        constant_weight = params.get('constant_weight', False)
+
+        weights = counts['weights']
+        nonzero_weights = weights - int(weights * params['sparsity']) if constant_weight else weights
+        density = nonzero_weights / weights if weights > 0 else 1.0
+        # an adder per MAC, and a (truncated) multiplier that constant zero weights remove
+        luts = counts['macs'] * (data_width + density * data_width * data_width / 2)
+
+        return {
+            'macs': counts['macs'],
+            'registers': counts['registers'],
+            'constant_weight_bits': weights * data_width if constant_weight else 0,
+            'nonzero_weights': nonzero_weights,
+            'luts': luts * self.lut_scale,
+            'ffs': counts['registers'] * self.ff_scale,
+            'calibrated': self.calibrated
+        }
+
+    def calibrate(self, records: list[dict[str, any]], lut_key: str = 'fle', ff_key: str = 'ff', min_records: int = 3) -> bool:
+        """
+        Scale the LUT and FF counts of estimate() by the median ratio of actual to analytic counts in past results of this Design,
+        e.g., ResultStore.successful_records(design).
+
+        Optional arguments:
+        * lut_key:str, result key of the actual LUT count. Default: 'fle'
+        * ff_key:str, result key of the actual FF count. Default: 'ff'
+        * min_records:int, minimum number of past results with a count needed to calibrate it. Default: 3
+
+        @return True if either count was calibrated.
+        """
+        self.lut_scale = self.ff_scale = 1.0
+        self.calibrated = False
+        estimates = [(self.estimate(**r['params'][keys.KEY_DESIGN]), r['result']) for r in records]
+        for key, estimate_key, scale_attr in [(lut_key, 'luts', 'lut_scale'), (ff_key, 'ffs', 'ff_scale')]:
+            ratios = sorted(result[key] / estimate[estimate_key] for estimate, result in estimates
+                            if isinstance(result.get(key), (int, float)) and result[key] > 0 and estimate[estimate_key] > 0)
+            if len(ratios) >= min_records:
+                setattr(self, scale_attr, statistics.median(ratios))
+                self.calibrated = True
+        return self.calibrated
+
     def gen_sdc(self, **kwargs) -> str:
         """
         Generate an SDC file (Quartus-only).
@@ -0,0 +1,113 @@
+"""
+Executors run Experiments on behalf of a structure.run.Runner, e.g., on local threads or on remote workers.
+"""
+
+from structure.util import Abstract
+from structure.exp import Experiment, ExperimentCancelledError
+
+from concurrent.futures import Future
+from timeit import default_timer as timer
+import time
+
+def run_experiment(exp: Experiment, **kwargs) -> tuple[dict, dict]:
+    """
+    Run an Experiment to completion and record its run time.
+    All keyword arguments are passed directly to the Experiment.run() function.
+
+    @return a tuple of (full parameters, result) of the Experiment.
+    """
+    tracer = exp.tracer
+    if tracer is not None:
+        tracer.begin_slot(exp)
+    try:
+        with exp._trace(exp.get_exp_name(), params_hash=exp.get_params_hash()):
+            start_time = timer()
+            exp.start_time = time.time()
+            exp.run(**kwargs)
+            if tracer is not None:
+                tracer.follow_stages(exp)
+            exp.wait()
+            exp.run_time = timer() - start_time
+            if tracer is not None and exp.process is not None:
+                tracer.instant('exit', exp, 'process', returncode=exp.process.returncode)
+            if exp.cancelled:
+                raise ExperimentCancelledError('Experiment was cancelled while running.')
+            with exp._trace('parse'):
+                return exp.get_full_params(), exp.get_result()
+    finally:
+        # failed or cancelled runs are never parsed, and their files may go
+        exp._account_disk()
+        if tracer is not None:
+            tracer.end_slot(exp)
+
+class Executor(Abstract):
+    """
+    {abstract}
+    Backend that runs Experiments and reports their outcomes through futures.
+    """
+
+    def submit(self, exp: Experiment, **kwargs) -> Future:
+        """
+        {abstract}
+        Schedule an Experiment to be run. All keyword arguments are passed to Experiment.run().
+
+        @return a Future that resolves to (full parameters, result) of the Experiment, as per run_experiment().
+        """
+        self.raise_unimplemented("submit")
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        {abstract}
+        Release all resources held by the executor.
+        """
+        self.raise_unimplemented("shutdown")
+
+class WorkQueue(Abstract):
+    """
+    {abstract}
+    Queue of serialized Experiment specs (see Experiment.get_spec()) shared between a submitter and any number of workers.
+    """
+
+    heartbeat_interval: float = None  # seconds between heartbeat() calls by a worker; None if not required
+
+    def put(self, spec: dict[str, any]) -> str:
+        """
+        {abstract}
+        Enqueue a spec.
+
+        @return a unique job ID.
+        """
+        self.raise_unimplemented("put")
+
+    def claim(self, worker_id: str) -> tuple[str, dict[str, any]]:
+        """
+        {abstract}
+        Claim the next queued job for a worker.
+
+        @return a tuple of (job ID, spec), or None if no jobs are queued.
+        """
+        self.raise_unimplemented("claim")
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """
+        Signal that a worker is still running a claimed job. Called every heartbeat_interval seconds.
+
+        @return whether the worker still holds the job; if not (e.g., it was requeued), the worker stops sending heartbeats for it.
+        """
+        return True
+
+    def complete(self, job_id: str, payload: dict[str, any]) -> None:
+        """
+        {abstract}
+        Push the payload of a finished job back to the submitter.
+        """
+        self.raise_unimplemented("complete")
+
+    def collect(self) -> list[tuple[str, dict[str, any]]]:
+        """
+        {abstract}
+        Collect payloads of all jobs that finished since the last call.
+
+        @return a list of (job ID, payload).
+        """
+        self.raise_unimplemented("collect")
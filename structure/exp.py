@@ -1,14 +1,80 @@
-from structure.util import ParamsChecker
+from structure.util import ParamsChecker, get_class_path, load_class
 from structure.arch import ArchFactory
 from structure.design import Design
+from structure.params import Zip, Derived, Constraint, Range
+from structure.sampling import Sampler
+from structure.artifacts import ArtifactCache
+from structure.retention import RetentionPolicy, RESULT_FILE, get_disk_budget, get_disk_watcher, write_result_file
 import structure.consts.keys as keys
 import structure.consts.translation as translations
 from structure.consts.shared_defaults import DEFAULTS_EXP
 
-import os, threading
+import os, threading, math, hashlib, json
 from copy import deepcopy
+from itertools import product
+from collections import Counter
+from collections.abc import Sequence
 from typing import Type, TypeVar, Callable
-from tabulate import tabulate
+from structure.trace import trace_span
+from util import start_dependent_process, kill_process_tree
+
+EXP_HASH_LENGTH = 12
+EXP_INDEX_FILE = 'index.jsonl'
+exp_index_lock = threading.Lock()
+exp_index_entries = {}  # real path of an index file -> entries in it by hash, loaded on first use
+
+def add_to_exp_index(root_dir: str, params_hash: str, rel_dir: str, name: str, identity: str = None) -> None:
+    """
+    Append an entry to the index file of root_dir, which maps hashed experiment directories to human-readable names, unless it has one for params_hash
+    (e.g., on a rerun). Entries appended by other processes after the first call are not seen; read_exp_index() keeps one entry per hash regardless.
+
+    Optional arguments:
+    * identity:str, full digest of the Experiment's identity (see Experiment.get_identity()), to tell a rerun from a different Experiment with the same
+      (truncated) hash. Entries without one are compared by name. Default: None
+    """
+    entry = {'hash': params_hash, 'dir': rel_dir, 'name': name}
+    if identity is not None:
+        entry['identity'] = identity
+    path = os.path.join(root_dir, EXP_INDEX_FILE)
+    with exp_index_lock:
+        key = os.path.realpath(path)
+        entries = exp_index_entries.get(key)
+        if entries is None:
+            entries = exp_index_entries[key] = read_exp_index(root_dir)
+        other = entries.get(params_hash)
+        if other is not None:
+            field = 'identity' if identity is not None and 'identity' in other else 'name'
+            if other[field] != entry[field]:
+                raise ValueError(f"Hash collision in {path}: '{other['name']}' and '{name}' both hash to {params_hash}; increase EXP_HASH_LENGTH "
+                                 "(in structure.exp), or use the 'name' dir_naming.")
+            return
+        # a single append per entry, so concurrent writers do not interleave
+        with open(path, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+        entries[params_hash] = entry
+
+def read_exp_index(root_dir: str) -> dict[str, dict[str, str]]:
+    """
+    Read the index file of root_dir.
+
+    @return each hash mapped to its (last) entry, with the directory ('dir', relative to root_dir), human-readable name ('name') and, for entries
+    written since it is recorded, the digest of the Experiment's identity ('identity').
+    """
+    index = {}
+    path = os.path.join(root_dir, EXP_INDEX_FILE)
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            for line in f:
+                if line.endswith('\n'):
+                    entry = json.loads(line)
+                    index[entry['hash']] = entry
+    return index
+
+class ExperimentCancelledError(RuntimeError):
+    """
+    Raised when running an Experiment that was cancelled.
+    """
+    pass
 
 class Experiment(ParamsChecker):
     """
@@ -16,6 +82,10 @@ class Experiment(ParamsChecker):
     Experiment meant to be run by a structure.run.Runner.
     """
 
+    DEFAULT_RETENTION = {}  # retention rules (see structure.retention.RetentionPolicy) when cleaning, unless overridden by the 'retention' parameter
+    PARSED_FILES = []  # files (relative to the experiment directory) read by get_result(), only subject to retention once parsed
+    PATH_PARAMS = ['root_dir', 'verilog_search_dir', 'scratch_dir', 'artifact_dir']  # Experiment parameters that are paths, relative to the working directory
+
     def __init__(self, arch: ArchFactory, design: Design, params: dict[str, dict[str, any]]) -> None:
         """
         Takes in an ArchFactory, Design, and a full set of Experiment parameters (meant to be split for different subclasses).
@@ -33,6 +103,7 @@ class Experiment(ParamsChecker):
             raise ValueError(f"Experiment parameters requires Design parameters provided under key '{keys.KEY_DESIGN}'!")
         
         self.root_dir = None
+        self.exp_dir = None
         self.arch = arch
         self.arch_params = self.arch.verify_params(self.arch_params)
         self.design = design
@@ -44,32 +115,214 @@ class Experiment(ParamsChecker):
         self.stderr_file = None  # stderr file
         self.gcthread = None  # thread for garbage collection
         self.result = None  # result of the experiment
+        self.run_time = None  # wall-clock run time in seconds, filled in by the executor
+        self.start_time = None  # UNIX time at which it started running, filled in by the executor
+        self.tracer = None  # structure.trace.Tracer recording the events of this Experiment, set by the Runner
+        self.cancelled = False  # set by cancel()
+        self.cancel_lock = threading.Lock()  # guards process launch against cancel()
+        self.sweep_index = None  # position in the ExperimentSpace it was generated from, if any
+        self.run_dir = None  # directory the tool runs in: the experiment directory, or one under the scratch directory if staged
+        self.scratch_estimate = None  # predicted size in the scratch directory (MiB), set by a structure.schedule.Scheduler with a scratch model
+        self.scratch_budget = None  # structure.scratch.ScratchBudget reserved from, if staged
+        self.scratch_reserved = 0.0  # MiB reserved from scratch_budget
+        self.scratch_used = None  # MiB used in the scratch directory, once done
+        self.clean = False  # whether to apply the retention policy, as per Experiment.run()
+        self.disk_accounted = False  # whether the experiment directory has been accounted against the disk budget since it was set up
 
-    def _setup_exp(self, required_keys: list[str]) -> None:
+    def _setup_exp(self, required_keys: list[str], defaults: dict[str, any] = DEFAULTS_EXP) -> None:
         """
         Sets up the experiment when needed, i.e., make folders and README.
 
         * required_keys: list of keys that are required in Experiment parameters.
+
+        Optional arguments:
+        * defaults:dict, defaults of the Experiment parameters, e.g., with tool-specific ones. Default: DEFAULTS_EXP
         """
         # Check all parameters.
-        self.exp_params = self.verify_required_keys(DEFAULTS_EXP, required_keys, self.exp_params)
+        self.exp_params = self.verify_required_keys(defaults, required_keys, self.exp_params)
          # make root and experiment directory
         self.root_dir = self.exp_params['root_dir']
         self.verilog_search_dir = self.exp_params['verilog_search_dir']
-        self.exp_dir = os.path.join(self.root_dir, f"{self.arch.get_name(**self.arch_params)}--{self.design.get_name(**self.design_params)}")
+        self.exp_dir = self.get_exp_dir()
         os.makedirs(self.exp_dir, exist_ok=True)
+        # nothing in the experiment directory may be evicted until its results are parsed (see _account_disk())
+        disk_budget = self.get_disk_budget()
+        self.disk_accounted = False
+        if disk_budget is not None:
+            disk_budget.hold(self.exp_dir)
+        # the result saved by an earlier run no longer applies
+        if os.path.exists(os.path.join(self.exp_dir, RESULT_FILE)):
+            os.remove(os.path.join(self.exp_dir, RESULT_FILE))
+        if self.exp_params['dir_naming'] == 'hash':
+            add_to_exp_index(self.root_dir, self.get_params_hash(), os.path.relpath(self.exp_dir, self.root_dir), self.get_exp_name(),
+                             identity=hashlib.sha256(self.get_identity().encode()).hexdigest())
 
         # generate README file
         self.readme_file_name = 'README.txt'
-        with open(os.path.join(self.exp_dir, self.readme_file_name), 'w') as f:
+        with self._trace('write README'), open(os.path.join(self.exp_dir, self.readme_file_name), 'w') as f:
             f.write(self.gen_readme(self.exp_params.get('extra_info')))
 
+    def get_artifact_cache(self) -> ArtifactCache:
+        """
+        @return the cache of generated design files as per the 'artifact_dir' Experiment parameter, or None if there is none.
+        """
+        artifact_dir = self.exp_params.get('artifact_dir')
+        return ArtifactCache(artifact_dir) if artifact_dir is not None else None
+
+    def _get_design_file_digest(self, file_name: str, generate: Callable[[], str]) -> str:
+        """
+        @return the SHA-256 of a file generated from the Design, e.g., the wrapper, from the artifact cache if any, so that it is generated once per design point.
+        """
+        cache = self.get_artifact_cache()
+        if cache is None:
+            return hashlib.sha256(generate().encode()).hexdigest()
+        return cache.get_or_generate(cache.get_key(self.design, self.design_params, file_name), generate)
+
+    def _write_design_file(self, file_name: str, generate: Callable[[], str]) -> None:
+        """
+        Write a file generated from the Design, e.g., the wrapper, to the experiment directory.
+        With an artifact cache (see get_artifact_cache()), it is generated once per design point and hardlinked; it must then never be modified in place.
+        """
+        path = os.path.join(self.exp_dir, file_name)
+        cache = self.get_artifact_cache()
+        if cache is None:
+            # never write through a hardlink into the cache of an earlier run
+            if os.path.lexists(path):
+                os.remove(path)
+            with open(path, 'w') as f:
+                f.write(generate())
+            return
+        cache.link(cache.get_or_generate(cache.get_key(self.design, self.design_params, file_name), generate), path)
+
+    def get_exp_name(self) -> str:
+        """
+        Get the human-readable name of this Experiment, from the names of the ArchFactory and Design (and the variant, if any).
+        """
+        exp_name = f"{self.arch.get_name(**self.arch_params)}--{self.design.get_name(**self.design_params)}"
+        if self.exp_params.get('variant') is not None:
+            exp_name += f"--{self.exp_params['variant']}"
+        return exp_name
+
+    def get_identity(self) -> str:
+        """
+        Get the canonical description (JSON) of the classes, verified parameters and variant of this Experiment, independently of its root directory.
+        Two Experiments are the same if and only if their identities are equal.
+        """
+        identity = {
+            'experiment': get_class_path(self.__class__),
+            'arch': get_class_path(self.arch.__class__),
+            'design': f"{get_class_path(self.design.__class__)}:{self.design.impl}",
+            'arch_params': self.arch_params,
+            'design_params': self.design_params,
+            'variant': self.exp_params.get('variant')
+        }
+        return json.dumps(identity, sort_keys=True, default=str)
+
+    def get_params_hash(self) -> str:
+        """
+        Get a short hash of the identity of this Experiment (see get_identity()), of EXP_HASH_LENGTH characters.
+        """
+        return hashlib.sha256(self.get_identity().encode()).hexdigest()[:EXP_HASH_LENGTH]
+
+    def get_exp_dir(self) -> str:
+        """
+        Get the directory of this Experiment, without creating it. As per the 'dir_naming' Experiment parameter, either:
+        * 'hash': <root_dir>/<first 2 characters of hash>/<hash>, with hash as per get_params_hash(); names are kept in the index file of root_dir (see read_exp_index()).
+        * 'name': <root_dir>/<name>, with name as per get_exp_name(); note that names may omit parameters.
+        """
+        exp_params = {**DEFAULTS_EXP, **self.exp_params}
+        if exp_params['dir_naming'] == 'hash':
+            params_hash = self.get_params_hash()
+            return os.path.join(exp_params['root_dir'], params_hash[:2], params_hash)
+        if exp_params['dir_naming'] == 'name':
+            return os.path.join(exp_params['root_dir'], self.get_exp_name())
+        raise ValueError(f"Unknown dir_naming '{exp_params['dir_naming']}'; expected 'hash' or 'name'.")
+
     def _prerun_check(self) -> None:
         """
         Call at the top of every run() implementation.
         """
+        if self.cancelled:
+            raise ExperimentCancelledError('Experiment was cancelled before it started.')
         if self.process is not None:
             raise RuntimeError('Experiment is already running or has finished.')
+
+    def _launch(self, cmd: list[str], **kwargs) -> None:
+        """
+        Start the tool process of this Experiment, unless it has been cancelled.
+        All keyword arguments are passed to util.start_dependent_process().
+        """
+        min_free_mib = self.exp_params.get('min_free_disk_mib')
+        if min_free_mib is not None:
+            with self._trace('wait for disk'):
+                for path in dict.fromkeys(path for path in [self.root_dir, self.run_dir] if path is not None):
+                    get_disk_watcher(path, min_free_mib).wait(lambda: self.cancelled)
+
+        with self.cancel_lock:
+            if self.cancelled:
+                raise ExperimentCancelledError('Experiment was cancelled before it started.')
+            self.process = start_dependent_process(cmd, **kwargs)
+        if self.tracer is not None:
+            self.tracer.instant('launch', self, 'process', pid=self.process.pid)
+
+    def get_retention_policy(self) -> RetentionPolicy:
+        """
+        @return the retention policy of this Experiment, from the 'retention' parameter, or DEFAULT_RETENTION.
+        """
+        rules = self.exp_params.get('retention')
+        return RetentionPolicy(rules if rules is not None else self.DEFAULT_RETENTION)
+
+    def get_disk_budget(self) -> 'DiskBudget':
+        """
+        @return the structure.retention.DiskBudget of root_dir as per the 'disk_budget_mib' parameter, or None if there is none.
+        """
+        budget_mib = self.exp_params.get('disk_budget_mib')
+        if budget_mib is None or self.root_dir is None:
+            return None
+        return get_disk_budget(self.root_dir, budget_mib)
+
+    def _retain(self, dir_path: str) -> None:
+        """
+        Apply the retention policy to the files of a finished run in dir_path (the experiment directory, or the run directory before copying back),
+        except for PARSED_FILES, if cleaning. Call once the tool has exited.
+        """
+        if self.clean:
+            self.get_retention_policy().apply(dir_path, protected=self.PARSED_FILES)
+
+    def _retain_parsed(self) -> None:
+        """
+        Save the parsed result in the experiment directory, apply the retention policy to PARSED_FILES if cleaning, and account the experiment
+        directory against the disk budget, if any. Call at the end of get_result().
+        """
+        write_result_file(self.exp_dir, self.result)
+        if self.clean:
+            self.get_retention_policy().apply(self.exp_dir, only=self.PARSED_FILES)
+        self._account_disk()
+
+    def _account_disk(self) -> None:
+        """
+        Count the experiment directory against the disk budget, if any, once its cleanup is done, and end the hold of _setup_exp() on it, so that
+        its files may be evicted. Call once the results are parsed (see _retain_parsed()), or once the run failed or was cancelled (see
+        structure.executor.run_experiment()); until then, nothing in it is evicted, least of all PARSED_FILES. Only the first call after
+        _setup_exp() counts.
+        """
+        disk_budget = self.get_disk_budget()
+        if disk_budget is None or self.exp_dir is None or self.disk_accounted:
+            return
+        self.disk_accounted = True
+        if self.gcthread is not None and self.gcthread is not threading.current_thread():
+            # retention may still be compressing or deleting files
+            self.gcthread.join()
+        disk_budget.add(self.exp_dir)
+
+    def cancel(self) -> None:
+        """
+        Cancel the Experiment: it will not start if it has not, otherwise its process and all of its descendants are terminated.
+        """
+        with self.cancel_lock:
+            self.cancelled = True
+            if self.process is not None and self.process.poll() is None:
+                kill_process_tree(self.process.pid)
     
     def _clean(self) -> None:
         if self.process is not None:
@@ -80,9 +333,19 @@ class Experiment(ParamsChecker):
             raise RuntimeError('Experiment is not running.')
         
     def _start_gc_thread(self, fn: Callable[..., None], args: tuple) -> None:
-        self.gcthread = threading.Thread(target=fn, args=args)
+        def clean(*args) -> None:
+            with self._trace('cleanup', background=True):
+                fn(*args)
+
+        self.gcthread = threading.Thread(target=clean, args=args)
         self.gcthread.start()
 
+    def _trace(self, name: str, background: bool = False, **args):
+        """
+        @return a context recording a span of this Experiment on its tracer (see structure.trace.Tracer.span()), or a no-op one without a tracer.
+        """
+        return trace_span(self.tracer, name, self, 'experiment', background, **args)
+
     def run(self, dry_run=False, **kwargs) -> None:
         """
         {abstract}
@@ -110,6 +373,7 @@ class Experiment(ParamsChecker):
         """
         Get a section of the README.
         """
+        from tabulate import tabulate
         table = []
         for k, v in params.items():
             label = translations.get(k, k)
@@ -151,6 +415,38 @@ class Experiment(ParamsChecker):
         """
         self.raise_unimplemented("get_result")
 
+    def get_stage(self) -> str:
+        """
+        Get the current stage of the tool while this Experiment is running, e.g., for progress displays; None if unknown.
+        Called from another thread than the one running the Experiment, so it must only read.
+        """
+        return None
+
+    def is_finished(self) -> bool:
+        """
+        Check whether this Experiment has already been run to the end in its directory (e.g., by an earlier sweep), without running it.
+        Experiments that cannot tell always return False.
+        """
+        return False
+
+    def get_inputs(self, **kwargs) -> dict[str, any]:
+        """
+        Get everything the tool sees when running this Experiment with the given Experiment.run() arguments, e.g., contents of generated files and tool options;
+        Experiments with identical inputs give identical results, so only one of them needs to run.
+
+        @return a JSON-compatible dictionary; or None if unknown, in which case the Experiment is never considered equivalent to another.
+        """
+        return None
+
+    def get_input_hash(self, **kwargs) -> str:
+        """
+        @return a SHA-256 hex digest of get_inputs() with the given Experiment.run() arguments, or None if the inputs are unknown.
+        """
+        inputs = self.get_inputs(**kwargs)
+        if inputs is None:
+            return None
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
     def get_full_params(self) -> dict[str, dict[str, any]]:
         """
         Returns all parameters in original format.
@@ -168,56 +464,275 @@ class Experiment(ParamsChecker):
             }
         }
 
+    def get_spec(self, **kwargs) -> dict[str, any]:
+        """
+        Serialize this Experiment into a JSON-compatible spec, so it can be rebuilt elsewhere with from_spec().
+        Relative paths among the Experiment parameters (see PATH_PARAMS) are made absolute, as the spec may be run from another working directory;
+        other file names and patterns (e.g., 'stdout_file', 'retention') are relative to the experiment directory.
+        All keyword arguments are stored as arguments for Experiment.run().
+        """
+        params = self.get_full_params()
+        for path_key in self.PATH_PARAMS:
+            if params[keys.KEY_EXP].get(path_key) is not None:
+                params[keys.KEY_EXP][path_key] = os.path.abspath(params[keys.KEY_EXP][path_key])
+
+        return {
+            'experiment': get_class_path(self.__class__),
+            'arch': get_class_path(self.arch.__class__),
+            'design': get_class_path(self.design.__class__),
+            'design_init': self.design.get_init_params(),
+            'params': params,
+            'run_kwargs': kwargs
+        }
+
+    @staticmethod
+    def from_spec(spec: dict[str, any]) -> 'Experiment':
+        """
+        Rebuild an Experiment from a spec generated by get_spec().
+        """
+        experiment_class = load_class(spec['experiment'])
+        arch = load_class(spec['arch'])()
+        design = load_class(spec['design'])(**spec['design_init'])
+        return experiment_class(arch, design, deepcopy(spec['params']))
+
 E = TypeVar('E', bound=Experiment)
 class ExperimentFactory():
     """
-    Takes in variable parameters, and generates experiments for each combination of parameters.
+    Takes in variable parameters, and generates experiments for each valid combination of parameters.
     """
     
-    def __init__(self, arch: ArchFactory, design: Design, experiment_class: Type[E]) -> None:
+    def __init__(self, arch: ArchFactory, design: Design, experiment_class: Type[E], constraints: list[Constraint] = None) -> None:
         """
         Provide the ArchFactory, Design and Experiment class to be used for all generated Experiments.
+
+        Optional arguments:
+        * constraints:list[Constraint], constraints in addition to those of the ArchFactory and Design; combinations that fail any are not generated. Default: None
         """
         self.arch = arch
         self.design = design
         self.experiment_class = experiment_class
+        self.constraints = [*arch.get_constraints(), *design.get_constraints(), *(constraints if constraints is not None else [])]
+        self.invalid = []  # (Experiment, violated constraint descriptions) of combinations dropped by the last gen_experiments()
 
-    def gen_experiments(self, params: dict[str, any]) -> list[E]:
+    def get_variable_params(self, params: dict[str, any]) -> list[tuple[list[list[str]], list]]:
         """
-        Searches through the parameters for variable parameters, specified as a list under the original key.
+        Searches through the parameters for variable parameters, specified as a list (or a structure.params.Zip or Range) under the original key.
+        Every list is an axis of its own; all Zip parameters of the same group form a single axis, whose values are tuples with one element per parameter.
+
+        @return a list of (key paths, list of values or Range), in order of (first) appearance.
         """
-        
-        # Step 1: find all variable parameters
-        variable_params = []
+        variable_params = []  # (key paths, list of values), or the name of a Zip group
+        zip_groups = {}  # group name to (key paths, lists of values)
         def traverse(cur: dict[str, any], keys_path: list[str]) -> None:
             for k, v in cur.items():
                 if isinstance(v, dict):
                     # is a dictionary, continue search (DFS)
                     traverse(v, [*keys_path, k])
-                elif isinstance(v, list):
+                elif isinstance(v, (list, Range)):
                     # save key path and list to variable_params
-                    variable_params.append(([*keys_path, k], v))
+                    variable_params.append(([[*keys_path, k]], v))
+                elif isinstance(v, Zip):
+                    if v.group not in zip_groups:
+                        zip_groups[v.group] = ([], [])
+                        variable_params.append(v.group)
+                    keys_paths, v_lists = zip_groups[v.group]
+                    if len(v_lists) > 0 and len(v.values) != len(v_lists[0]):
+                        raise ValueError(f"Zip parameter {'.'.join([*keys_path, k])} has {len(v.values)} values, but other parameters of group '{v.group}' have {len(v_lists[0])}.")
+                    keys_paths.append([*keys_path, k])
+                    v_lists.append(v.values)
     
         traverse(params, [])
-        
-        # Step 2: generate combinations
-        variable_params_count = len(variable_params)
+        for i, entry in enumerate(variable_params):
+            if isinstance(entry, str):
+                keys_paths, v_lists = zip_groups[entry]
+                variable_params[i] = (keys_paths, v_lists[0] if len(keys_paths) == 1 else list(zip(*v_lists)))
+        return variable_params
+
+    def get_derived_params(self, params: dict[str, any]) -> list[tuple[list[str], Derived]]:
+        """
+        Searches through the parameters for derived parameters (see structure.params.Derived).
+
+        @return a list of (key path, Derived), in order of appearance.
+        """
+        derived_params = []
+        def traverse(cur: dict[str, any], keys_path: list[str]) -> None:
+            for k, v in cur.items():
+                if isinstance(v, dict):
+                    traverse(v, [*keys_path, k])
+                elif isinstance(v, Derived):
+                    derived_params.append(([*keys_path, k], v))
+
+        traverse(params, [])
+        return derived_params
+
+    def gen_experiment(self, params: dict[str, any], variable_params: list[tuple[list[list[str]], list]], values: tuple) -> E:
+        """
+        Generates a single experiment, with each variable parameter (as per get_variable_params()) set to the corresponding value, and all derived parameters computed.
+        Does not check constraints; see get_violations().
+        """
+        def set_param(keys_path: list[str], v: any) -> None:
+            cur = new_params
+            for key in keys_path[:-1]:
+                cur = cur[key]
+            cur[keys_path[-1]] = v
+
+        new_params = deepcopy(params)
+        for (keys_paths, _), v in zip(variable_params, values):
+            if len(keys_paths) == 1:
+                set_param(keys_paths[0], v)
+            else:
+                for keys_path, v_part in zip(keys_paths, v):
+                    set_param(keys_path, v_part)
+
+        for keys_path, derived in self.get_derived_params(new_params):
+            set_param(keys_path, derived.fn(new_params))
+
+        return self.experiment_class(self.arch, self.design, new_params)
+
+    def get_violations(self, exp: E) -> list[str]:
+        """
+        @return the descriptions of all constraints that the (verified) parameters of an Experiment fail; empty if it is valid.
+        """
+        full_params = exp.get_full_params()
+        return [c.description for c in self.constraints if not c(full_params)]
+
+    def check_grid(self, variable_params: list[tuple[list[list[str]], list]]) -> None:
+        """
+        Check that variable_params (as per get_variable_params()) can be expanded into a grid, i.e., contain no Range.
+        """
+        for keys_paths, v_list in variable_params:
+            if isinstance(v_list, Range):
+                raise ValueError(f"Range parameter {'.'.join(keys_paths[0])} can only be sampled; provide a Sampler, or a list of values instead.")
+
+    def get_points(self, params: dict[str, any], variable_params: list[tuple[list[list[str]], list]], sampler: Sampler = None) -> list[tuple]:
+        """
+        @return the combinations of values of variable_params (as per get_variable_params()): every combination, with the first variable parameter varying the slowest;
+        or, if a Sampler is given, its budget of sampled combinations without duplicates.
+        """
+        axes = [v_list for _, v_list in variable_params]
+        if sampler is not None:
+            return list(dict.fromkeys(sampler.sample(axes)))
+
+        self.check_grid(variable_params)
+        return list(product(*axes))
+
+    def get_space(self, params: dict[str, any], sampler: Sampler = None) -> 'ExperimentSpace':
+        """
+        @return an ExperimentSpace over all combinations of variable parameters (or, if a Sampler is given, over the sampled combinations).
+        """
+        return ExperimentSpace(self, params, sampler)
+
+    def gen_experiments(self, params: dict[str, any], sampler: Sampler = None, shard: tuple[int, int] = None, space: 'ExperimentSpace' = None) -> list[E]:
+        """
+        Generates an experiment for every combination of variable parameters (or, if a Sampler is given, for every sampled combination) that satisfies all constraints.
+        The first variable parameter found varies the slowest. Dropped combinations are kept in self.invalid.
+
+        Optional arguments:
+        * shard:tuple[int, int], (i, N) to only generate the i-th of N disjoint slices (see ExperimentSpace.get_shard()). Default: None
+        * space:ExperimentSpace, space of params and sampler already built by get_space(), so that it is not built (and sampled) again. Default: None
+        """
+        if space is None:
+            space = self.get_space(params, sampler)
+        if sampler is not None and len(space) < sampler.n:
+            print(f"[ExperimentFactory] Sampled {len(space)} distinct combination(s) out of a budget of {sampler.n}.")
+        indices = range(len(space)) if shard is None else space.get_shard(*shard)
+
         experiments = []
-        def generate_experiment(i: int, d: dict[str, any]) -> None:
-            if i >= variable_params_count:
-                # reached the end of variable parameters; construct, append, return
-                experiments.append(self.experiment_class(self.arch, self.design, d))
-                return
-            
-            keys_path, v_list = variable_params[i]
-            for v in v_list:
-                new_params = deepcopy(d)
-                cur = new_params
-                for key in keys_path[:-1]:
-                    cur = cur[key]
-                cur[keys_path[-1]] = v
-
-                generate_experiment(i + 1, new_params)
-        
-        generate_experiment(0, params)
+        self.invalid = []
+        for index in indices:
+            exp = space[index]
+            violations = self.get_violations(exp)
+            if len(violations) > 0:
+                self.invalid.append((exp, violations))
+            else:
+                experiments.append(exp)
+
+        if len(self.invalid) > 0:
+            counts = Counter(d for _, violations in self.invalid for d in violations)
+            print(f"[ExperimentFactory] Dropped {len(self.invalid)} invalid combination(s): {', '.join(f'{c} x {d}' for d, c in counts.items())}.")
+        self.check_collisions(experiments)
         return experiments
+
+    def check_collisions(self, experiments: list[E]) -> None:
+        """
+        Check that no two experiments with different parameters would share a directory (e.g., when names omit a parameter, or hashes collide),
+        as they would overwrite each other's results.
+        """
+        seen = {}
+        for exp in experiments:
+            exp_dir = exp.get_exp_dir()
+            other = seen.get(exp_dir)
+            if other is None:
+                seen[exp_dir] = exp
+                continue
+            if other.get_identity() != exp.get_identity():
+                if exp.exp_params.get('dir_naming', DEFAULTS_EXP['dir_naming']) == 'hash':
+                    fix = "Increase EXP_HASH_LENGTH (in structure.exp), or use the 'name' dir_naming."
+                else:
+                    fix = "Use the 'hash' dir_naming, or a name that includes all varied parameters."
+                raise ValueError(f"Experiments with different parameters share the directory {exp_dir}:\n{other.get_full_params()}\n{exp.get_full_params()}\n{fix}")
+
+class ExperimentSpace(Sequence):
+    """
+    Indexable sequence of all Experiments generated by an ExperimentFactory from a set of parameters, in a stable order
+    (the same as ExperimentFactory.gen_experiments(), before invalid combinations are dropped).
+    Experiments are only generated when accessed, so the space is never materialized.
+    """
+
+    def __init__(self, factory: ExperimentFactory, params: dict[str, any], sampler: Sampler = None):
+        """
+        * factory:ExperimentFactory, generates each Experiment.
+        * params:dict, parameters with variable parameters.
+
+        Optional arguments:
+        * sampler:Sampler, index the sampled combinations instead of the full grid. Default: None
+        """
+        self.factory = factory
+        self.params = params
+        self.variable_params = factory.get_variable_params(params)
+        # sampled combinations are few, and kept; the grid is decoded from the index
+        self.points = factory.get_points(params, self.variable_params, sampler) if sampler is not None else None
+        self.radices = None
+        if self.points is None:
+            factory.check_grid(self.variable_params)
+            self.radices = [len(v_list) for _, v_list in self.variable_params]
+
+    def __len__(self) -> int:
+        if self.points is not None:
+            return len(self.points)
+        return math.prod(self.radices)
+
+    def get_values(self, index: int) -> tuple:
+        """
+        @return the value of each variable parameter of the index-th combination; on the grid, the index is decoded in mixed radix with the last variable parameter as the lowest digit.
+        """
+        length = len(self)
+        if index < 0:
+            index += length
+        if index < 0 or index >= length:
+            raise IndexError(f"Index {index} is out of range for a space of {length} combination(s).")
+        if self.points is not None:
+            return self.points[index]
+
+        values = []
+        for (_, v_list), radix in zip(reversed(self.variable_params), reversed(self.radices)):
+            index, digit = divmod(index, radix)
+            values.append(v_list[digit])
+        return tuple(reversed(values))
+
+    def __getitem__(self, index: int | slice) -> E | list[E]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        exp = self.factory.gen_experiment(self.params, self.variable_params, self.get_values(index))
+        exp.sweep_index = index if index >= 0 else index + len(self)
+        return exp
+
+    def get_shard(self, shard: int, num_shards: int) -> range:
+        """
+        @return the indices of the shard-th (0-based) of num_shards disjoint slices that together cover the space.
+        Indices are dealt round-robin, so neighbouring (similarly expensive) combinations are spread across shards.
+        """
+        if num_shards < 1 or shard < 0 or shard >= num_shards:
+            raise ValueError(f"Invalid shard {shard}/{num_shards}; expected 0 <= shard < number of shards.")
+        return range(shard, len(self), num_shards)
@@ -0,0 +1,214 @@
+"""
+Metrics of a running sweep, written for the textfile collector of the Prometheus node_exporter.
+"""
+
+from structure.exp import Experiment
+from util import get_process_tree_usage
+
+import os, time, resource, threading
+from collections import deque
+
+def get_dir_size(path: str) -> int:
+    """
+    @return the total size in bytes of all files under a directory (0 if it does not exist).
+    """
+    total = 0
+    for dir_path, _, file_names in os.walk(path):
+        for file_name in file_names:
+            try:
+                total += os.lstat(os.path.join(dir_path, file_name)).st_size
+            except OSError:
+                pass
+    return total
+
+def format_labels(labels: dict[str, str]) -> str:
+    """
+    Format labels for the Prometheus text format, e.g., '{sweep="run",state="running"}'.
+    """
+    if len(labels) == 0:
+        return ''
+    escaped = [(k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for k, v in labels.items()]
+    return '{' + ','.join(f'{k}="{v}"' for k, v in escaped) + '}'
+
+class MetricsExporter():
+    """
+    Periodically writes metrics of the experiments run by a structure.run.Runner to a Prometheus text file (e.g., <collector dir>/kratos.prom):
+    * kratos_experiments{state}: running and queued experiments.
+    * kratos_experiments_total{outcome}: succeeded and failed experiments, and those sharing the result of an equivalent one (shared).
+    * kratos_experiments_per_hour: experiments completed over the last hour (or since the start, if shorter).
+    * kratos_cpu_seconds_total: CPU time used by the processes of all experiments.
+    * kratos_experiment_peak_rss_bytes{exp}: highest memory seen of each running experiment (all its processes), by hash of its parameters.
+    * kratos_cache_hit_ratio: fraction of completed experiments whose result was shared instead of run.
+    * kratos_written_bytes: size of the directories of all experiments under root_dir.
+    * kratos_last_update_timestamp_seconds: time of the last write, to alert on stalled sweeps.
+    Counters accumulate across all batches of the Runner.
+
+    The Runner only records submissions and completions (queue appends); sampling processes and directories, and writing, happen on a background thread.
+    Every write replaces the file with an atomic rename, so the collector never reads a partial file.
+    """
+
+    def __init__(self, path: str, interval: float = 15.0, labels: dict[str, str] = None):
+        """
+        * path:str, file to write, ending with '.prom' to be picked up by the textfile collector.
+
+        Optional arguments:
+        * interval:float, seconds between writes. Default: 15.0
+        * labels:dict[str, str], labels added to every metric, e.g., {'sweep': 'gemmt_fu'}. Default: None
+        """
+        self.path = path
+        self.interval = interval
+        self.labels = labels if labels is not None else {}
+
+        self.events = deque()  # ('submit', Experiment, None) or ('finish', Experiment, (succeeded, shared)) appended by the Runner
+        self.active = []  # submitted, not finished
+        self.finished = set()
+        self.completion_times = deque()
+        self.counts = {'succeeded': 0, 'failed': 0, 'shared': 0}
+        self.peak_rss = {}
+        self.running_cpu = {}  # CPU seconds of the processes of running experiments, as last sampled
+        self.dir_sizes = {}  # exp_dir -> bytes
+        self.pending_dirs = set()  # finished experiment directories, measured on the next write
+        self.cpu_base = self._get_children_cpu()
+        self.cpu_seconds = 0.0
+        self.start_time = time.time()
+
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def _get_children_cpu(self) -> float:
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return usage.ru_utime + usage.ru_stime
+
+    def start(self, experiments: list[Experiment]) -> None:
+        """
+        Start tracking a batch of experiments, and start writing if not already.
+        """
+        for exp in experiments:
+            self.events.append(('submit', exp, None))
+        if self.thread is None:
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self._loop, daemon=True)
+            self.thread.start()
+
+    def finish(self, exp: Experiment, succeeded: bool, shared: int = 0) -> None:
+        """
+        Record that an Experiment is done, and that its result was shared with shared equivalent experiments; cheap enough to call from the Runner's loop.
+        """
+        self.events.append(('finish', exp, (succeeded, shared)))
+
+    def stop(self) -> None:
+        """
+        Stop writing, after writing the final state.
+        """
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def _loop(self) -> None:
+        while True:
+            stopping = self.stop_event.is_set()
+            self.write()
+            if stopping:
+                return
+            self.stop_event.wait(self.interval)
+
+    def _drain(self, now: float) -> None:
+        while len(self.events) > 0:
+            kind, exp, outcome = self.events.popleft()
+            if kind == 'submit':
+                self.active.append(exp)
+                continue
+            succeeded, shared = outcome
+            self.finished.add(exp)
+            self.counts['succeeded' if succeeded else 'failed'] += 1
+            self.counts['shared'] += shared
+            self.completion_times.append(now)
+            self.peak_rss.pop(exp, None)
+            self.running_cpu.pop(exp, None)
+            if exp.exp_dir is not None:
+                self.pending_dirs.add(exp.exp_dir)
+        self.active = [exp for exp in self.active if exp not in self.finished]
+        self.finished.clear()
+
+    def collect(self) -> list[tuple[str, str, str, list[tuple[dict[str, str], float]]]]:
+        """
+        Sample the current state.
+
+        @return a list of (name, type, help, [(labels, value)]) per metric.
+        """
+        now = time.time()
+        self._drain(now)
+
+        running = [exp for exp in self.active if exp.start_time is not None]
+        queued = len(self.active) - len(running)
+        for exp in running:
+            if exp.process is not None:
+                cpu_seconds, rss_bytes = get_process_tree_usage(exp.process.pid)
+                self.running_cpu[exp] = cpu_seconds
+                self.peak_rss[exp] = max(self.peak_rss.get(exp, 0), rss_bytes)
+
+        while len(self.completion_times) > 0 and self.completion_times[0] < now - 3600:
+            self.completion_times.popleft()
+        window = min(max(now - self.start_time, 1.0), 3600.0)
+
+        # finished processes are accounted for by the operating system once reaped; running ones are sampled.
+        # A process reaped before its experiment is drained counts twice for a moment, and counters must never decrease
+        cpu_seconds = self._get_children_cpu() - self.cpu_base + sum(self.running_cpu.get(exp, 0.0) for exp in running)
+        self.cpu_seconds = max(self.cpu_seconds, cpu_seconds)
+
+        for exp_dir in self.pending_dirs:
+            self.dir_sizes[exp_dir] = get_dir_size(exp_dir)
+        self.pending_dirs.clear()
+        written_bytes = sum(self.dir_sizes.values())
+        for exp in running:
+            if exp.exp_dir is None or exp.exp_dir in self.dir_sizes:
+                continue
+            written_bytes += get_dir_size(exp.exp_dir)
+            # staged runs write in their scratch directory until copied back
+            if exp.run_dir is not None and exp.run_dir != exp.exp_dir:
+                written_bytes += get_dir_size(exp.run_dir)
+
+        completed = self.counts['succeeded'] + self.counts['failed']
+        return [
+            ('kratos_experiments', 'gauge', 'Experiments by state.', [({'state': 'running'}, len(running)), ({'state': 'queued'}, queued)]),
+            ('kratos_experiments_total', 'counter', 'Completed experiments by outcome.', [({'outcome': k}, v) for k, v in self.counts.items()]),
+            ('kratos_experiments_per_hour', 'gauge', 'Experiments completed over the last hour.', [({}, len(self.completion_times) / window * 3600)]),
+            ('kratos_cpu_seconds_total', 'counter', 'CPU time used by the processes of all experiments.', [({}, self.cpu_seconds)]),
+            ('kratos_experiment_peak_rss_bytes', 'gauge', 'Highest memory seen of each running experiment.',
+             [({'exp': exp.get_params_hash()}, self.peak_rss[exp]) for exp in running if exp in self.peak_rss]),
+            ('kratos_cache_hit_ratio', 'gauge', 'Fraction of completed experiments whose result was shared instead of run.',
+             [({}, self.counts['shared'] / max(completed + self.counts['shared'], 1))]),
+            ('kratos_written_bytes', 'gauge', 'Size of the directories of all experiments.', [({}, written_bytes)]),
+            ('kratos_last_update_timestamp_seconds', 'gauge', 'Time of the last update.', [({}, now)])
+        ]
+
+    def render(self, metrics: list[tuple[str, str, str, list[tuple[dict[str, str], float]]]]) -> str:
+        """
+        Render metrics as per collect() in the Prometheus text format.
+        """
+        lines = []
+        for name, metric_type, help_text, samples in metrics:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in samples:
+                lines.append(f"{name}{format_labels({**self.labels, **labels})} {float(value)!r}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self) -> None:
+        """
+        Write the current state once.
+        """
+        try:
+            text = self.render(self.collect())
+            metrics_dir = os.path.dirname(self.path)
+            if metrics_dir != '':
+                os.makedirs(metrics_dir, exist_ok=True)
+            # the collector only reads *.prom files, so the temporary file is never read
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w') as f:
+                f.write(text)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            # broken metrics must never stop the sweep
+            print(f"[MetricsExporter] Unable to write {self.path}: {repr(e)}")
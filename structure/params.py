@@ -0,0 +1,104 @@
+"""
+Markers and predicates for variable parameters, used by structure.exp.ExperimentFactory in addition to plain lists.
+"""
+
+import math
+from typing import Callable
+
+class Zip():
+    """
+    Linked variable parameter: all Zip parameters of the same group vary together (like Python's zip()), instead of forming a cartesian product.
+    e.g., {'lut_size': Zip([4, 6], 'lut'), 'CLB_pins_per_group': Zip([8, 13], 'lut')} gives 2 combinations, not 4.
+    """
+
+    def __init__(self, values: list, group: str = 'zip'):
+        """
+        * values:list, values of this parameter; all Zip parameters of a group must have the same number of values.
+
+        Optional arguments:
+        * group:str, name of the group of linked parameters. Default: 'zip'
+        """
+        self.values = values
+        self.group = group
+
+    def __repr__(self) -> str:
+        return f"Zip({self.values!r}, {self.group!r})"
+
+class Derived():
+    """
+    Computed parameter: evaluated for every combination, after all variable parameters have been set.
+    e.g., {'CLB_pins_per_group': Derived(lambda p: CLB_PIN_DICT[p[keys.KEY_ARCH]['lut_size']])}
+    """
+
+    def __init__(self, fn: Callable[[dict[str, any]], any]):
+        """
+        * fn:Callable, takes the full (nested) parameters of the combination, as given (i.e., without defaults), and returns the value.
+          Derived parameters are evaluated in order of appearance, so a Derived parameter may depend on an earlier one.
+        """
+        self.fn = fn
+
+    def __repr__(self) -> str:
+        return f"Derived({getattr(self.fn, '__name__', self.fn)})"
+
+class Constraint():
+    """
+    Named predicate on the parameters of an Experiment; combinations that fail any constraint are never built or run.
+    """
+
+    def __init__(self, description: str, predicate: Callable[..., bool], group: str = None):
+        """
+        * description:str, human-readable rule, e.g., 'fil_w <= img_w'.
+        * predicate:Callable, returns True if the parameters are valid.
+
+        Optional arguments:
+        * group:str, parameter group (a key of structure.consts.keys); if set, the predicate takes that group's parameters as keyword arguments,
+          otherwise it takes the full (nested) parameters. Defaults are filled either way. Default: None
+        """
+        self.description = description
+        self.predicate = predicate
+        self.group = group
+
+    def __call__(self, params: dict[str, dict[str, any]]) -> bool:
+        if self.group is not None:
+            return bool(self.predicate(**params[self.group]))
+        return bool(self.predicate(params))
+
+    def __repr__(self) -> str:
+        return f"Constraint({self.description!r})"
+
+class Range():
+    """
+    Continuous variable parameter, which can only be sampled (see structure.sampling.Sampler), not expanded into a grid.
+    """
+
+    def __init__(self, low: float, high: float, log: bool = False, integer: bool = False):
+        """
+        * low:float, lowest value (inclusive).
+        * high:float, highest value (inclusive for integers, otherwise exclusive).
+
+        Optional arguments:
+        * log:bool, sample uniformly on a logarithmic scale (low must be positive). Default: False
+        * integer:bool, round down to integers. Default: False
+        """
+        if high < low:
+            raise ValueError(f"Range is empty: high {high} is lower than low {low}.")
+        if log and low <= 0:
+            raise ValueError(f"Logarithmic range requires a positive low value, got {low}.")
+        self.low = low
+        self.high = high
+        self.log = log
+        self.integer = integer
+
+    def scale(self, u: float) -> float | int:
+        """
+        Map u in [0, 1) onto this range.
+        """
+        high = self.high + 1 if self.integer else self.high
+        if self.log:
+            v = math.exp(math.log(self.low) + u * (math.log(high) - math.log(self.low)))
+        else:
+            v = self.low + u * (high - self.low)
+        return min(math.floor(v), self.high) if self.integer else v
+
+    def __repr__(self) -> str:
+        return f"Range({self.low!r}, {self.high!r}, log={self.log!r}, integer={self.integer!r})"
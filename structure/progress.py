@@ -0,0 +1,268 @@
+"""
+Live progress of a running sweep: what is queued, running and done, how far each running experiment got, how busy the host is, and when the sweep will end.
+"""
+
+from structure.exp import Experiment
+from structure.schedule import simulate_makespan
+from impl.cost.online import OnlineCostModel
+
+import os, sys, time, html, threading
+from collections import deque
+from typing import TextIO
+
+def format_duration(seconds: float) -> str:
+    """
+    Format a duration as H:MM:SS, or '?' if unknown.
+    """
+    if seconds is None:
+        return '?'
+    seconds = int(max(seconds, 0))
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+class SystemUsage():
+    """
+    CPU and memory usage of the whole host, read from /proc (Linux); all values are None elsewhere.
+    CPU usage is measured between consecutive calls to poll().
+    """
+
+    def __init__(self):
+        self.cpu_percent = None
+        self.mem_used_mib = None
+        self.mem_total_mib = None
+        self.last_cpu_times = None
+
+    def poll(self) -> 'SystemUsage':
+        try:
+            with open('/proc/stat', 'r') as f:
+                times = [int(v) for v in f.readline().split()[1:]]
+            # idle and iowait
+            idle, total = times[3] + times[4], sum(times)
+            if self.last_cpu_times is not None and total > self.last_cpu_times[1]:
+                self.cpu_percent = 100.0 * (1 - (idle - self.last_cpu_times[0]) / (total - self.last_cpu_times[1]))
+            self.last_cpu_times = (idle, total)
+
+            meminfo = {}
+            with open('/proc/meminfo', 'r') as f:
+                for line in f:
+                    key, value = line.split(':', 1)
+                    meminfo[key] = int(value.split()[0])
+            self.mem_total_mib = meminfo['MemTotal'] / 1024
+            self.mem_used_mib = (meminfo['MemTotal'] - meminfo.get('MemAvailable', meminfo['MemFree'])) / 1024
+        except (OSError, ValueError, KeyError, IndexError):
+            pass
+        return self
+
+class ProgressDashboard():
+    """
+    Live view of a batch of experiments run by a structure.run.Runner: running, queued and done counts, elapsed time and current stage
+    (see Experiment.get_stage()) of every running experiment, host CPU and memory, and the ETA of the batch.
+    Predicted run times come from an OnlineCostModel, which learns from every experiment that finishes.
+
+    The Runner only records completions (a queue append); polling, learning and rendering happen on a background thread every interval seconds.
+    On a terminal, the dashboard is redrawn in place of the screen (and per-result blocks are not printed); otherwise, a snapshot is appended every interval.
+    """
+
+    def __init__(self,
+            runtime_model: OnlineCostModel = None,
+            interval: float = 2.0,
+            stream: TextIO = None,
+            html_file: str = None,
+            max_rows: int = 20,
+            desc: str = 'run'
+        ):
+        """
+        Optional arguments:
+        * runtime_model:OnlineCostModel, predicts run times; pass one with a ResultStore to start from past results. Default: OnlineCostModel()
+        * interval:float, seconds between refreshes. Default: 2.0
+        * stream:TextIO, where to draw the dashboard; pass None for sys.stdout. Default: None
+        * html_file:str, also write each refresh as a static (self-reloading) HTML page to this path. Default: None
+        * max_rows:int, maximum number of running experiments listed. Default: 20
+        * desc:str, description of the run. Default: 'run'
+        """
+        self.runtime_model = runtime_model if runtime_model is not None else OnlineCostModel()
+        self.interval = interval
+        self.stream = stream if stream is not None else sys.stdout
+        self.html_file = html_file
+        self.max_rows = max_rows
+        self.desc = desc
+
+        self.experiments = []
+        self.num_slots = 1
+        self.completions = deque()  # (Experiment, succeeded) appended by the Runner
+        self.done = set()
+        self.failed = []
+        self.start_time = None
+        self.system = SystemUsage()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def is_live(self) -> bool:
+        """
+        @return True if the dashboard is redrawn in place, i.e., drawn on a terminal.
+        """
+        return hasattr(self.stream, 'isatty') and self.stream.isatty()
+
+    def start(self, experiments: list[Experiment], num_slots: int) -> None:
+        """
+        Start showing a batch of experiments, in submission order, run on num_slots slots.
+        """
+        self.experiments = list(experiments)
+        self.num_slots = max(num_slots, 1)
+        self.completions.clear()
+        self.done = set()
+        self.failed = []
+        self.start_time = time.time()
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def finish(self, exp: Experiment, succeeded: bool) -> None:
+        """
+        Record that an Experiment of the batch is done; cheap enough to call from the Runner's loop.
+        """
+        self.completions.append((exp, succeeded))
+
+    def stop(self) -> None:
+        """
+        Stop refreshing, after drawing the final state.
+        """
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def _loop(self) -> None:
+        while True:
+            stopping = self.stop_event.is_set()
+            self.refresh()
+            if stopping:
+                return
+            self.stop_event.wait(self.interval)
+
+    def _drain(self) -> None:
+        """
+        Learn from all completions recorded since the last refresh.
+        """
+        while len(self.completions) > 0:
+            exp, succeeded = self.completions.popleft()
+            self.done.add(exp)
+            if succeeded:
+                self.runtime_model.observe(exp)
+            else:
+                self.failed.append(exp)
+
+    def snapshot(self) -> dict[str, any]:
+        """
+        @return the current state of the batch:
+        * done, failed, running, queued:int, counts.
+        * rows:list[dict], per running experiment (longest running first): name, exp_dir, elapsed, predicted (s) and stage.
+        * eta:float, predicted seconds until the batch ends, or None if run times are not calibrated yet.
+        * elapsed:float, seconds since the batch started.
+        * cpu_percent, mem_used_mib, mem_total_mib:float, host usage (None if unknown).
+        """
+        self._drain()
+        now = time.time()
+        running = [exp for exp in self.experiments if exp not in self.done and exp.start_time is not None]
+        queued = [exp for exp in self.experiments if exp not in self.done and exp.start_time is None]
+
+        predicted = self.runtime_model.predict(running + queued)
+        calibrated = self.runtime_model.calibrated
+        elapsed = [now - exp.start_time for exp in running]
+        # running experiments hold their slots, then the queue is taken in submission order
+        remaining = [max(float(p) - e, 0.0) for p, e in zip(predicted, elapsed)] + [float(p) for p in predicted[len(running):]]
+        eta = simulate_makespan(remaining, self.num_slots) if calibrated else None
+
+        rows = []
+        for i in sorted(range(len(running)), key=lambda i: -elapsed[i]):
+            exp = running[i]
+            try:
+                stage = exp.get_stage()
+            except Exception:
+                stage = None
+            rows.append({
+                'name': exp.get_exp_name(),
+                'exp_dir': exp.exp_dir,
+                'elapsed': elapsed[i],
+                'predicted': float(predicted[i]) if calibrated else None,
+                'stage': stage
+            })
+
+        self.system.poll()
+        return {
+            'done': len(self.done),
+            'failed': len(self.failed),
+            'running': len(running),
+            'queued': len(queued),
+            'rows': rows,
+            'eta': eta,
+            'elapsed': now - self.start_time,
+            'cpu_percent': self.system.cpu_percent,
+            'mem_used_mib': self.system.mem_used_mib,
+            'mem_total_mib': self.system.mem_total_mib
+        }
+
+    def render_text(self, state: dict[str, any]) -> str:
+        """
+        Render a snapshot() as plain text.
+        """
+        total = len(self.experiments)
+        cpu = '?' if state['cpu_percent'] is None else f"{state['cpu_percent']:.0f}%"
+        mem = '?' if state['mem_used_mib'] is None else f"{state['mem_used_mib'] / 1024:.1f}/{state['mem_total_mib'] / 1024:.1f} GiB"
+        eta = format_duration(state['eta'])
+        if state['eta'] is not None:
+            eta += f" (at {time.strftime('%H:%M:%S', time.localtime(time.time() + state['eta']))})"
+
+        lines = [
+            f"[Dashboard] '{self.desc}' at {time.strftime('%H:%M:%S')}, elapsed {format_duration(state['elapsed'])}",
+            f"Done {state['done']}/{total} ({state['failed']} failed) | Running {state['running']} | Queued {state['queued']} | ETA {eta}",
+            f"CPU {cpu} | Memory {mem}",
+            f"{'ELAPSED':>9} {'PREDICTED':>9}  {'STAGE':<16} EXPERIMENT"
+        ]
+        for row in state['rows'][:self.max_rows]:
+            lines.append(f"{format_duration(row['elapsed']):>9} {format_duration(row['predicted']):>9}  {str(row['stage'] or '-'):<16.16} {row['exp_dir']}  {row['name']}")
+        if len(state['rows']) > self.max_rows:
+            lines.append(f"... and {len(state['rows']) - self.max_rows} more running")
+        for exp in self.failed[-5:]:
+            lines.append(f"Failed: {exp.exp_dir}  {exp.get_exp_name()}")
+        return '\n'.join(lines) + '\n'
+
+    def render_html(self, state: dict[str, any]) -> str:
+        """
+        Render a snapshot() as a static HTML page, which reloads itself every interval.
+        """
+        text = self.render_text(state)
+        return f'''<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<meta http-equiv="refresh" content="{max(int(self.interval), 1)}">
+<title>{html.escape(self.desc)}: {state['done']}/{len(self.experiments)} done</title>
+</head>
+<body>
+<pre>{html.escape(text)}</pre>
+</body>
+</html>
+'''
+
+    def refresh(self) -> None:
+        """
+        Draw the current state once.
+        """
+        try:
+            state = self.snapshot()
+            text = self.render_text(state)
+            if self.is_live():
+                # home the cursor and clear the screen, like top
+                self.stream.write('\x1b[H\x1b[2J' + text)
+            else:
+                self.stream.write(text)
+            self.stream.flush()
+
+            if self.html_file is not None:
+                temp_file = f"{self.html_file}.tmp"
+                with open(temp_file, 'w') as f:
+                    f.write(self.render_html(state))
+                os.replace(temp_file, self.html_file)
+        except Exception as e:
+            # a broken dashboard must never stop the sweep
+            print(f"[Dashboard] Unable to refresh: {repr(e)}", file=sys.stderr)
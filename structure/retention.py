@@ -0,0 +1,314 @@
+"""
+Retention of the files experiments leave behind: per-class policies applied once an experiment is done (keep, compress or delete), a disk budget per
+root_dir enforced by evicting the least recently used files, and a watcher that pauses launches while free disk space is low.
+Parsed results and sidecars (see SIDECAR_FILES) are never compressed, deleted or evicted; archives of compressed files are kept by retention,
+but count against the disk budget like any other file.
+"""
+
+import os, time, json, heapq, shutil, zipfile, threading
+from fnmatch import fnmatch
+from typing import Callable
+
+ACTIONS = ['keep', 'compress', 'delete']
+ARCHIVE_NAME = 'largefile.zip'  # compressed files of a directory
+RESULT_FILE = 'result.json'  # parsed result of an experiment
+SIDECAR_FILES = ['README.txt', 'std.out', 'std.err', 'runner.err', RESULT_FILE, 'index.jsonl']
+MIB = 1 << 20
+
+def write_result_file(exp_dir: str, result: dict[str, any]) -> None:
+    """
+    Save the parsed result of an experiment next to its files, so that it survives their deletion or eviction.
+    """
+    temp_path = os.path.join(exp_dir, f"{RESULT_FILE}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(temp_path, 'w') as f:
+        json.dump(result, f, default=str)
+    os.replace(temp_path, os.path.join(exp_dir, RESULT_FILE))
+
+def read_result_file(exp_dir: str) -> dict[str, any]:
+    """
+    @return the result saved by write_result_file(), or None if there is none.
+    """
+    try:
+        with open(os.path.join(exp_dir, RESULT_FILE), 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+def is_protected(rel_path: str, protected: list[str] = None) -> bool:
+    """
+    @return whether a retention policy must keep a file (relative to its experiment directory) as is: a sidecar, archive, partial write, or otherwise protected.
+    """
+    name = os.path.basename(rel_path)
+    return is_pinned(rel_path) or name == ARCHIVE_NAME or (protected is not None and rel_path in protected)
+
+def is_pinned(rel_path: str) -> bool:
+    """
+    @return whether a disk budget must neither count nor evict a file: a sidecar (see SIDECAR_FILES), or a partial write about to be renamed into place.
+    """
+    name = os.path.basename(rel_path)
+    return name in SIDECAR_FILES or name.endswith('.tmp')
+
+class RetentionPolicy():
+    """
+    What to do with the files of a finished experiment, by class of file: each rule maps a glob pattern, relative to the experiment directory
+    (e.g., 'temp/*.route'; a pattern without '/' matches file names in any directory), to an action:
+    * 'keep': leave as is.
+    * 'compress': move into the ARCHIVE_NAME zip file of its directory.
+    * 'delete': remove.
+    The first matching rule applies; files matching none are kept. Directories left empty by deletions (e.g., 'db/*') are removed.
+    """
+
+    def __init__(self, rules: dict[str, str]):
+        """
+        * rules:dict[str, str], glob pattern to action, in order of precedence.
+        """
+        for pattern, action in rules.items():
+            if action not in ACTIONS:
+                raise ValueError(f"Unknown retention action '{action}' for '{pattern}'; expected one of {ACTIONS}.")
+        self.rules = dict(rules)
+
+    def get_action(self, rel_path: str) -> str:
+        """
+        @return the action for a file, by its path relative to the experiment directory.
+        """
+        for pattern, action in self.rules.items():
+            if fnmatch(rel_path, pattern) or ('/' not in pattern and fnmatch(os.path.basename(rel_path), pattern)):
+                return action
+        return 'keep'
+
+    def apply(self, exp_dir: str, only: list[str] = None, protected: list[str] = None) -> None:
+        """
+        Apply the policy to the files of an experiment directory.
+
+        Optional arguments:
+        * only:list[str], only apply it to these files (relative to exp_dir), e.g., once they are parsed. Default: None
+        * protected:list[str], files (relative to exp_dir) to leave as is, e.g., until they are parsed. Default: None
+        """
+        to_compress = {}  # directory -> file names
+        deleted_dirs = set()
+        for rel_path in (only if only is not None else self._list_files(exp_dir)):
+            path = os.path.join(exp_dir, rel_path)
+            if is_protected(rel_path, protected) or not os.path.isfile(path):
+                continue
+            action = self.get_action(rel_path)
+            if action == 'delete':
+                os.remove(path)
+                deleted_dirs.add(os.path.dirname(path))
+            elif action == 'compress':
+                to_compress.setdefault(os.path.dirname(path), []).append(os.path.basename(path))
+
+        for dir_path, names in to_compress.items():
+            try:
+                self._compress(dir_path, names)
+            except Exception as e:
+                print(f"Unable to perform zipping for: {dir_path} ({repr(e)})")
+                continue
+            for name in names:
+                os.remove(os.path.join(dir_path, name))
+
+        self._remove_empty_dirs(exp_dir, deleted_dirs)
+
+    def _compress(self, dir_path: str, names: list[str]) -> None:
+        """
+        Write files of a directory into its archive, replacing the entries of the same names (e.g., from an earlier run of the experiment).
+        The archive is rewritten into a temporary file and renamed into place, so that it is left as it was if this fails.
+        """
+        archive_path = os.path.join(dir_path, ARCHIVE_NAME)
+        temp_path = f"{archive_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+                if os.path.exists(archive_path):
+                    try:
+                        with zipfile.ZipFile(archive_path, 'r') as old_archive:
+                            for info in old_archive.infolist():
+                                if info.filename not in names:
+                                    archive.writestr(info, old_archive.read(info))
+                    except zipfile.BadZipFile as e:
+                        print(f"Replacing unreadable archive: {archive_path} ({repr(e)})")
+                for name in names:
+                    archive.write(os.path.join(dir_path, name), name)
+            os.replace(temp_path, archive_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _remove_empty_dirs(self, exp_dir: str, dir_paths: set[str]) -> None:
+        """
+        Remove directories under exp_dir (not exp_dir itself) that are empty, and their parents that become empty, deepest first.
+        """
+        root = os.path.normpath(exp_dir)
+        for dir_path in sorted(dir_paths, key=len, reverse=True):
+            dir_path = os.path.normpath(dir_path)
+            while dir_path != root and dir_path.startswith(os.path.join(root, '')):
+                try:
+                    os.rmdir(dir_path)
+                except OSError:
+                    # not empty, or already removed
+                    break
+                dir_path = os.path.dirname(dir_path)
+
+    def _list_files(self, exp_dir: str) -> list[str]:
+        rel_paths = []
+        for dir_path, _, file_names in os.walk(exp_dir):
+            for file_name in file_names:
+                rel_paths.append(os.path.relpath(os.path.join(dir_path, file_name), exp_dir))
+        return rel_paths
+
+class DiskBudget():
+    """
+    Disk budget of a root_dir: once the files under it take more, the least recently used (last read or written) files are evicted, larger ones first
+    among equally old ones, until it fits again. Sidecars (see is_pinned()) and files of experiments that are running or not parsed yet (see hold()) are
+    never evicted; archives of compressed files are.
+    Files are scanned once when the budget is created, then per experiment directory as experiments finish (see add()). Hardlinked files (e.g., from
+    a structure.artifacts.ArtifactCache) count for their size divided by their number of links.
+    """
+
+    def __init__(self, root_dir: str, budget_mib: float):
+        """
+        * root_dir:str, directory under which all files count.
+        * budget_mib:float, total size allowed in MiB.
+        """
+        self.root_dir = root_dir
+        self.budget_mib = budget_mib
+        self.files = {}  # path -> (last used, bytes)
+        self.dir_files = {}  # directory -> paths of its files in self.files
+        self.heap = []  # (last used, -bytes, path), with stale entries skipped
+        self.total_bytes = 0.0
+        self.evicted_bytes = 0.0
+        self.held = set()  # directories of running experiments, as prefixes
+        self.lock = threading.Lock()
+        self.add(root_dir)
+
+    def _set(self, path: str, entry: tuple[float, float]) -> None:
+        old = self.files.pop(path, None)
+        if old is not None:
+            self.total_bytes -= old[1]
+            self.dir_files[os.path.dirname(path)].discard(path)
+        if entry is not None:
+            self.files[path] = entry
+            self.dir_files.setdefault(os.path.dirname(path), set()).add(path)
+            self.total_bytes += entry[1]
+            heapq.heappush(self.heap, (entry[0], -entry[1], path))
+
+    def hold(self, dir_path: str) -> None:
+        """
+        Never evict files under a directory, e.g., of an experiment until its results are parsed, until it is added with add().
+        """
+        with self.lock:
+            self.held.add(os.path.join(dir_path, ''))
+
+    def add(self, dir_path: str) -> None:
+        """
+        (Re)scan the files under a directory of root_dir, e.g., of an experiment once it is done, and evict files if over budget.
+        """
+        with self.lock:
+            prefix = os.path.join(dir_path, '')
+            self.held.discard(prefix)
+            for walk_dir, _, file_names in os.walk(dir_path):
+                paths = [os.path.join(walk_dir, file_name) for file_name in file_names]
+                # files gone since the last scan, e.g., compressed
+                for path in self.dir_files.get(walk_dir, set()) - set(paths):
+                    self._set(path, None)
+                for path in paths:
+                    if is_pinned(path):
+                        continue
+                    try:
+                        st = os.lstat(path)
+                    except OSError:
+                        continue
+                    self._set(path, (max(st.st_atime, st.st_mtime), st.st_size / max(st.st_nlink, 1)))
+            self._enforce()
+
+    def _enforce(self) -> None:
+        budget_bytes = self.budget_mib * MIB
+        skipped = []
+        while self.total_bytes > budget_bytes and len(self.heap) > 0:
+            last_used, neg_size, path = heapq.heappop(self.heap)
+            if self.files.get(path) != (last_used, -neg_size):
+                continue
+            if any(path.startswith(prefix) for prefix in self.held):
+                skipped.append((last_used, neg_size, path))
+                continue
+            self._set(path, None)
+            try:
+                os.remove(path)
+                self.evicted_bytes -= neg_size
+            except OSError:
+                pass
+        for entry in skipped:
+            heapq.heappush(self.heap, entry)
+
+    def get_used_mib(self) -> float:
+        """
+        @return the size of the files under root_dir that count towards the budget, in MiB.
+        """
+        with self.lock:
+            return self.total_bytes / MIB
+
+class DiskWatcher():
+    """
+    Pauses launches while the free space of the file system of a directory is below a threshold, e.g., until evictions or other jobs free some up.
+    """
+
+    def __init__(self, path: str, min_free_mib: float, interval: float = 5.0):
+        """
+        * path:str, any directory on the file system to watch.
+        * min_free_mib:float, free space below which launches pause.
+
+        Optional arguments:
+        * interval:float, seconds between checks while paused. Default: 5.0
+        """
+        self.path = path
+        self.min_free_mib = min_free_mib
+        self.interval = interval
+        self.paused = False
+
+    def get_free_mib(self) -> float:
+        return shutil.disk_usage(self.path).free / MIB
+
+    def wait(self, is_cancelled: Callable[[], bool] = None) -> None:
+        """
+        Block while free space is below the threshold.
+
+        Optional arguments:
+        * is_cancelled:Callable[[], bool], stop waiting once it returns True. Default: None
+        """
+        while self.get_free_mib() < self.min_free_mib:
+            if not self.paused:
+                self.paused = True
+                print(f"[DiskWatcher] Less than {self.min_free_mib} MiB free under {self.path}; pausing launches.")
+            if is_cancelled is not None and is_cancelled():
+                return
+            time.sleep(self.interval)
+        if self.paused:
+            self.paused = False
+            print(f"[DiskWatcher] Free space under {self.path} is back above {self.min_free_mib} MiB; resuming launches.")
+
+disk_budgets = {}  # real path of a root_dir -> DiskBudget
+disk_watchers = {}  # real path of a directory -> DiskWatcher
+registry_lock = threading.Lock()
+
+def get_disk_budget(root_dir: str, budget_mib: float) -> DiskBudget:
+    """
+    @return the DiskBudget shared by all experiments of this process under root_dir, with its budget set to budget_mib.
+    """
+    key = os.path.realpath(root_dir)
+    with registry_lock:
+        budget = disk_budgets.get(key)
+        if budget is None:
+            budget = disk_budgets[key] = DiskBudget(root_dir, budget_mib)
+        budget.budget_mib = budget_mib
+        return budget
+
+def get_disk_watcher(path: str, min_free_mib: float) -> DiskWatcher:
+    """
+    @return the DiskWatcher shared by all experiments of this process on path, with its threshold set to min_free_mib.
+    """
+    key = os.path.realpath(path)
+    with registry_lock:
+        watcher = disk_watchers.get(key)
+        if watcher is None:
+            watcher = disk_watchers[key] = DiskWatcher(path, min_free_mib)
+        watcher.min_free_mib = min_free_mib
+        return watcher
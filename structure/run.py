@@ -1,37 +1,433 @@
-from structure.exp import Experiment, ExperimentFactory
+from structure.exp import Experiment, ExperimentFactory, ExperimentCancelledError
 from structure.arch import ArchFactory
 from structure.design import Design
+from structure.params import Constraint, Range
+from structure.sampling import Sampler
+from structure.executor import Executor
+from structure.adaptive import AdaptiveSampler
+from structure.store import ResultStore
+from structure.surrogate import SurrogatePlanner
+from structure.schedule import Scheduler, CostModel, simulate_peak
+from structure.progress import ProgressDashboard
+from structure.trace import Tracer, trace_span
+from structure.metrics import MetricsExporter
+from structure.stats import summarize, is_converged
+from impl.executor.local import LocalExecutor
+from impl.cost.size import ParamSizeCostModel
 from util import pretty
+from util_parse import VprLogFollower
 
-import os
+import os, argparse
 from timeit import default_timer as timer
-from typing import Type, TypeVar
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import pandas as pd
+from typing import Type, TypeVar, Callable, TYPE_CHECKING
+from copy import deepcopy
+from concurrent.futures import Future, as_completed, wait, FIRST_COMPLETED
+# pandas is only needed for the results, and slow to import (e.g., for every worker), so it is imported when first used
+if TYPE_CHECKING:
+    import pandas as pd
+import structure.consts.keys as keys
+
+def add_to_results(res_dict: dict[str, any], search_dict: dict[str, any], keys: list[str]) -> None:
+    """
+    Recursively search a nested dictionary and add required leaf keys to a result dictionary.
+    """
+    for k, v in search_dict.items():
+        if isinstance(v, dict):
+            add_to_results(res_dict, v, keys)
+        elif keys is None or k in keys:
+            res_dict[k] = v
+
+def parse_shard(shard: str) -> tuple[int, int]:
+    """
+    Parse a shard of the form 'i/N' into (i, N); None is passed through.
+    """
+    if shard is None:
+        return None
+    try:
+        i, n = (int(x) for x in shard.split('/'))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{shard}'; expected 'i/N', e.g., '0/4'.")
+    if n < 1 or i < 0 or i >= n:
+        raise ValueError(f"Invalid shard '{shard}'; expected 0 <= i < N.")
+    return i, n
+
+def get_shard_arg(argv: list[str] = None) -> str:
+    """
+    Get the value of the '--shard' command-line option (ignoring all other options), or None if not given, e.g., to pass as the shard of a Runner.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--shard', default=None)
+    args, _ = parser.parse_known_args(argv)
+    return args.shard
+
+def merge_results(paths: list[str]) -> 'pd.DataFrame':
+    """
+    Merge the results of the shards of a sweep, each saved with DataFrame.to_csv(), into a single DataFrame in sweep order.
+    If a combination appears in several files (e.g., a re-run shard), the last file wins.
+    """
+    import pandas as pd
+    merged = pd.concat([pd.read_csv(path, index_col=0) for path in paths], ignore_index=True)
+    if 'sweep_index' in merged.columns:
+        merged = merged.drop_duplicates('sweep_index', keep='last').sort_values('sweep_index')
+    return merged.reset_index(drop=True)
 
 E = TypeVar('E', bound=Experiment)
 class Runner():
     """
     Runs a list of Experiments as generated by an ExperimentFactory.
     """
-    def __init__(self, arch: ArchFactory, design: Design, experiment_class: Type[E], params: dict[str, any]):
+    def __init__(self,
+            arch: ArchFactory,
+            design: Design,
+            experiment_class: Type[E],
+            params: dict[str, any],
+            result_store: ResultStore = None,
+            constraints: list[Constraint] = None,
+            sampler: Sampler = None,
+            shard: str = None,
+            dedup: str = 'inputs',
+            tracer: Tracer = None,
+            metrics: MetricsExporter = None
+        ):
         """
         Generate all experiments.
+
+        Optional arguments:
+        * result_store:ResultStore, store to which every successful experiment is added. Default: None
+        * constraints:list[Constraint], constraints in addition to those of the ArchFactory and Design; combinations that fail any are never run. Default: None
+        * sampler:Sampler, run only a fixed budget of sampled combinations instead of the full grid (see structure.sampling). Default: None
+        * shard:str, 'i/N' to only run the i-th (0-based) of N disjoint slices of the sweep, e.g., as one of N independent batch jobs; see get_shard_arg()
+          to take it from the command line. Pass None to run the whole sweep. Default: None
+        * dedup:str, run equivalent experiments only once, and share the result with the others (see Runner._group_equivalent()); one of:
+            * 'inputs': experiments with identical tool inputs (e.g., sparsities without constant weights, or identical architectures under different names);
+              generates every input file before the first launch, in the 'artifact_dir' (see Experiment.get_artifact_cache()) where the runs reuse them,
+              which defaults to <root_dir>/artifacts if the parameters have none (pass None to disable the cache).
+            * 'params': experiments with the same classes, verified parameters and variant (see Experiment.get_identity()), e.g., from Derived parameters;
+              generates nothing.
+            * None: run every experiment.
+          Default: 'inputs'
+        * tracer:Tracer, records a timeline of the runs on the local host, exported as a Chrome trace after every batch if it has a path (see structure.trace). Default: None
+        * metrics:MetricsExporter, writes metrics of the runs for the Prometheus textfile collector while experiments run (see structure.metrics). Default: None
+        """
+        if dedup not in ['params', 'inputs', None]:
+            raise ValueError(f"Unknown dedup '{dedup}'; expected 'params', 'inputs' or None.")
+        exp_params = params.get(keys.KEY_EXP, {})
+        if dedup == 'inputs' and 'artifact_dir' not in exp_params and isinstance(exp_params.get('root_dir'), str):
+            # the input files are generated to be hashed: keep them for the runs
+            params = {**params, keys.KEY_EXP: {**exp_params, 'artifact_dir': os.path.join(exp_params['root_dir'], 'artifacts')}}
+        self.params = params
+        self.dedup = dedup
+        self.result_store = result_store
+        self.sampler = sampler
+        self.tracer = tracer
+        self.metrics = metrics
+        self.shard = parse_shard(shard)
+        self.factory = ExperimentFactory(arch, design, experiment_class, constraints)
+        with trace_span(self.tracer, 'generate'):
+            self.space = self.factory.get_space(params, sampler)
+            self.experiments = self.factory.gen_experiments(params, sampler, self.shard, space=self.space)
+        if self.shard is not None:
+            print(f"[Runner] Shard {self.shard[0]}/{self.shard[1]}: {len(self.experiments)} of {len(self.space)} combination(s).")
+
+    def _run_batch(self,
+            experiments: list[Experiment],
+            executor: Executor,
+            runner_err_file: str,
+            filter_params: list[str],
+            filter_results: list[str],
+            store_fields: dict[str, any] = None,
+            scheduler: Scheduler = None,
+            num_slots: int = 1,
+            dashboard: ProgressDashboard = None,
+            **kwargs
+        ) -> list[tuple[Experiment, dict, dict]]:
         """
-        self.factory = ExperimentFactory(arch, design, experiment_class)
-        self.experiments = self.factory.gen_experiments(params)
+        Run a batch of experiments on an executor, and print each result (or exception) as it completes.
+        store_fields are added as extra fields to every record in the result store.
+        If a Scheduler is given, distinct experiments are submitted in its order, and its predicted makespan on num_slots slots is compared to the actual one.
+        If a ProgressDashboard is given, it shows the batch; results are then not printed if it is drawn on a terminal.
+
+        @return a list of (Experiment, full parameters, result) for all successful experiments.
+        """
+        with trace_span(self.tracer, 'group equivalent', count=len(experiments)):
+            groups = self._group_equivalent(experiments, **kwargs)
+        submit_order = list(groups.keys())
+        if scheduler is not None:
+            with trace_span(self.tracer, 'schedule', count=len(submit_order)):
+                submit_order, predicted_makespan = scheduler.plan(submit_order, num_slots)
+        batch_start_time = timer()
+        if dashboard is not None:
+            dashboard.start(submit_order, num_slots)
+        for exp in submit_order:
+            exp.tracer = self.tracer
+        if self.metrics is not None:
+            self.metrics.start(submit_order)
+        with trace_span(self.tracer, 'submit', count=len(submit_order)):
+            futures_dict = { executor.submit(exp, **kwargs): exp for exp in submit_order }
+
+        outcomes = []
+        total_count = len(futures_dict)
+        quiet = dashboard is not None and dashboard.is_live()
+        try:
+            for i, future in enumerate(as_completed(futures_dict.keys())):
+                exp = futures_dict[future]
+                with trace_span(self.tracer, 'collect', exp_dir=exp.exp_dir):
+                    outcome = self._collect_outcome(exp, future, f"{i+1}/{total_count}", runner_err_file, filter_params, filter_results, store_fields, quiet)
+                    if dashboard is not None:
+                        dashboard.finish(exp, outcome is not None)
+                    if self.metrics is not None:
+                        self.metrics.finish(exp, outcome is not None, len(groups[exp]) if outcome is not None else 0)
+                    if outcome is not None:
+                        outcomes.append((exp, *outcome))
+                        outcomes += self._fan_out(exp, *outcome, groups[exp], store_fields, quiet)
+        finally:
+            if dashboard is not None:
+                dashboard.stop()
+            if self.metrics is not None:
+                self.metrics.stop()
+            self._export_trace()
+
+        if scheduler is not None:
+            unit = 's' if scheduler.cost_model.calibrated else ' (relative units)'
+            print(f"[Runner] Makespan on {num_slots} slot(s): predicted {predicted_makespan:.3f}{unit}, actual {(timer() - batch_start_time):.3f}s.")
+        return outcomes
+
+    def _export_trace(self) -> None:
+        """
+        Export the timeline so far, if the tracer has a path.
+        """
+        if self.tracer is not None and self.tracer.path is not None:
+            self.tracer.export()
+
+    def _group_equivalent(self, experiments: list[Experiment], **kwargs) -> dict[Experiment, list[Experiment]]:
+        """
+        Group equivalent experiments as per self.dedup: by tool inputs for the given Experiment.run() arguments (see Experiment.get_input_hash()), or by
+        parameters (see Experiment.get_identity()).
+
+        @return the first experiment of each group, in order, mapped to the other experiments of its group.
+        """
+        groups = {}
+        representatives = {}
+        for exp in experiments:
+            try:
+                if self.dedup == 'params':
+                    # the full identity, not its truncated hash, so that colliding hashes are never merged; the Experiment.run() arguments are the same for the whole batch
+                    key = exp.get_identity()
+                elif self.dedup == 'inputs':
+                    key = exp.get_input_hash(**kwargs)
+                else:
+                    key = None
+            except Exception:
+                # e.g., unsupported parameters; the experiment runs on its own, and reports the error
+                key = None
+            if key is not None and key in representatives:
+                groups[representatives[key]].append(exp)
+            else:
+                groups[exp] = []
+                if key is not None:
+                    representatives[key] = exp
+
+        if len(groups) < len(experiments):
+            print(f"[Runner] {len(experiments) - len(groups)} of {len(experiments)} experiment(s) are equivalent to another; running {len(groups)} distinct experiment(s).")
+        return groups
+
+    def _fan_out(self,
+            exp: Experiment,
+            params: dict[str, any],
+            result: dict[str, any],
+            equivalents: list[Experiment],
+            store_fields: dict[str, any] = None,
+            quiet: bool = False
+        ) -> list[tuple[Experiment, dict, dict]]:
+        """
+        Share the outcome of an Experiment with equivalent experiments that were not run.
+
+        @return a list of (Experiment, full parameters, result) for all equivalent experiments.
+        """
+        outcomes = []
+        for other in equivalents:
+            other.exp_dir = exp.exp_dir
+            other.run_time = exp.run_time
+            other.result = result
+            other_params = other.get_full_params()
+            # experiment defaults are only filled in when run
+            other_params[keys.KEY_EXP] = {**params[keys.KEY_EXP], **other_params[keys.KEY_EXP]}
+            if self.result_store is not None:
+                self.result_store.add(other, other_params, result, **(store_fields or {}))
+            outcomes.append((other, other_params, result))
+
+        if len(equivalents) > 0 and not quiet:
+            print(f"[Runner] Result of {exp.exp_dir} shared with {len(equivalents)} equivalent experiment(s).")
+        return outcomes
+
+    def _collect_outcome(self,
+            exp: Experiment,
+            future: Future,
+            progress: str,
+            runner_err_file: str,
+            filter_params: list[str],
+            filter_results: list[str],
+            store_fields: dict[str, any] = None,
+            quiet: bool = False
+        ) -> tuple[dict, dict]:
+        """
+        Collect the outcome of a completed future of an Experiment: print the result and add it to the result store, or print and log the exception.
+        If quiet, nothing is printed (the exception is still logged).
+
+        @return a tuple of (full parameters, result), or None if an exception occurred.
+        """
+        try:
+            inp, out = future.result()
+
+            # search for required keys and add to results
+            res_dict = {}
+            add_to_results(res_dict, inp, filter_params)
+            add_to_results(res_dict, out, filter_results)
+
+            if not quiet:
+                print("====================================")
+                print(f"Result {progress}")
+                pretty(res_dict, 1)
+                print("====================================")
+
+            if self.result_store is not None:
+                self.result_store.add(exp, inp, out, **(store_fields or {}))
+            return inp, out
+        except Exception as e:
+            err_str = f"Exception:\n{repr(e)}\n"
+            if exp.exp_dir is not None and os.path.isdir(exp.exp_dir):
+                with open(os.path.join(exp.exp_dir, runner_err_file), 'w') as f:
+                    f.write(err_str)
+
+            if not quiet:
+                print("!-----------------------------------")
+                print(f"For experiment with directory {exp.exp_dir}, an exception occurred:")
+                print(err_str)
+                print("------------------------------------")
+            return None
+
+    def _print_summary(self, desc: str, total_count: int, successes: int, start_time: float, track_run_time: bool) -> None:
+        """
+        Print the summary of a completed run.
+        """
+        top_line = f"*********************** Run '{desc}' complete! ***********************"
+        print(top_line)
+        print(f"Total: {total_count}, of which {successes} succeeded ({(successes / max(total_count, 1) * 100):.2f}%).")
+        if track_run_time:
+            print(f"Run time: {(timer() - start_time):.3f} second(s).")
+        print("*" * len(top_line))
+
+    def _to_dataframe(self, outcomes: list[tuple[Experiment, dict, dict]], filter_params: list[str], filter_results: list[str]) -> 'pd.DataFrame':
+        """
+        Convert outcomes of _run_batch() to a DataFrame with filtered parameters and results.
+        """
+        results = []
+        for exp, inp, out in outcomes:
+            res_dict = {}
+            if self.shard is not None:
+                # identifies the combination when merging shards (see merge_results())
+                res_dict['sweep_index'] = exp.sweep_index
+            add_to_results(res_dict, inp, filter_params)
+            add_to_results(res_dict, out, filter_results)
+            results.append(res_dict)
+        import pandas as pd
+        return pd.DataFrame.from_records(results)
+
+    def plan(self,
+            num_parallel_tasks: int = 1,
+            planner: SurrogatePlanner = None,
+            scheduler: Scheduler = None,
+            memory_model: CostModel = None,
+            cores_per_experiment: int = 1,
+            **kwargs
+        ) -> dict[str, any]:
+        """
+        Report what run_all_threaded() would run with the same arguments, without creating any experiment directory or running anything (with the 'inputs' dedup
+        and an 'artifact_dir', design files are generated into the artifact cache to compare them, and reused by the run): how many combinations the parameters
+        expand to, how many are dropped as invalid, skipped by the planner or shared as duplicates, how many of the remaining experiments are already in the
+        result store or finished on disk (all are run again), and the predicted core-hours, peak concurrent memory and makespan on num_parallel_tasks slots.
+
+        Optional arguments:
+        * num_parallel_tasks:int, number of slots to predict the makespan and peak memory on. Default: 1
+        * planner:SurrogatePlanner, as for run_all_threaded(). Default: None
+        * scheduler:Scheduler, as for run_all_threaded(); its cost model predicts run times. Pass None to keep the order, and predict run times with
+          a ParamSizeCostModel calibrated against the result store. Default: None
+        * memory_model:CostModel, predicts the peak memory (MiB) of each experiment. Pass None to use a ParamSizeCostModel calibrated against the 'max_rss'
+          of the result store. Default: None
+        * cores_per_experiment:int, number of cores each experiment occupies. Default: 1
+        All other keyword arguments are those of Experiment.run(), which may affect which experiments are duplicates.
+
+        @return a dictionary of:
+        * expanded, invalid, skipped, duplicates, distinct, cached, finished:int, counts as above; distinct experiments are the ones that would run.
+        * makespan:float, predicted makespan, in seconds if calibrated, otherwise in relative units.
+        * core_hours:float, predicted core-hours, or None if run times are not calibrated.
+        * peak_memory_mib:float, predicted peak memory of the experiments running at the same time, or None if memory is not calibrated.
+        * calibrated:bool, whether run times are calibrated.
+        """
+        expanded = len(self.space) if self.shard is None else len(self.space.get_shard(*self.shard))
+        experiments = self.experiments
+        skipped = []
+        if planner is not None:
+            experiments, skipped = planner.plan(experiments)
+        groups = self._group_equivalent(experiments, **kwargs)
+        distinct = list(groups.keys())
+
+        cached = 0 if self.result_store is None else sum(1 for exp in distinct if self.result_store.find(exp) is not None)
+        finished = sum(1 for exp in distinct if exp.is_finished())
+
+        if scheduler is None:
+            scheduler = Scheduler(ParamSizeCostModel(self.result_store), None)
+        if memory_model is None:
+            memory_model = ParamSizeCostModel(self.result_store, target='max_rss')
+        ordered, makespan = scheduler.plan(distinct, num_parallel_tasks)
+        calibrated = scheduler.cost_model.calibrated
+        # predict again in submission order
+        costs = [float(c) for c in scheduler.cost_model.predict(ordered)]
+        memory = [float(m) for m in memory_model.predict(ordered)]
+
+        report = {
+            'expanded': expanded,
+            'invalid': len(self.factory.invalid),
+            'skipped': len(skipped),
+            'duplicates': len(experiments) - len(distinct),
+            'distinct': len(distinct),
+            'cached': cached,
+            'finished': finished,
+            'makespan': makespan,
+            'core_hours': sum(costs) * cores_per_experiment / 3600 if calibrated else None,
+            'peak_memory_mib': simulate_peak(costs, memory, num_parallel_tasks) if memory_model.calibrated else None,
+            'calibrated': calibrated
+        }
+
+        unit = 's' if calibrated else ' (relative units)'
+        print(f"[Runner] Plan on {num_parallel_tasks} slot(s):")
+        print(f"\tExpanded: {report['expanded']} combination(s)")
+        print(f"\tInvalid: {report['invalid']}")
+        if planner is not None:
+            print(f"\tSkipped by planner: {report['skipped']}")
+        print(f"\tDuplicates: {report['duplicates']} (equivalent to another)")
+        print(f"\tTo run: {report['distinct']}, of which {report['cached']} in the result store, {report['finished']} finished on disk")
+        print(f"\tMakespan: {report['makespan']:.3f}{unit}")
+        core_hours, peak_memory = report['core_hours'], report['peak_memory_mib']
+        print(f"\tCore-hours: {'unknown (no past run times)' if core_hours is None else f'{core_hours:.3f}'}")
+        print(f"\tPeak memory: {'unknown (no past max_rss)' if peak_memory is None else f'{peak_memory:.1f} MiB'}")
+        return report
 
     def run_all_threaded(self,
             track_run_time: bool = True,
-            desc: str = 'run', 
-            num_parallel_tasks: int = 1, 
+            desc: str = 'run',
+            num_parallel_tasks: int = 1,
             runner_err_file: str = 'runner.err',
             filter_params: list[str] = None,
             filter_results: list[str] = None,
+            executor: Executor = None,
+            planner: SurrogatePlanner = None,
+            scheduler: Scheduler = None,
+            dashboard: ProgressDashboard = None,
             **kwargs
-        ) -> pd.DataFrame:
+        ) -> 'pd.DataFrame':
         """
-        Main function: run all generated experiments with a thread pool.
+        Main function: run all generated experiments with a thread pool, or with the provided Executor.
 
         Optional arguments:
         * track_run_time:bool, will track total run time and print at the end if True. Default: True
@@ -40,6 +436,10 @@ class Runner():
         * runner_err_file:str, name of error file created by runner if an exception occurs while running the Experiment. Created in the Experiment folder.
         * filter_params:list[str], a list of parameter keys that should be extracted from the Experiment parameters and included in the resultant Dataframe. Pass None to include all. Default: None
         * filter_results:list[str], a list of result keys that should be extracted from the result and included in the resultant Dataframe. Pass None to include all. Default: None
+        * executor:Executor, backend to run the experiments on, e.g., a QueueExecutor for remote workers. Pass None to use a LocalExecutor with num_parallel_tasks threads. Default: None
+        * planner:SurrogatePlanner, orders experiments and skips those predicted to be far off the Pareto front, based on past results. Pass None to run all in order. Default: None
+        * scheduler:Scheduler, orders experiments for submission by predicted cost, e.g., longest first, and reports the predicted and actual makespan on num_parallel_tasks slots. Applied after the planner. Pass None to keep the order. Default: None
+        * dashboard:ProgressDashboard, shows live progress and the ETA of the run (see structure.progress), with num_parallel_tasks slots. Default: None
         All other keyword arguments are passed directly to the Experiment.run() function.
 
         @return a Pandas DataFrame with filtered parameters and results.
@@ -47,67 +447,440 @@ class Runner():
         # log start time.
         start_time = timer()
 
-        # runnable
-        def run_experiment(exp: Experiment) -> dict:
-            exp.run(**kwargs)
-            exp.wait()
-            return exp.get_full_params(), exp.get_result()
-        
-        # submit all Experiments into the ThreadPoolExecutor
-        executor = ThreadPoolExecutor(max_workers=num_parallel_tasks)
-        futures_dict = { executor.submit(run_experiment, exp): exp for exp in self.experiments }
-
-        # collect all results
-        results = []
-        def add_to_results(res_dict: dict[str, any], search_dict: dict[str, any], keys: list[str]):
-            """
-            Recursively search a nested dictionary and add required leaf keys to a result dictionary.
-            """
-            for k, v in search_dict.items():
-                if isinstance(v, dict):
-                    add_to_results(res_dict, v, keys)
-                elif keys is None or k in keys:
-                    res_dict[k] = v
+        experiments = self.experiments
+        if planner is not None:
+            experiments, skipped = planner.plan(experiments)
+            if len(skipped) > 0:
+                print(f"[Runner] Skipping {len(skipped)} experiment(s) predicted to be dominated:")
+                for exp in skipped:
+                    print(f"\t{exp.get_exp_name()}")
+
+        owns_executor = executor is None
+        if owns_executor:
+            executor = LocalExecutor(num_parallel_tasks)
+
+        outcomes = self._run_batch(experiments, executor, runner_err_file, filter_params, filter_results, scheduler=scheduler, num_slots=num_parallel_tasks, dashboard=dashboard, **kwargs)
 
-        # track successes
+        if owns_executor:
+            executor.shutdown()
+
+        self._print_summary(desc, len(experiments), len(outcomes), start_time, track_run_time)
+        return self._to_dataframe(outcomes, filter_params, filter_results)
+
+    def run_adaptive(self,
+            objectives: dict[str, str] = {'fmax': 'max', 'clb': 'min'},
+            threshold: float = 0.1,
+            max_rounds: int = 10,
+            budget: int = None,
+            track_run_time: bool = True,
+            desc: str = 'run',
+            num_parallel_tasks: int = 1,
+            runner_err_file: str = 'runner.err',
+            filter_params: list[str] = None,
+            filter_results: list[str] = None,
+            executor: Executor = None,
+            **kwargs
+        ) -> 'pd.DataFrame':
+        """
+        Adaptive alternative to run_all_threaded(): instead of the full cartesian product, run a coarse subset first (corners and midpoints of numeric lists),
+        then keep bisecting between neighbouring points where metrics change fast, a run fails, or a point is on the Pareto front (see structure.adaptive.AdaptiveSampler).
+
+        Optional arguments (in addition to those of run_all_threaded()):
+        * objectives:dict[str, str], result keys to explore, mapped to 'max' or 'min'. Default: {'fmax': 'max', 'clb': 'min'}
+        * threshold:float, relative change in any objective between neighbours that triggers refinement. Default: 0.1
+        * max_rounds:int, maximum number of refinement rounds after the coarse round. Default: 10
+        * budget:int, maximum total number of experiments to run. Pass None for no limit. Default: None
+
+        @return a Pandas DataFrame with filtered parameters and results of the experiments that were run.
+        """
+        variable_params = self.factory.get_variable_params(self.params)
+        axes = [v_list for _, v_list in variable_params]
+        if self.sampler is not None or self.shard is not None or any(isinstance(v_list, Range) for v_list in axes):
+            raise ValueError('Adaptive runs refine the whole grid, and do not support a Sampler, shards or Range parameters.')
+        sampler = AdaptiveSampler(axes, objectives, threshold)
+
+        start_time = timer()
+
+        owns_executor = executor is None
+        if owns_executor:
+            executor = LocalExecutor(num_parallel_tasks)
+
+        evaluated = {}
+        all_outcomes = []
+        points = sampler.initial()
+        for round_num in range(max_rounds + 1):
+            if budget is not None:
+                points = points[:budget - len(evaluated)]
+            if len(points) == 0:
+                break
+
+            print(f"[Runner] Adaptive round {round_num}: running {len(points)} new point(s) ({len(evaluated)} run so far).")
+            experiments = {}
+            for point in points:
+                evaluated[point] = None
+                exp = self.factory.gen_experiment(self.params, variable_params, tuple(axes[i][idx] for i, idx in enumerate(point)))
+                # invalid points count as failed, without being run
+                if len(self.factory.get_violations(exp)) == 0:
+                    experiments[exp] = point
+            outcomes = self._run_batch(list(experiments.keys()), executor, runner_err_file, filter_params, filter_results, **kwargs)
+
+            for exp, _, out in outcomes:
+                metrics = { k: out.get(k) for k in objectives }
+                # points missing any objective (e.g., partial results) count as failed
+                if out.get('status', True) and all(v is not None for v in metrics.values()):
+                    evaluated[experiments[exp]] = metrics
+            all_outcomes += outcomes
+
+            points = sampler.refine(evaluated)
+
+        if owns_executor:
+            executor.shutdown()
+
+        grid_size = 1
+        for v_list in axes:
+            grid_size *= len(v_list)
+        print(f"[Runner] Adaptive run explored {len(evaluated)} of {grid_size} grid points.")
+        self._print_summary(desc, len(evaluated), len(all_outcomes), start_time, track_run_time)
+        return self._to_dataframe(all_outcomes, filter_params, filter_results)
+
+    def run_multi_fidelity(self,
+            low_fidelity: str = 'pack',
+            low_fidelity_kwargs: dict[str, any] = {'vpr_args': ['--pack']},
+            promote_top_k: int = None,
+            rank_by: str = 'clb',
+            ascending: bool = True,
+            promote_fn: Callable[[dict, dict], bool] = None,
+            track_run_time: bool = True,
+            desc: str = 'run',
+            num_parallel_tasks: int = 1,
+            runner_err_file: str = 'runner.err',
+            filter_params: list[str] = None,
+            filter_results: list[str] = None,
+            executor: Executor = None,
+            **kwargs
+        ) -> 'pd.DataFrame':
+        """
+        Two-phase alternative to run_all_threaded(): every experiment is first run at a cheap, low fidelity (by default, up to packing) for block counts,
+        and only promising experiments are promoted to the full flow.
+        Low-fidelity experiments are run under a separate directory, with the variant parameter set to low_fidelity.
+
+        Optional arguments (in addition to those of run_all_threaded()):
+        * low_fidelity:str, label of the low fidelity, used as the variant of low-fidelity experiments and in the result store. Default: 'pack'
+        * low_fidelity_kwargs:dict[str, any], extra keyword arguments to Experiment.run() for the low fidelity. Default: {'vpr_args': ['--pack']}
+        * promote_top_k:int, promote the best k successful low-fidelity experiments, as per rank_by and ascending. Default: None
+        * rank_by:str, result key to rank low-fidelity experiments by. Default: 'clb'
+        * ascending:bool, if True, smaller values of rank_by are better. Default: True
+        * promote_fn:Callable[[dict, dict], bool], predicate on (full parameters, result) of a low-fidelity experiment to promote it. Default: None
+        If both promote_top_k and promote_fn are given, experiments must satisfy both. If neither is given, all successful experiments are promoted.
+
+        @return a Pandas DataFrame with filtered parameters and results of both fidelities, with a 'fidelity' column (low_fidelity or 'full').
+        """
+        start_time = timer()
+
+        owns_executor = executor is None
+        if owns_executor:
+            executor = LocalExecutor(num_parallel_tasks)
+
+        # phase 1: low fidelity; generated in the same order as the full experiments
+        low_params = deepcopy(self.params)
+        low_params[keys.KEY_EXP]['variant'] = low_fidelity
+        low_experiments = self.factory.gen_experiments(low_params, self.sampler, self.shard)
+        full_experiments = dict(zip(low_experiments, self.experiments))
+
+        print(f"[Runner] Running {len(low_experiments)} experiment(s) at fidelity '{low_fidelity}'.")
+        low_outcomes = self._run_batch(low_experiments, executor, runner_err_file, filter_params, filter_results,
+                                       store_fields={'fidelity': low_fidelity}, **{**kwargs, **low_fidelity_kwargs})
+
+        # phase 2: promote
+        candidates = [(exp, inp, out) for exp, inp, out in low_outcomes if out.get('status', True)]
+        if promote_fn is not None:
+            candidates = [(exp, inp, out) for exp, inp, out in candidates if promote_fn(inp, out)]
+        if promote_top_k is not None:
+            candidates.sort(key=lambda outcome: outcome[2][rank_by], reverse=not ascending)
+            candidates = candidates[:promote_top_k]
+        promoted = [full_experiments[exp] for exp, _, _ in candidates]
+
+        print(f"[Runner] Promoting {len(promoted)} of {len(low_experiments)} experiment(s) to full fidelity.")
+        full_outcomes = self._run_batch(promoted, executor, runner_err_file, filter_params, filter_results,
+                                        store_fields={'fidelity': 'full'}, **kwargs)
+
+        if owns_executor:
+            executor.shutdown()
+
+        self._print_summary(desc, len(low_experiments) + len(promoted), len(low_outcomes) + len(full_outcomes), start_time, track_run_time)
+        low_df = self._to_dataframe(low_outcomes, filter_params, filter_results)
+        low_df['fidelity'] = low_fidelity
+        full_df = self._to_dataframe(full_outcomes, filter_params, filter_results)
+        full_df['fidelity'] = 'full'
+        import pandas as pd
+        return pd.concat([low_df, full_df], ignore_index=True)
+
+    def run_seeds(self,
+            min_seeds: int = 3,
+            max_seeds: int = 10,
+            tolerance: dict[str, float] = {'fmax': 0.02},
+            confidence: float = 0.95,
+            seeds: list[int] = None,
+            aggregate: list[str] = ['fmax', 'cpd', 'clb', 'twl'],
+            track_run_time: bool = True,
+            desc: str = 'run',
+            num_parallel_tasks: int = 1,
+            runner_err_file: str = 'runner.err',
+            filter_params: list[str] = None,
+            filter_results: list[str] = None,
+            executor: Executor = None,
+            **kwargs
+        ) -> 'pd.DataFrame':
+        """
+        Multi-seed alternative to run_all_threaded(): run each experiment with several placement seeds, adding one seed at a time until
+        the confidence interval of the mean of every key in tolerance is narrow enough, or max_seeds have been run.
+        Each seed is run under a separate directory, with the variant parameter set to 'seed.<seed>'.
+
+        Optional arguments (in addition to those of run_all_threaded(); filter_results only applies to printed per-seed results):
+        * min_seeds:int, number of seeds to run for every experiment before checking convergence. Default: 3
+        * max_seeds:int, maximum number of seeds per experiment. Default: 10
+        * tolerance:dict[str, float], result keys mapped to the maximum half-width of their confidence interval, relative to their mean. Default: {'fmax': 0.02}
+        * confidence:float, confidence level of the interval, one of 0.90, 0.95, 0.99. Default: 0.95
+        * seeds:list[int], seeds to use in order. Pass None to use 1127, 1128, ... Default: None
+        * aggregate:list[str], result keys to aggregate, in addition to those in tolerance. Default: ['fmax', 'cpd', 'clb', 'twl']
+
+        @return a Pandas DataFrame with one row per experiment: filtered parameters, <key>_mean, <key>_std, <key>_min and <key>_max for every aggregated key
+        (over seeds for which the flow succeeded), and the number of seeds run ('seeds'), succeeded ('seeds_ok') and whether the tolerance was met ('converged').
+        """
+        if seeds is None:
+            seeds = [1127 + i for i in range(max_seeds)]
+        if len(seeds) < max_seeds:
+            raise ValueError(f"{max_seeds} seeds required, but only {len(seeds)} were provided.")
+        aggregate = [*tolerance.keys(), *[k for k in aggregate if k not in tolerance]]
+
+        start_time = timer()
+
+        owns_executor = executor is None
+        if owns_executor:
+            executor = LocalExecutor(num_parallel_tasks)
+
+        variable_params = self.factory.get_variable_params(self.params)
+        points = [self.space.get_values(exp.sweep_index) for exp in self.experiments]
+        seed_params = deepcopy(self.params)
+
+        def submit(point: int) -> None:
+            seed = seeds[seeds_run[point]]
+            seed_params[keys.KEY_EXP]['variant'] = f"seed.{seed}"
+            exp = self.factory.gen_experiment(seed_params, variable_params, points[point])
+            exp.tracer = self.tracer
+            if self.metrics is not None:
+                self.metrics.start([exp])
+            futures_dict[executor.submit(exp, **{**kwargs, 'seed': seed})] = (exp, point, seed)
+            seeds_run[point] += 1
+
+        futures_dict = {}
+        seeds_run = [0] * len(points)
+        point_params = [None] * len(points)
+        point_results = [[] for _ in points]
+        for _ in range(min_seeds):
+            for point in range(len(points)):
+                submit(point)
+
+        collected = 0
         successes = 0
+        while len(futures_dict) > 0:
+            done, _ = wait(futures_dict.keys(), return_when=FIRST_COMPLETED)
+            for future in done:
+                exp, point, seed = futures_dict.pop(future)
+                collected += 1
+                outcome = self._collect_outcome(exp, future, f"{collected} (seed {seed}, {seeds_run[point]}/{max_seeds} seed(s) started)",
+                                                runner_err_file, filter_params, filter_results, {'seed': seed})
+                if self.metrics is not None:
+                    self.metrics.finish(exp, outcome is not None)
+                if outcome is not None:
+                    successes += 1
+                    inp, out = outcome
+                    point_params[point] = inp
+                    if out.get('status', True):
+                        point_results[point].append(out)
+
+                # only decide once all started seeds of this point are in
+                if any(p == point for _, p, _ in futures_dict.values()):
+                    continue
+                converged = all(is_converged([r[k] for r in point_results[point]], tol, confidence) for k, tol in tolerance.items())
+                if not converged and seeds_run[point] < max_seeds:
+                    submit(point)
+
+        if owns_executor:
+            executor.shutdown()
+        if self.metrics is not None:
+            self.metrics.stop()
+        self._export_trace()
+
+        rows = []
+        for point in range(len(points)):
+            row = {}
+            if self.shard is not None:
+                row['sweep_index'] = self.experiments[point].sweep_index
+            if point_params[point] is not None:
+                add_to_results(row, point_params[point], filter_params)
+                row.pop('variant', None)
+            for k in aggregate:
+                for stat, v in summarize([r[k] for r in point_results[point]]).items():
+                    row[f"{k}_{stat}"] = v
+            row['seeds'] = seeds_run[point]
+            row['seeds_ok'] = len(point_results[point])
+            row['converged'] = all(is_converged([r[k] for r in point_results[point]], tol, confidence) for k, tol in tolerance.items())
+            rows.append(row)
+
+        self._print_summary(desc, collected, successes, start_time, track_run_time)
+        print(f"[Runner] {sum(row['converged'] for row in rows)} of {len(points)} experiment(s) converged, using {sum(seeds_run)} seed run(s) in total.")
+        import pandas as pd
+        return pd.DataFrame.from_records(rows)
+
+    def run_race(self,
+            k: int = 4,
+            seeds: list[int] = None,
+            cancel_on: str = 'placement',
+            target_fmax: float = None,
+            placement_margin: float = 0.05,
+            poll_interval: float = 5.0,
+            track_run_time: bool = True,
+            desc: str = 'run',
+            num_parallel_tasks: int = 1,
+            runner_err_file: str = 'runner.err',
+            filter_params: list[str] = None,
+            filter_results: list[str] = None,
+            **kwargs
+        ) -> 'pd.DataFrame':
+        """
+        Seed-racing alternative to run_all_threaded() for "best achievable fmax" studies: k seeds of every experiment are queued,
+        and seeds that can no longer win are cancelled (killed if running), so their slots go back to the rest of the sweep.
+        Each seed is run under a separate directory, with the variant parameter set to 'seed.<seed>'.
+        Racing watches the VPR logs of running seeds, so experiments always run on a local thread pool.
+
+        Optional arguments (in addition to those of run_all_threaded()):
+        * k:int, number of seeds per experiment. Default: 4
+        * seeds:list[int], seeds to use. Pass None to use 1127, 1128, ... Default: None
+        * cancel_on:str, when to cancel the other seeds of an experiment. Default: 'placement'
+            * 'first': as soon as one seed routes successfully.
+            * 'placement': cancel each running seed whose post-placement fmax estimate, increased by placement_margin, is below the best final fmax so far.
+            * None: only on reaching target_fmax.
+        * target_fmax:float, cancel all other seeds as soon as one seed reaches this fmax (MHz). Default: None
+        * placement_margin:float, relative optimism granted to post-placement estimates for cancel_on='placement'. Default: 0.05
+        * poll_interval:float, seconds between checks of the VPR logs of running seeds. Default: 5.0
+
+        @return a Pandas DataFrame with one row per experiment: filtered parameters and results of its best seed,
+        and the best seed ('best_seed'), number of seeds finished ('seeds_finished') and cancelled ('seeds_cancelled').
+        """
+        if cancel_on not in ['first', 'placement', None]:
+            raise ValueError(f"Unknown cancel_on '{cancel_on}'; expected 'first', 'placement' or None.")
+        if seeds is None:
+            seeds = [1127 + i for i in range(k)]
+        if len(seeds) < k:
+            raise ValueError(f"{k} seeds required, but only {len(seeds)} were provided.")
+
+        start_time = timer()
+        executor = LocalExecutor(num_parallel_tasks)
+
+        variable_params = self.factory.get_variable_params(self.params)
+        points = [self.space.get_values(exp.sweep_index) for exp in self.experiments]
+        seed_params = deepcopy(self.params)
+
+        # submit seeds round-robin, so all experiments start racing early
+        futures_dict = {}
+        for seed in seeds[:k]:
+            seed_params[keys.KEY_EXP]['variant'] = f"seed.{seed}"
+            for point in range(len(points)):
+                exp = self.factory.gen_experiment(seed_params, variable_params, points[point])
+                exp.tracer = self.tracer
+                if self.metrics is not None:
+                    self.metrics.start([exp])
+                futures_dict[executor.submit(exp, **{**kwargs, 'seed': seed})] = (exp, point, seed)
+
+        best = [None] * len(points)  # (fmax, seed, full parameters, result) of the best finished seed
+        decided = [False] * len(points)
+        finished = [0] * len(points)
+        cancelled = [0] * len(points)
+        followers = {}
         total_count = len(futures_dict)
+        collected = 0
+        successes = 0
 
-        for i, future in enumerate(as_completed(futures_dict.keys())):
-            exp: Experiment = futures_dict[future]
-            try:
-                result = future.result()
-                inp, out = result
+        def decide(point: int, reason: str) -> None:
+            """
+            Cancel all remaining seeds of an experiment.
+            """
+            decided[point] = True
+            remaining = [exp for exp, p, _ in futures_dict.values() if p == point]
+            if len(remaining) > 0:
+                print(f"[Runner] Cancelling {len(remaining)} remaining seed(s) of experiment {point + 1}/{len(points)}: {reason}.")
+            for exp in remaining:
+                exp.cancel()
 
-                # search for required keys and add to results
-                res_dict = {}
-                add_to_results(res_dict, inp, filter_params)
-                add_to_results(res_dict, out, filter_results)
+        while len(futures_dict) > 0:
+            done, _ = wait(futures_dict.keys(), timeout=poll_interval, return_when=FIRST_COMPLETED)
+            for future in done:
+                exp, point, seed = futures_dict.pop(future)
+                followers.pop(exp, None)
+                collected += 1
+                if isinstance(future.exception(), ExperimentCancelledError):
+                    cancelled[point] += 1
+                    if self.metrics is not None:
+                        self.metrics.finish(exp, False)
+                    continue
 
-                print("====================================")
-                print(f"Result {i+1}/{total_count}")
-                pretty(res_dict, 1)
-                print("====================================")
-                
-                results.append(res_dict)
+                outcome = self._collect_outcome(exp, future, f"{collected}/{total_count} (seed {seed})",
+                                                runner_err_file, filter_params, filter_results, {'seed': seed})
+                if self.metrics is not None:
+                    self.metrics.finish(exp, outcome is not None)
+                if outcome is None:
+                    continue
                 successes += 1
-            except Exception as e:
-                err_str = f"Exception:\n{repr(e)}\n"
-                with open(os.path.join(exp.exp_dir, runner_err_file), 'w') as f:
-                    f.write(err_str)
-                
-                print("!-----------------------------------")
-                print(f"For experiment with directory {exp.exp_dir}, an exception occurred:")
-                print(err_str)
-                print("------------------------------------")
-        
+                finished[point] += 1
+                inp, out = outcome
+                if not out.get('status', True):
+                    continue
+
+                if best[point] is None or out['fmax'] > best[point][0]:
+                    best[point] = (out['fmax'], seed, inp, out)
+                if decided[point]:
+                    continue
+                if target_fmax is not None and out['fmax'] >= target_fmax:
+                    decide(point, f"seed {seed} reached target fmax {out['fmax']:.2f} MHz")
+                elif cancel_on == 'first':
+                    decide(point, f"seed {seed} routed successfully")
+
+            # check the progress of running seeds against the best finished seed
+            if cancel_on != 'placement':
+                continue
+            for exp, point, seed in list(futures_dict.values()):
+                if decided[point] or best[point] is None or exp.cancelled or not exp.is_running():
+                    continue
+                if exp not in followers:
+                    # staged runs write their log in the scratch directory
+                    followers[exp] = VprLogFollower(os.path.join(exp.run_dir if exp.run_dir is not None else exp.exp_dir, 'temp'))
+                follower = followers[exp].poll()
+                if follower.place_cpd > 0 and 1000.0 / follower.place_cpd * (1 + placement_margin) < best[point][0]:
+                    print(f"[Runner] Cancelling seed {seed} of experiment {point + 1}/{len(points)}: estimated fmax {1000.0 / follower.place_cpd:.2f} MHz cannot beat {best[point][0]:.2f} MHz.")
+                    exp.cancel()
+
         executor.shutdown()
+        if self.metrics is not None:
+            self.metrics.stop()
+        self._export_trace()
 
-        # print summary
-        top_line = f"*********************** Run '{desc}' complete! ***********************"
-        print(top_line)
-        print(f"Total: {total_count}, of which {successes} succeeded ({(successes / total_count * 100):.2f}%).")
-        if track_run_time:
-            print(f"Run time: {(timer() - start_time):.3f} second(s).")
-        print("*" * len(top_line))
-        return pd.DataFrame.from_records(results)
\ No newline at end of file
+        rows = []
+        for point in range(len(points)):
+            row = {}
+            if self.shard is not None:
+                row['sweep_index'] = self.experiments[point].sweep_index
+            if best[point] is not None:
+                _, seed, inp, out = best[point]
+                add_to_results(row, inp, filter_params)
+                add_to_results(row, out, filter_results)
+                row.pop('variant', None)
+                row['best_seed'] = seed
+            row['seeds_finished'] = finished[point]
+            row['seeds_cancelled'] = cancelled[point]
+            rows.append(row)
+
+        self._print_summary(desc, total_count, successes, start_time, track_run_time)
+        print(f"[Runner] {sum(cancelled)} of {total_count} seed run(s) were cancelled.")
+        import pandas as pd
+        return pd.DataFrame.from_records(rows)
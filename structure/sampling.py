@@ -0,0 +1,56 @@
+"""
+Sampling of a fixed number of points from the space of variable parameters, as an alternative to the full grid.
+"""
+
+from structure.util import Abstract
+from structure.params import Range
+
+import math
+import numpy as np
+
+class Sampler(Abstract):
+    """
+    {abstract}
+    Draws a fixed budget of points from the unit hypercube (one dimension per variable parameter), which are then mapped onto the values of each parameter.
+    Discrete parameters (lists, Zip groups) are split into equally-sized bins, one per value; continuous parameters are given as structure.params.Range.
+    """
+
+    def __init__(self, n: int, seed: int = 0):
+        """
+        * n:int, number of points (budget) to draw.
+
+        Optional arguments:
+        * seed:int, seed of the random number generator; the same seed always draws the same points. Default: 0
+        """
+        if n < 1:
+            raise ValueError(f"At least 1 point must be sampled, got {n}.")
+        self.n = n
+        self.seed = seed
+
+    def sample_unit(self, dims: int) -> np.ndarray:
+        """
+        {abstract}
+        @return points of shape (n, dims), with every coordinate in [0, 1).
+        """
+        self.raise_unimplemented("sample_unit")
+
+    def sample(self, axes: list[list | Range]) -> list[tuple]:
+        """
+        * axes:list, list of values (or a Range) of each variable parameter, as per ExperimentFactory.get_variable_params().
+
+        @return n points, each a tuple with one value per axis.
+        """
+        if len(axes) == 0:
+            return [()]
+
+        unit = self.sample_unit(len(axes))
+        points = []
+        for row in unit:
+            point = []
+            for u, axis in zip(row, axes):
+                if isinstance(axis, Range):
+                    point.append(axis.scale(float(u)))
+                else:
+                    point.append(axis[min(math.floor(u * len(axis)), len(axis) - 1)])
+            points.append(tuple(point))
+        return points
@@ -0,0 +1,108 @@
+"""
+Submission ordering of experiments by predicted cost, to shorten the makespan of a sweep on a fixed number of slots.
+"""
+
+from structure.util import Abstract
+from structure.exp import Experiment
+
+import heapq
+import numpy as np
+
+def simulate_schedule(costs: list[float], num_slots: int) -> list[tuple[float, float]]:
+    """
+    Simulate list scheduling: each job, in order, starts on the slot that frees up first.
+
+    @return the (start, end) time of each job.
+    """
+    slots = [0.0] * max(num_slots, 1)
+    intervals = []
+    for cost in costs:
+        start = heapq.heappop(slots)
+        heapq.heappush(slots, start + cost)
+        intervals.append((start, start + cost))
+    return intervals
+
+def simulate_makespan(costs: list[float], num_slots: int) -> float:
+    """
+    @return the time at which the last job finishes, as per simulate_schedule().
+    """
+    return max((end for _, end in simulate_schedule(costs, num_slots)), default=0.0)
+
+def simulate_peak(costs: list[float], loads: list[float], num_slots: int) -> float:
+    """
+    @return the highest total load (e.g., memory) of the jobs running at the same time, as per simulate_schedule().
+    """
+    events = []
+    for (start, end), load in zip(simulate_schedule(costs, num_slots), loads):
+        if end > start:
+            events += [(start, load), (end, -load)]
+    # at equal times, jobs end before others start
+    events.sort(key=lambda e: (e[0], e[1]))
+    peak = current = 0.0
+    for _, load in events:
+        current += load
+        peak = max(peak, current)
+    return peak
+
+class CostModel(Abstract):
+    """
+    {abstract}
+    Predicts the cost (run time) of Experiments before they are run.
+    """
+
+    calibrated = False  # True if predictions are in seconds, otherwise they are only relative
+
+    def predict(self, experiments: list[Experiment]) -> np.ndarray:
+        """
+        {abstract}
+        @return the predicted cost of each Experiment, of shape (experiments,).
+        """
+        self.raise_unimplemented("predict")
+
+class Scheduler():
+    """
+    Orders Experiments for submission with a list-scheduling policy over the costs predicted by a CostModel:
+    * 'longest_first': longest predicted run time first (LPT), so that long runs do not start last and leave the other slots idle.
+    * 'shortest_first': shortest predicted run time first (SPT), so that most results come in early.
+    * None: keep the order of generation.
+    With a scratch model, it also predicts the size each Experiment needs in its scratch directory, which staged experiments reserve from the scratch
+    size budget before they start (see structure.scratch).
+    """
+
+    POLICIES = ['longest_first', 'shortest_first']
+
+    def __init__(self, cost_model: CostModel, policy: str = 'longest_first', scratch_model: CostModel = None):
+        """
+        * cost_model:CostModel, predicts the cost of each Experiment.
+
+        Optional arguments:
+        * policy:str, one of POLICIES, or None. Default: 'longest_first'
+        * scratch_model:CostModel, predicts the scratch size (MiB) of each Experiment, e.g., ParamSizeCostModel(store, target='scratch_mib');
+          only used once calibrated. Default: None
+        """
+        if policy is not None and policy not in self.POLICIES:
+            raise ValueError(f"Unknown policy '{policy}'; expected one of {self.POLICIES} or None.")
+        self.cost_model = cost_model
+        self.policy = policy
+        self.scratch_model = scratch_model
+
+    def plan(self, experiments: list[Experiment], num_slots: int) -> tuple[list[Experiment], float]:
+        """
+        @return a tuple of (Experiments in submission order, predicted makespan on num_slots slots).
+        """
+        if len(experiments) == 0:
+            return experiments, 0.0
+
+        costs = self.cost_model.predict(experiments)
+        if self.scratch_model is not None:
+            scratch = self.scratch_model.predict(experiments)
+            if self.scratch_model.calibrated:
+                for exp, size in zip(experiments, scratch):
+                    exp.scratch_estimate = float(size)
+        order = list(range(len(experiments)))
+        if self.policy == 'longest_first':
+            order.sort(key=lambda i: -costs[i])
+        elif self.policy == 'shortest_first':
+            order.sort(key=lambda i: costs[i])
+
+        return [experiments[i] for i in order], simulate_makespan([float(costs[i]) for i in order], num_slots)
@@ -0,0 +1,105 @@
+"""
+Staging of experiments in a local scratch directory (e.g., tmpfs or a local SSD): the tool runs there, so that its large intermediate files never reach a
+(network) root_dir, and only what is kept is copied back once it is done. All experiments staged in the same scratch directory share a size budget.
+"""
+
+from structure.metrics import get_dir_size
+from structure.budget import ResourceBudget
+
+import os, re, shutil, threading
+
+INCLUDE_PATTERN = re.compile(r'^\s*`include\s+"([^"]+)"', re.MULTILINE)
+MIB = 1 << 20
+
+def find_includes(text: str, search_dir: str) -> list[str]:
+    """
+    Find the Verilog files included by text, directly or through other included files, as `include "<path>" relative to search_dir.
+
+    @return the relative paths of all included files that exist under search_dir, in order of first inclusion.
+    """
+    found = {}
+    pending = INCLUDE_PATTERN.findall(text)
+    while len(pending) > 0:
+        rel_path = pending.pop(0)
+        if rel_path in found:
+            continue
+        path = os.path.join(search_dir, rel_path)
+        if not os.path.isfile(path):
+            # left for the tool to report
+            continue
+        found[rel_path] = None
+        with open(path, 'r') as f:
+            pending += INCLUDE_PATTERN.findall(f.read())
+    return list(found)
+
+def bundle_includes(text: str, search_dir: str, bundle_dir: str) -> list[str]:
+    """
+    Copy the Verilog files included by text (see find_includes()) from search_dir to bundle_dir, under the same relative paths, so that bundle_dir can be
+    searched instead.
+
+    @return the relative paths of the copied files.
+    """
+    rel_paths = find_includes(text, search_dir)
+    for rel_path in rel_paths:
+        dst = os.path.join(bundle_dir, rel_path)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        shutil.copyfile(os.path.join(search_dir, rel_path), dst)
+    return rel_paths
+
+def copy_back(src_dir: str, dst_dir: str) -> None:
+    """
+    Copy a directory tree into another, replacing files that exist in both.
+    """
+    shutil.copytree(src_dir, dst_dir, dirs_exist_ok=True)
+
+class ScratchBudget(ResourceBudget):
+    """
+    Size budget of a scratch directory in MiB, shared by the experiments staged in it (see structure.budget.ResourceBudget); it also learns the most
+    any experiment used, as the size to reserve for experiments without a prediction. Reservations are not enforced; an experiment may use more.
+    """
+
+    def __init__(self, budget_mib: float):
+        """
+        * budget_mib:float, total size of all running experiments in MiB; None for no limit.
+        """
+        super().__init__(budget_mib)
+        self.max_used_mib = None  # most any finished experiment used
+
+    def get_estimate(self) -> float:
+        """
+        @return the size to reserve for an experiment without a prediction: the most any experiment has used so far, or the whole budget before any has finished.
+        """
+        with self.condition:
+            if self.max_used_mib is not None:
+                return self.max_used_mib
+            return self.total if self.total is not None else 0.0
+
+    def release(self, size_mib: float, used_mib: float = None) -> None:
+        """
+        Release a reservation, and record the size the experiment actually used, if known.
+        """
+        with self.condition:
+            if used_mib is not None:
+                self.max_used_mib = max(self.max_used_mib or 0.0, used_mib)
+        super().release(size_mib)
+
+scratch_budgets = {}  # real path of a scratch directory -> ScratchBudget
+scratch_budgets_lock = threading.Lock()
+
+def get_scratch_budget(scratch_dir: str, budget_mib: float = None) -> ScratchBudget:
+    """
+    @return the ScratchBudget shared by all experiments of this process staged in scratch_dir, with its budget set to budget_mib.
+    """
+    key = os.path.realpath(scratch_dir)
+    with scratch_budgets_lock:
+        budget = scratch_budgets.get(key)
+        if budget is None:
+            budget = scratch_budgets[key] = ScratchBudget(budget_mib)
+        budget.total = budget_mib
+        return budget
+
+def get_dir_size_mib(path: str) -> float:
+    """
+    @return the total size of all files under a directory in MiB.
+    """
+    return get_dir_size(path) / MIB
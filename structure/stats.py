@@ -0,0 +1,59 @@
+"""
+Small statistics helpers for repeated (e.g., multi-seed) measurements, without depending on SciPy.
+"""
+
+import math
+
+# two-sided critical values of Student's t-distribution, for 1 to 30 degrees of freedom
+T_CRITICAL = {
+    0.90: [6.314, 2.920, 2.353, 2.132, 2.015, 1.943, 1.895, 1.860, 1.833, 1.812,
+           1.796, 1.782, 1.771, 1.761, 1.753, 1.746, 1.740, 1.734, 1.729, 1.725,
+           1.721, 1.717, 1.714, 1.711, 1.708, 1.706, 1.703, 1.701, 1.699, 1.697],
+    0.95: [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+           2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+           2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042],
+    0.99: [63.657, 9.925, 5.841, 4.604, 4.032, 3.707, 3.499, 3.355, 3.250, 3.169,
+           3.106, 3.055, 3.012, 2.977, 2.947, 2.921, 2.898, 2.878, 2.861, 2.845,
+           2.831, 2.819, 2.807, 2.797, 2.787, 2.779, 2.771, 2.763, 2.756, 2.750],
+}
+# normal approximation beyond 30 degrees of freedom
+Z_CRITICAL = {0.90: 1.645, 0.95: 1.960, 0.99: 2.576}
+
+def t_critical(df: int, confidence: float = 0.95) -> float:
+    """
+    Two-sided critical value of Student's t-distribution. Supported confidence levels are the keys of T_CRITICAL.
+    """
+    if confidence not in T_CRITICAL:
+        raise ValueError(f"Unsupported confidence level {confidence}; expected one of {list(T_CRITICAL.keys())}.")
+    if df < 1:
+        raise ValueError('At least 1 degree of freedom (2 samples) is required.')
+    return T_CRITICAL[confidence][df - 1] if df <= len(T_CRITICAL[confidence]) else Z_CRITICAL[confidence]
+
+def summarize(values: list[float]) -> dict[str, float]:
+    """
+    @return mean, (sample) standard deviation, minimum and maximum of values.
+    """
+    n = len(values)
+    if n == 0:
+        return {'mean': math.nan, 'std': math.nan, 'min': math.nan, 'max': math.nan}
+
+    mean = sum(values) / n
+    std = math.sqrt(sum((v - mean) ** 2 for v in values) / (n - 1)) if n > 1 else 0.0
+    return {'mean': mean, 'std': std, 'min': min(values), 'max': max(values)}
+
+def confidence_half_width(values: list[float], confidence: float = 0.95) -> float:
+    """
+    Half-width of the confidence interval of the mean of values; infinite for fewer than 2 values.
+    """
+    n = len(values)
+    if n < 2:
+        return math.inf
+    return t_critical(n - 1, confidence) * summarize(values)['std'] / math.sqrt(n)
+
+def is_converged(values: list[float], tolerance: float, confidence: float = 0.95) -> bool:
+    """
+    Check if the confidence interval of the mean of values is within +/- tolerance, relative to the mean.
+    """
+    if len(values) < 2:
+        return False
+    return confidence_half_width(values, confidence) <= tolerance * abs(summarize(values)['mean'])
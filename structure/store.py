@@ -0,0 +1,106 @@
+"""
+Persistent store of experiment outcomes, shared across sweeps.
+"""
+
+from structure.exp import Experiment
+from structure.design import Design
+from structure.util import get_class_path
+
+import os, json, time, threading
+
+def get_record_value(record: dict[str, any], key: str) -> any:
+    """
+    Get a field of a record (e.g., 'run_time'), or else a key of its result (e.g., 'max_rss'); None if neither exists.
+    """
+    if key in record:
+        return record[key]
+    return record['result'].get(key)
+
+def get_design_id(design: Design) -> str:
+    """
+    Identify a design implementation across sweeps, e.g., 'impl.design.gemmt.fu.GemmTFuDesign:mm_reg_full'.
+    """
+    return f"{get_class_path(design.__class__)}:{design.impl}"
+
+class ResultStore():
+    """
+    Append-only JSON-lines file with one record per finished experiment:
+    * design:str, design ID as per get_design_id()
+    * experiment:str, class path of the Experiment
+    * params:dict, full parameters of the Experiment
+    * result:dict, result of the Experiment
+    * params_hash:str, hash of the Experiment's identity, as per Experiment.get_params_hash()
+    * run_time:float, wall-clock run time in seconds
+    * time:float, UNIX time at which the record was added
+    and any extra fields given to add().
+    """
+
+    def __init__(self, path: str):
+        """
+        * path:str, path to the store file; created on the first add().
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        self.cache = []
+        self.cache_offset = 0
+
+    def add(self, exp: Experiment, params: dict[str, any], result: dict[str, any], **kwargs) -> None:
+        """
+        Add the outcome of an Experiment. All keyword arguments are stored as extra fields.
+        """
+        record = {
+            'design': get_design_id(exp.design),
+            'experiment': get_class_path(exp.__class__),
+            'params': params,
+            'result': result,
+            'params_hash': exp.get_params_hash(),
+            'run_time': exp.run_time,
+            'time': time.time(),
+            **kwargs
+        }
+        line = json.dumps(record) + '\n'
+        with self.lock:
+            store_dir = os.path.dirname(self.path)
+            if store_dir != '':
+                os.makedirs(store_dir, exist_ok=True)
+            # a single append per record, so concurrent writers do not interleave
+            with open(self.path, 'a') as f:
+                f.write(line)
+
+    def records(self, design: Design = None) -> list[dict[str, any]]:
+        """
+        Get all records, optionally only those of the same design implementation.
+        Records appended since the last call (by any process) are read incrementally.
+        """
+        with self.lock:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    f.seek(self.cache_offset)
+                    for line in f:
+                        if not line.endswith('\n'):
+                            # partially written by another process; read again next time
+                            break
+                        self.cache.append(json.loads(line))
+                        self.cache_offset += len(line.encode())
+            records = list(self.cache)
+
+        if design is None:
+            return records
+        design_id = get_design_id(design)
+        return [r for r in records if r['design'] == design_id]
+
+    def successful_records(self, design: Design = None) -> list[dict[str, any]]:
+        """
+        Get the records of successful, full-fidelity runs (see Runner.run_multi_fidelity()), optionally only those of the same design implementation.
+        """
+        return [r for r in self.records(design) if r['result'].get('status', True) and r.get('fidelity', 'full') == 'full']
+
+    def find(self, exp: Experiment) -> dict[str, any]:
+        """
+        Get the latest successful, full-fidelity record of the same Experiment, i.e., with the same hash as per Experiment.get_params_hash(), or None if there is none.
+        """
+        params_hash = exp.get_params_hash()
+        for r in reversed(self.successful_records(exp.design)):
+            if r.get('params_hash') == params_hash:
+                return r
+        return None
@@ -0,0 +1,154 @@
+"""
+Surrogate models that predict experiment results from parameters, trained on a ResultStore, to rank and skip experiments before running them.
+"""
+
+from structure.util import Abstract
+from structure.exp import Experiment
+from structure.store import ResultStore
+from structure.adaptive import dominates
+import structure.consts.keys as keys
+
+import numpy as np
+
+def get_numeric_features(params: dict[str, dict[str, any]]) -> dict[str, float]:
+    """
+    Extract all numeric (including boolean) architecture and design parameters as features.
+    """
+    features = {}
+    for group in [keys.KEY_ARCH, keys.KEY_DESIGN]:
+        for k, v in params.get(group, {}).items():
+            if isinstance(v, (int, float)):
+                features[f"{group}.{k}"] = float(v)
+    return features
+
+class Surrogate(Abstract):
+    """
+    {abstract}
+    Regression model with uncertainty, over a matrix of numeric features.
+    """
+
+    def fit(self, X: np.ndarray, Y: np.ndarray) -> None:
+        """
+        {abstract}
+        * X:np.ndarray, features of shape (samples, features)
+        * Y:np.ndarray, targets of shape (samples, targets)
+        """
+        self.raise_unimplemented("fit")
+
+    def predict(self, X: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        {abstract}
+        @return a tuple of (mean, standard deviation), each of shape (samples, targets).
+        """
+        self.raise_unimplemented("predict")
+
+class SurrogatePlanner():
+    """
+    Trains a Surrogate on past results of the same design, and uses its predictions to order and prune a list of Experiments.
+    """
+
+    ORDERS = ['information', 'run_time']
+
+    def __init__(self,
+            surrogate: Surrogate,
+            store: ResultStore,
+            targets: list[str] = ['fmax', 'clb', 'rcw', 'run_time'],
+            objectives: dict[str, str] = {'fmax': 'max', 'clb': 'min'},
+            order_by: str = 'information',
+            skip_confidence: float = None,
+            min_records: int = 10
+        ):
+        """
+        * surrogate:Surrogate, model to train.
+        * store:ResultStore, past results to train on.
+
+        Optional arguments:
+        * targets:list[str], result keys (or 'run_time') to predict. Must include all objectives.
+        * objectives:dict[str, str], result keys mapped to 'max' or 'min', defining the Pareto front.
+        * order_by:str, 'information' to run the most uncertain predictions first, 'run_time' to run the quickest first, or None to keep the order. Default: 'information'
+        * skip_confidence:float, skip experiments whose optimistic prediction (mean +/- skip_confidence standard deviations) is still dominated by the pessimistic prediction of another experiment. Pass None to skip nothing. Default: None
+        * min_records:int, minimum number of past results needed for any planning. Default: 10
+        """
+        if order_by is not None and order_by not in self.ORDERS:
+            raise ValueError(f"Unknown order '{order_by}'; expected one of {self.ORDERS} or None.")
+        if order_by == 'run_time' and 'run_time' not in targets:
+            raise ValueError("Ordering by 'run_time' requires 'run_time' to be one of the targets.")
+        for k in objectives:
+            if k not in targets:
+                raise ValueError(f"Objective '{k}' must be one of the targets {targets}.")
+
+        self.surrogate = surrogate
+        self.store = store
+        self.targets = targets
+        self.objectives = objectives
+        self.order_by = order_by
+        self.skip_confidence = skip_confidence
+        self.min_records = min_records
+
+    def _get_target(self, record: dict[str, any], target: str) -> float:
+        if target == 'run_time':
+            return record['run_time']
+        return record['result'].get(target)
+
+    def predict(self, experiments: list[Experiment]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Train the surrogate on successful past results, and predict the targets for each Experiment.
+
+        @return a tuple of (mean, standard deviation), each of shape (experiments, targets); or None if there are too few past results.
+        """
+        if len(experiments) == 0:
+            return None
+
+        records = self.store.successful_records(experiments[0].design)
+        records = [r for r in records if all(self._get_target(r, t) is not None for t in self.targets)]
+        if len(records) < self.min_records:
+            return None
+
+        candidate_features = [get_numeric_features(exp.get_full_params()) for exp in experiments]
+        feature_keys = sorted(set().union(*[f.keys() for f in candidate_features]))
+        def to_matrix(features_list: list[dict[str, float]]) -> np.ndarray:
+            return np.array([[f.get(k, 0.0) for k in feature_keys] for f in features_list], dtype=float)
+
+        X = to_matrix([get_numeric_features(r['params']) for r in records])
+        Y = np.array([[self._get_target(r, t) for t in self.targets] for r in records], dtype=float)
+        self.surrogate.fit(X, Y)
+        return self.surrogate.predict(to_matrix(candidate_features))
+
+    def plan(self, experiments: list[Experiment]) -> tuple[list[Experiment], list[Experiment]]:
+        """
+        @return a tuple of (Experiments to run in order, skipped Experiments).
+        """
+        prediction = self.predict(experiments)
+        if prediction is None:
+            print(f"[SurrogatePlanner] Fewer than {self.min_records} past results for this design; running all experiments in order.")
+            return experiments, []
+        mean, std = prediction
+
+        # pareto pruning on confidence bounds
+        skipped = set()
+        if self.skip_confidence is not None:
+            optimistic, pessimistic = [], []
+            for i in range(len(experiments)):
+                best, worst = {}, {}
+                for k, direction in self.objectives.items():
+                    t = self.targets.index(k)
+                    sign = 1 if direction == 'max' else -1
+                    best[k] = mean[i, t] + sign * self.skip_confidence * std[i, t]
+                    worst[k] = mean[i, t] - sign * self.skip_confidence * std[i, t]
+                optimistic.append(best)
+                pessimistic.append(worst)
+
+            for i in range(len(experiments)):
+                if any(dominates(pessimistic[j], optimistic[i], self.objectives) for j in range(len(experiments)) if j != i):
+                    skipped.add(i)
+
+        order = [i for i in range(len(experiments)) if i not in skipped]
+        if self.order_by == 'information':
+            # relative uncertainty summed over targets
+            uncertainty = (std / np.maximum(np.abs(mean), 1e-9)).sum(axis=1)
+            order.sort(key=lambda i: -uncertainty[i])
+        elif self.order_by == 'run_time':
+            t = self.targets.index('run_time')
+            order.sort(key=lambda i: mean[i, t])
+
+        return [experiments[i] for i in order], [experiments[i] for i in sorted(skipped)]
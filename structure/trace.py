@@ -0,0 +1,169 @@
+"""
+Timeline of a sweep, exported as a Chrome trace (JSON), which can be opened in Perfetto (ui.perfetto.dev) or chrome://tracing.
+"""
+
+import os, json, time, threading
+from contextlib import contextmanager, nullcontext
+
+RUNNER_TRACK = 0  # track of the Runner's own events; slots are tracks 1, 2, ...
+
+class Tracer():
+    """
+    Records timestamped events of a sweep: generation of experiments, file writes, process launch, tool stages (see Experiment.get_stage()),
+    process exit, cleanup and parsing; with one track per concurrency slot, so that idle slots and stragglers stand out.
+    Slots are taken by experiments as they start running on the local host (see structure.executor.run_experiment()); events of remote workers are not recorded.
+    """
+
+    def __init__(self, path: str = None, stage_interval: float = 1.0):
+        """
+        Optional arguments:
+        * path:str, file to export to; if set, the Runner exports after every batch, so that an interrupted sweep still leaves its trace. Default: None
+        * stage_interval:float, seconds between polls of the stage of a running experiment. Default: 1.0
+        """
+        self.path = path
+        self.stage_interval = stage_interval
+        self.origin = time.time()
+        self.lock = threading.Lock()
+        self.events = []
+        self.slots = {}  # Experiment -> track
+        self.free_slots = []  # released tracks, reused lowest first
+        self.num_slots = 0
+        self.async_id = 0
+
+    def now(self) -> float:
+        """
+        @return microseconds since the tracer was created.
+        """
+        return (time.time() - self.origin) * 1e6
+
+    def get_track(self, exp: any = None) -> int:
+        """
+        @return the track of the slot held by an Experiment, or the Runner's track.
+        """
+        return self.slots.get(exp, RUNNER_TRACK) if exp is not None else RUNNER_TRACK
+
+    def begin_slot(self, exp: any) -> None:
+        """
+        Give an Experiment that starts running the lowest free slot.
+        """
+        with self.lock:
+            if len(self.free_slots) > 0:
+                self.free_slots.sort()
+                track = self.free_slots.pop(0)
+            else:
+                self.num_slots += 1
+                track = self.num_slots
+            self.slots[exp] = track
+
+    def end_slot(self, exp: any) -> None:
+        """
+        Free the slot of an Experiment that is done.
+        """
+        with self.lock:
+            track = self.slots.pop(exp, None)
+            if track is not None:
+                self.free_slots.append(track)
+
+    def add_span(self, name: str, start: float, end: float, exp: any = None, cat: str = 'runner', **args) -> None:
+        """
+        Record a span between two times as per now(), on the track of an Experiment (or the Runner's).
+        """
+        event = {'name': name, 'cat': cat, 'ph': 'X', 'ts': start, 'dur': max(end - start, 0.0), 'pid': 1, 'tid': self.get_track(exp), 'args': args}
+        with self.lock:
+            self.events.append(event)
+
+    @contextmanager
+    def span(self, name: str, exp: any = None, cat: str = 'runner', background: bool = False, **args):
+        """
+        Record the span of a block, on the track of an Experiment (or the Runner's).
+        Background blocks, which may outlive the Experiment's slot (e.g., cleanup), are recorded as async events next to the track instead.
+        """
+        if background:
+            with self.lock:
+                self.async_id += 1
+                async_id = self.async_id
+            tid = self.get_track(exp)
+            begin = {'name': name, 'cat': cat, 'ph': 'b', 'id': async_id, 'ts': self.now(), 'pid': 1, 'tid': tid, 'args': args}
+            try:
+                yield
+            finally:
+                end = {'name': name, 'cat': cat, 'ph': 'e', 'id': async_id, 'ts': self.now(), 'pid': 1, 'tid': tid}
+                with self.lock:
+                    self.events += [begin, end]
+            return
+
+        start = self.now()
+        try:
+            yield
+        finally:
+            self.add_span(name, start, self.now(), exp, cat, **args)
+
+    def instant(self, name: str, exp: any = None, cat: str = 'runner', **args) -> None:
+        """
+        Record an instant event, on the track of an Experiment (or the Runner's).
+        """
+        event = {'name': name, 'cat': cat, 'ph': 'i', 's': 't', 'ts': self.now(), 'pid': 1, 'tid': self.get_track(exp), 'args': args}
+        with self.lock:
+            self.events.append(event)
+
+    def follow_stages(self, exp: any) -> None:
+        """
+        Block until the process of an Experiment exits, recording a span for every stage it goes through.
+        """
+        stage, stage_start = None, None
+        while exp.is_running():
+            current = exp.get_stage()
+            if current != stage:
+                now = self.now()
+                if stage is not None:
+                    self.add_span(stage, stage_start, now, exp, 'stage')
+                stage, stage_start = current, now
+            time.sleep(self.stage_interval)
+        if stage is not None:
+            self.add_span(stage, stage_start, self.now(), exp, 'stage')
+
+    def get_trace(self) -> dict[str, any]:
+        """
+        @return the trace in Chrome's JSON object format.
+        """
+        with self.lock:
+            events = list(self.events)
+            num_slots = self.num_slots
+        tracks = [{'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': RUNNER_TRACK, 'args': {'name': 'runner'}}]
+        for track in range(1, num_slots + 1):
+            tracks.append({'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': track, 'args': {'name': f'slot {track}'}})
+            tracks.append({'name': 'thread_sort_index', 'ph': 'M', 'pid': 1, 'tid': track, 'args': {'sort_index': track}})
+        return {
+            'traceEvents': tracks + events,
+            'displayTimeUnit': 'ms',
+            'otherData': {'origin': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.origin))}
+        }
+
+    def export(self, path: str = None) -> str:
+        """
+        Write the trace to a file (atomically, so a reader never sees a partial file).
+
+        Optional arguments:
+        * path:str, file to write to; pass None to use the path of the tracer. Default: None
+
+        @return the path written to.
+        """
+        path = path if path is not None else self.path
+        if path is None:
+            raise ValueError('No path to export the trace to.')
+        trace_dir = os.path.dirname(path)
+        if trace_dir != '':
+            os.makedirs(trace_dir, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(self.get_trace(), f)
+        os.replace(temp_path, path)
+        return path
+
+def trace_span(tracer: Tracer, name: str, exp: any = None, cat: str = 'runner', background: bool = False, **args):
+    """
+    @return Tracer.span() of the tracer, or a no-op context if the tracer is None.
+    """
+    if tracer is None:
+        return nullcontext()
+    return tracer.span(name, exp, cat, background, **args)
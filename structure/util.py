@@ -68,4 +68,18 @@ class DynamicallyNamed(Abstract):
         Get a dynamic name based on the kwargs provided.
         @returns name in string
         """
-        self.raise_unimplemented("get_name")
\ No newline at end of file
+        self.raise_unimplemented("get_name")
+
+def get_class_path(cls: type) -> str:
+    """
+    Get the fully-qualified import path of a class, e.g., 'impl.exp.vtr.VtrExperiment'.
+    """
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+def load_class(class_path: str) -> type:
+    """
+    Import and return a class from its fully-qualified import path (see get_class_path()).
+    """
+    import importlib
+    module_name, _, class_name = class_path.rpartition('.')
+    return getattr(importlib.import_module(module_name), class_name)
@@ -0,0 +1,68 @@
+"""
+Equivalent experiments: with the default dedup, experiments with identical tool inputs run once, and share the result (see Runner._group_equivalent()),
+running the fake VTR flow (see bench/fake_vtr).
+
+Usage: python -m pytest tests/test_dedup.py (or python -m unittest discover tests)
+"""
+
+import os, sys
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from structure.run import Runner
+from impl.exp.vtr import VtrExperiment
+from impl.arch.base import BaseArchFactory
+from impl.design.gemmt.fu import GemmTFuDesign
+import structure.consts.keys as keys
+
+import glob, tempfile, unittest, contextlib, io
+from unittest import mock
+
+FAKE_VTR_ROOT = os.path.join(REPO_DIR, 'bench', 'fake_vtr')
+SPARSITIES = [0.0, 0.5]
+
+def sparsity_params(root_dir: str, constant_weight: bool) -> dict[str, any]:
+    return {
+        keys.KEY_EXP: {'root_dir': root_dir, 'verilog_search_dir': os.path.join(REPO_DIR, 'verilog')},
+        keys.KEY_ARCH: {},
+        keys.KEY_DESIGN: {'data_width': 8, 'sparsity': SPARSITIES, 'constant_weight': constant_weight, 'row_num': 2, 'col_num': 2, 'length': 2}
+    }
+
+class TestDedup(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root_dir = os.path.join(self.temp_dir.name, 'experiments')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def run_sweep(self, constant_weight: bool, **kwargs) -> tuple[any, int]:
+        """
+        @return the results of the sweep, and the number of experiments that ran VTR.
+        """
+        runner = Runner(BaseArchFactory(), GemmTFuDesign(), VtrExperiment, sparsity_params(self.root_dir, constant_weight), **kwargs)
+        env = {'VTR_ROOT': FAKE_VTR_ROOT, 'FAKE_VTR_RUNTIME': '0.1', 'FAKE_VTR_JITTER': '0'}
+        with mock.patch.dict(os.environ, env), contextlib.redirect_stdout(io.StringIO()):
+            results = runner.run_all_threaded(num_parallel_tasks=2, filter_params=['sparsity'], filter_results=['status'])
+        return results, len(glob.glob(os.path.join(self.root_dir, '*', '*', 'std.out')))
+
+    def test_without_constant_weights(self):
+        # the weights are inputs of the design: the sparsity changes nothing
+        results, runs = self.run_sweep(False)
+        self.assertEqual(runs, 1)
+        self.assertEqual(sorted(results['sparsity']), SPARSITIES)
+        self.assertTrue(results['status'].all())
+
+    def test_with_constant_weights(self):
+        results, runs = self.run_sweep(True)
+        self.assertEqual(runs, len(SPARSITIES))
+        self.assertTrue(results['status'].all())
+
+    def test_no_dedup(self):
+        results, runs = self.run_sweep(False, dedup=None)
+        self.assertEqual(runs, len(SPARSITIES))
+        self.assertEqual(len(results), len(SPARSITIES))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Hashed experiment directories: detection of truncated-hash collisions, at generation time and in the index file of the root directory.
+
+Usage: python -m pytest tests/test_exp_index.py (or python -m unittest discover tests)
+"""
+
+import os, sys
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from structure.exp import ExperimentFactory, add_to_exp_index, read_exp_index
+from impl.exp.vtr import VtrExperiment
+from impl.arch.base import BaseArchFactory
+from impl.design.gemmt.fu import GemmTFuDesign
+import structure.exp
+import structure.consts.keys as keys
+
+import hashlib, tempfile, unittest
+from unittest import mock
+
+def grid_params(root_dir: str) -> dict[str, any]:
+    # 25 experiments: more than the 16 hashes of a single hexadecimal character
+    return {
+        keys.KEY_EXP: {'root_dir': root_dir, 'verilog_search_dir': os.path.join(REPO_DIR, 'verilog')},
+        keys.KEY_ARCH: {},
+        keys.KEY_DESIGN: {'data_width': 8, 'sparsity': 0.5, 'constant_weight': True, 'row_num': [1, 2, 3, 4, 5], 'col_num': [1, 2, 3, 4, 5], 'length': 2}
+    }
+
+class TestExpIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root_dir = self.temp_dir.name
+        self.factory = ExperimentFactory(BaseArchFactory(), GemmTFuDesign(), VtrExperiment)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_no_collision(self):
+        experiments = self.factory.gen_experiments(grid_params(self.root_dir))
+        self.assertEqual(len({exp.get_exp_dir() for exp in experiments}), len(experiments))
+
+    def test_check_collisions(self):
+        with mock.patch.object(structure.exp, 'EXP_HASH_LENGTH', 1):
+            with self.assertRaisesRegex(ValueError, 'EXP_HASH_LENGTH'):
+                self.factory.gen_experiments(grid_params(self.root_dir))
+
+    def test_index_collision(self):
+        experiments = self.factory.gen_experiments(grid_params(self.root_dir))
+        with mock.patch.object(structure.exp, 'EXP_HASH_LENGTH', 1):
+            by_hash = {}
+            for exp in experiments:
+                by_hash.setdefault(exp.get_params_hash(), []).append(exp)
+            exp, other = next(group for group in by_hash.values() if len(group) > 1)[:2]
+
+            def add(exp):
+                params_hash = exp.get_params_hash()
+                add_to_exp_index(self.root_dir, params_hash, os.path.join(params_hash[:2], params_hash), exp.get_exp_name(),
+                                 identity=hashlib.sha256(exp.get_identity().encode()).hexdigest())
+
+            add(exp)
+            add(exp)  # a rerun
+            with self.assertRaisesRegex(ValueError, 'collision'):
+                add(other)
+        self.assertEqual([entry['name'] for entry in read_exp_index(self.root_dir).values()], [exp.get_exp_name()])
+
+if __name__ == '__main__':
+    unittest.main()
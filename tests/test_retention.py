@@ -0,0 +1,64 @@
+"""
+Retention policies: compression into the archive of a directory, across reruns of an experiment and on failures.
+
+Usage: python -m pytest tests/test_retention.py (or python -m unittest discover tests)
+"""
+
+import os, sys
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from structure.retention import RetentionPolicy, ARCHIVE_NAME
+
+import zipfile, tempfile, unittest, warnings, contextlib, io
+from unittest import mock
+
+class TestRetention(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.exp_dir = self.temp_dir.name
+        self.policy = RetentionPolicy({'*.out': 'compress'})
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, name: str, content: str) -> None:
+        with open(os.path.join(self.exp_dir, name), 'w') as f:
+            f.write(content)
+
+    def test_apply_twice(self):
+        # as on a rerun of the same (hashed) experiment directory
+        self.write('b.out', 'other')
+        self.policy.apply(self.exp_dir)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            for run in range(1, 4):
+                self.write('a.out', f'run {run}')
+                self.policy.apply(self.exp_dir)
+
+        with zipfile.ZipFile(os.path.join(self.exp_dir, ARCHIVE_NAME)) as archive:
+            self.assertEqual(sorted(archive.namelist()), ['a.out', 'b.out'])
+            self.assertEqual(archive.read('a.out'), b'run 3')
+            self.assertEqual(archive.read('b.out'), b'other')
+        self.assertEqual(os.listdir(self.exp_dir), [ARCHIVE_NAME])
+
+    def test_failure(self):
+        self.write('a.out', 'run 1')
+        with mock.patch.object(zipfile.ZipFile, 'write', side_effect=OSError('No space left on device')), contextlib.redirect_stdout(io.StringIO()):
+            self.policy.apply(self.exp_dir)
+        # no partial archive, and the file is kept
+        self.assertEqual(os.listdir(self.exp_dir), ['a.out'])
+
+    def test_failure_keeps_archive(self):
+        self.write('a.out', 'run 1')
+        self.policy.apply(self.exp_dir)
+        self.write('a.out', 'run 2')
+        with mock.patch.object(zipfile.ZipFile, 'write', side_effect=OSError('No space left on device')), contextlib.redirect_stdout(io.StringIO()):
+            self.policy.apply(self.exp_dir)
+        self.assertEqual(sorted(os.listdir(self.exp_dir)), ['a.out', ARCHIVE_NAME])
+        with zipfile.ZipFile(os.path.join(self.exp_dir, ARCHIVE_NAME)) as archive:
+            self.assertEqual(archive.read('a.out'), b'run 1')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+Multi-worker sweeps: a QueueExecutor with worker.py processes on a spool and a SQLite queue, running the fake VTR flow (see bench/fake_vtr).
+
+Usage: python -m pytest tests/test_workers.py (or python -m unittest discover tests)
+"""
+
+import os, sys
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from structure.run import Runner
+from structure.executor import WorkQueue
+from impl.exp.vtr import VtrExperiment
+from impl.arch.base import BaseArchFactory
+from impl.design.gemmt.fu import GemmTFuDesign
+from impl.executor.queue import QueueExecutor, RemoteExperimentError
+from impl.executor.spool import SpoolWorkQueue
+from impl.executor.sqlite import SqliteWorkQueue
+import structure.consts.keys as keys
+
+import re, glob, time, sqlite3, tempfile, unittest, subprocess, contextlib, io
+
+FAKE_VTR_ROOT = os.path.join(REPO_DIR, 'bench', 'fake_vtr')
+NUM_WORKERS = 3
+ROW_NUMS = [1, 2, 3]
+COL_NUMS = [1, 2, 3]
+
+def sweep_params(root_dir: str) -> dict[str, any]:
+    return {
+        keys.KEY_EXP: {'root_dir': root_dir, 'verilog_search_dir': os.path.join(REPO_DIR, 'verilog')},
+        keys.KEY_ARCH: {},
+        keys.KEY_DESIGN: {'data_width': 8, 'sparsity': 0.5, 'constant_weight': True, 'row_num': ROW_NUMS, 'col_num': COL_NUMS, 'length': 2}
+    }
+
+class FailingQueue(WorkQueue):
+    """
+    Queue on which every collect() fails, as with a database that stays locked.
+    """
+    heartbeat_interval = None
+
+    def put(self, spec: dict[str, any]) -> str:
+        return 'job'
+
+    def collect(self) -> list[tuple[str, dict[str, any]]]:
+        raise OSError('database is locked')
+
+class TestWorkers(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root_dir = os.path.join(self.temp_dir.name, 'experiments')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def run_sweep(self, queue_url: str, queue: WorkQueue) -> tuple[any, int]:
+        """
+        Run the sweep on NUM_WORKERS worker.py processes.
+
+        @return the results of the sweep, and the total number of jobs the workers ran.
+        """
+        env = {**os.environ, 'VTR_ROOT': FAKE_VTR_ROOT, 'FAKE_VTR_RUNTIME': '0.1', 'FAKE_VTR_JITTER': '0'}
+        workers = [subprocess.Popen([sys.executable, os.path.join(REPO_DIR, 'worker.py'), queue_url, '--worker-id', f'worker{i}', '--poll', '0.1', '--idle-timeout', '3'],
+                                    cwd=self.temp_dir.name, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True) for i in range(NUM_WORKERS)]
+        try:
+            runner = Runner(BaseArchFactory(), GemmTFuDesign(), VtrExperiment, sweep_params(self.root_dir))
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = runner.run_all_threaded(executor=QueueExecutor(queue, poll_interval=0.1), filter_params=['row_num', 'col_num'], filter_results=['status'])
+        finally:
+            outputs = [worker.communicate(timeout=60)[0] for worker in workers]
+        jobs_run = sum(int(re.search(r'Worker exiting after (\d+) job', output).group(1)) for output in outputs)
+        return results, jobs_run
+
+    def check_results(self, results, jobs_run: int) -> None:
+        num_experiments = len(ROW_NUMS) * len(COL_NUMS)
+        self.assertEqual(len(results), num_experiments)
+        self.assertEqual(len(results.drop_duplicates(['row_num', 'col_num'])), num_experiments)
+        self.assertTrue(results['status'].all())
+        self.assertEqual(jobs_run, num_experiments)
+
+    def test_spool(self):
+        spool_dir = os.path.join(self.temp_dir.name, 'spool')
+        results, jobs_run = self.run_sweep(f'spool:{spool_dir}', SpoolWorkQueue(spool_dir))
+        self.check_results(results, jobs_run)
+        self.assertEqual(len(glob.glob(os.path.join(spool_dir, 'done', '*.result.json'))), len(results))
+        self.assertEqual(os.listdir(os.path.join(spool_dir, 'queued')) + os.listdir(os.path.join(spool_dir, 'running')), [])
+
+    def test_sqlite(self):
+        db_path = os.path.join(self.temp_dir.name, 'queue.db')
+        results, jobs_run = self.run_sweep(f'sqlite:{db_path}', SqliteWorkQueue(db_path))
+        self.check_results(results, jobs_run)
+        with sqlite3.connect(db_path) as conn:
+            states = conn.execute('SELECT state, COUNT(*) FROM jobs GROUP BY state').fetchall()
+        self.assertEqual(states, [('collected', len(results))])
+
+    def test_collect_errors_fail_pending(self):
+        executor = QueueExecutor(FailingQueue(), poll_interval=0.01, max_poll_errors=3)
+        runner = Runner(BaseArchFactory(), GemmTFuDesign(), VtrExperiment, sweep_params(self.root_dir))
+        with contextlib.redirect_stdout(io.StringIO()):
+            future = executor.submit(runner.experiments[0])
+            self.assertIsInstance(future.exception(timeout=10), OSError)
+
+    def test_shutdown_without_workers(self):
+        spool_dir = os.path.join(self.temp_dir.name, 'spool')
+        executor = QueueExecutor(SpoolWorkQueue(spool_dir), poll_interval=0.05, shutdown_timeout=0.5)
+        runner = Runner(BaseArchFactory(), GemmTFuDesign(), VtrExperiment, sweep_params(self.root_dir))
+        with contextlib.redirect_stdout(io.StringIO()):
+            future = executor.submit(runner.experiments[0])
+            start_time = time.monotonic()
+            executor.shutdown()
+        self.assertLess(time.monotonic() - start_time, 10)
+        self.assertIsInstance(future.exception(timeout=0), RemoteExperimentError)
+
+    def test_spool_expired_lease(self):
+        spool_dir = os.path.join(self.temp_dir.name, 'spool')
+        queue = SpoolWorkQueue(spool_dir)
+        other_queue = SpoolWorkQueue(spool_dir, lease_timeout=0.0)  # sees every lease as expired
+        job_id = queue.put({'name': 'job'})
+        self.assertEqual(queue.claim('worker0')[0], job_id)
+        # requeued while worker0 still runs it, then claimed by worker1
+        self.assertEqual(other_queue.requeue_expired(), [job_id])
+        self.assertEqual(other_queue.claim('worker1')[0], job_id)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertFalse(queue.heartbeat(job_id, 'worker0'))
+            queue.complete(job_id, {'worker': 'worker0'})
+        self.assertEqual(queue.collect(), [])
+        self.assertTrue(other_queue.heartbeat(job_id, 'worker1'))
+        other_queue.complete(job_id, {'worker': 'worker1'})
+        self.assertEqual(queue.collect(), [(job_id, {'worker': 'worker1'})])
+        self.assertEqual(os.listdir(os.path.join(spool_dir, 'running')), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+"""
+Notifications of flow progress (Bark); imports requests, so only import where needed.
+"""
+
+import os
+import requests
+
+
+def bark(content='default flow notification', title='FPGA FLOW'):
+    urls = os.getenv('BARKURL')
+    if urls:
+        urls = urls.strip().split()
+        for url in urls:
+            # print(url)
+            if url.endswith('/'):
+                url = url[:-1]
+
+            try:
+                resp = requests.get(url + f'/{title}/{content}')
+                if resp.status_code == 200:
+                    continue
+                else:
+                    print('Bark internet failed')
+
+            except Exception as e:
+                print(e)
+                print('Bark unknown failed')
+
+    else:
+        print('Bark URL not set')
+        return False
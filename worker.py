@@ -0,0 +1,43 @@
+"""
+Worker process for distributed sweeps: pulls serialized Experiments from a shared work queue, runs them, and pushes the results back.
+Start any number of these on any number of nodes, then run the sweep with a QueueExecutor pointing at the same queue.
+
+Usage: python worker.py <queue URL> [--poll 5] [--max-jobs N] [--idle-timeout S]
+Queue URLs:
+* sqlite:<path to database>, see impl.executor.sqlite.SqliteWorkQueue
+* spool:<path to directory>, see impl.executor.spool.SpoolWorkQueue
+"""
+
+from impl.executor.queue import run_worker
+from structure.executor import WorkQueue
+
+import argparse
+
+def open_queue(url: str) -> WorkQueue:
+    """
+    Open a WorkQueue from a URL of the form '<scheme>:<location>'.
+    """
+    scheme, sep, location = url.partition(':')
+    if sep == '' or location == '':
+        raise ValueError(f"Malformed queue URL '{url}'; expected '<scheme>:<location>'.")
+
+    if scheme == 'sqlite':
+        from impl.executor.sqlite import SqliteWorkQueue
+        return SqliteWorkQueue(location)
+    if scheme == 'spool':
+        from impl.executor.spool import SpoolWorkQueue
+        return SpoolWorkQueue(location)
+
+    raise ValueError(f"Unknown queue scheme '{scheme}' in '{url}'.")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run Experiments from a shared work queue.')
+    parser.add_argument('queue', help="queue URL, e.g., 'sqlite:experiments/queue.db' or 'spool:experiments/spool'")
+    parser.add_argument('--worker-id', default=None, help='identifier of this worker (default: <hostname>:<pid>)')
+    parser.add_argument('--poll', type=float, default=5.0, help='seconds to wait when the queue is empty')
+    parser.add_argument('--max-jobs', type=int, default=None, help='exit after running this many jobs')
+    parser.add_argument('--idle-timeout', type=float, default=None, help='exit after the queue has been empty for this many seconds')
+    args = parser.parse_args()
+
+    jobs_run = run_worker(open_queue(args.queue), args.worker_id, args.poll, args.max_jobs, args.idle_timeout)
+    print(f"Worker exiting after {jobs_run} job(s).")